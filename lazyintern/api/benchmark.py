@@ -0,0 +1,150 @@
+import math
+import time
+import tracemalloc
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from recruiter.models import Bookmark, RecruiterProfile
+from .models import StudentProfile
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# Endpoint benchmark over synthetic data (manage.py benchmark_endpoints). Every endpoint is
+# called through the Django test client, so middleware, DRF and rendering are included.
+# Latency runs are not traced; queries and peak memory come from one separate traced call.
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    index = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class Fixtures:
+    """Ids the endpoint calls rotate through; picked deterministically from the dataset."""
+
+    def __init__(self, samples=50):
+        students = list(StudentProfile.objects.order_by('id').values_list('id', 'user_id')[:samples])
+        self.student_ids = [sid for sid, _ in students]
+        self.student_user_ids = [uid for _, uid in students]
+        recruiter = (RecruiterProfile.objects.filter(bookmarks__isnull=False)
+                     .select_related('user').order_by('id').first())
+        self.recruiter = recruiter.user if recruiter else None
+        bookmarked = Bookmark.objects.filter(recruiter__user=self.recruiter).order_by('id').first() if recruiter else None
+        self.bookmarked_student_id = bookmarked.student_id if bookmarked else None
+
+    def student_user(self, i):
+        return self.student_user_ids[i % len(self.student_user_ids)]
+
+    def student(self, i):
+        return self.student_ids[i % len(self.student_ids)]
+
+
+def _save_profile(client, fx, i):
+    return client.post('/api/student/profile/', {
+        "user_id": fx.student_user(i), "bio": f"Benchmark bio {i}", "skills": ["Python", "Django", "SQL"],
+    }, content_type='application/json')
+
+
+def _save_projects(client, fx, i):
+    return client.post('/api/student/projects/', {
+        "student_id": fx.student(i),
+        "projects": [{"title": f"Benchmark project {i}", "description": "x", "technologies": ["Python"]}],
+    }, content_type='application/json')
+
+
+def _save_certifications(client, fx, i):
+    return client.post('/api/student/certifications/', {
+        "student_id": fx.student(i),
+        "certifications": [{"certification_name": f"Benchmark cert {i}", "issue_date": "2024-01"}],
+    }, content_type='application/json')
+
+
+def _toggle_bookmark(client, fx, i):
+    student = fx.student(i + 1)
+    response = client.post('/api/recruiter/bookmark/add/', {"student_id": student}, content_type='application/json')
+    client.delete(f'/api/recruiter/bookmark/remove/{student}/')
+    return response
+
+
+# name -> (needs recruiter login, call(client, fixtures, i))
+ENDPOINTS = {
+    "get_all_students": (True, lambda c, fx, i: c.get('/api/recruiter/students/')),
+    "get_all_students_fields": (True, lambda c, fx, i: c.get('/api/recruiter/students/?fields=id,name,skills')),
+    "search_students": (True, lambda c, fx, i: c.get('/api/recruiter/students/search/?skills=python,react&location=istanbul')),
+    "fulltext_search_students": (True, lambda c, fx, i: c.get('/api/recruiter/students/fulltext/?q=data+platform')),
+    "rank_students": (True, lambda c, fx, i: c.get('/api/recruiter/students/rank/?skills=python,sql,docker&graduation_year_from=2026')),
+    "get_bookmarked_students": (True, lambda c, fx, i: c.get('/api/recruiter/bookmarks/')),
+    "similar_students": (True, lambda c, fx, i: c.get(f'/api/recruiter/students/{fx.bookmarked_student_id}/similar/')),
+    "get_student_profile": (False, lambda c, fx, i: c.get(f'/api/student/profile/{fx.student_user(i)}/')),
+    "get_student_bundle": (False, lambda c, fx, i: c.get(f'/api/student/bundle/{fx.student_user(i)}/')),
+    "save_student_profile": (False, _save_profile),
+    "save_student_projects": (False, _save_projects),
+    "save_student_certifications": (False, _save_certifications),
+    "toggle_bookmark": (True, _toggle_bookmark),
+}
+
+
+def run_endpoint(name, fixtures, requests=20, warmup=1, warm_cache=False):
+    needs_recruiter, call = ENDPOINTS[name]
+    client = Client()
+    if needs_recruiter:
+        if fixtures.recruiter is None:
+            return {"skipped": "no recruiter with bookmarks in the dataset"}
+        client.force_login(fixtures.recruiter)
+
+    for i in range(warmup):
+        call(client, fixtures, i)
+
+    timings, statuses = [], set()
+    for i in range(requests):
+        if not warm_cache:
+            cache.clear()   # measure the uncached path; response caching is measured with warm_cache
+        started = time.perf_counter()
+        response = call(client, fixtures, i)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        timings.append((time.perf_counter() - started) * 1000)
+        statuses.add(response.status_code)
+
+    if not warm_cache:
+        cache.clear()
+    tracemalloc.start()
+    with CaptureQueriesContext(connection) as queries:
+        response = call(client, fixtures, requests)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "requests": requests,
+        "status": sorted(statuses),
+        "p50_ms": round(percentile(timings, 50), 2),
+        "p95_ms": round(percentile(timings, 95), 2),
+        "p99_ms": round(percentile(timings, 99), 2),
+        "mean_ms": round(sum(timings) / len(timings), 2),
+        "queries": len(queries),
+        "peak_memory_kb": round(peak / 1024),
+        "response_bytes": len(response.content) if not response.streaming else None,
+    }
+
+
+def run_all(endpoints=None, requests=20, warmup=1, warm_cache=False):
+    fixtures = Fixtures()
+    results = {}
+    for name in endpoints or ENDPOINTS:
+        results[name] = run_endpoint(name, fixtures, requests, warmup, warm_cache)
+    return results
+
+
+def max_rss_kb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None
@@ -0,0 +1,126 @@
+import hashlib
+import os
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import FileUploadHandler
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+
+from . import metrics
+from .models import BlobReference, StoredBlob
+
+# Content-addressed storage for uploads: files live at blobs/<aa>/<sha256><ext> and are
+# shared by every upload with the same bytes. A duplicate upload only adds a
+# BlobReference; the file is deleted when its last reference is released.
+
+BLOB_PREFIX = 'blobs'
+
+
+class HashingUploadHandler(FileUploadHandler):
+    """
+    Hashes multipart file uploads as the chunks arrive and passes the data on unchanged
+    to the next handler, so no second read of the upload is needed.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.digests = {}
+        self._hash = None
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self._hash = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self._hash.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        self.digests[self.field_name] = self._hash.hexdigest()
+        return None
+
+
+def file_digest(f):
+    digest = hashlib.sha256()
+    for chunk in f.chunks():
+        digest.update(chunk)
+    f.seek(0)
+    return digest.hexdigest()
+
+
+def blob_path(digest, filename=''):
+    ext = os.path.splitext(filename)[1].lower()[:10]
+    return f"{BLOB_PREFIX}/{digest[:2]}/{digest}{ext}"
+
+
+def _create_blob(f, digest, filename):
+    path = blob_path(digest, filename)
+    if not default_storage.exists(path):  # may be left over from a rolled back upload
+        saved = default_storage.save(path, f)
+        if saved != path:
+            # a concurrent upload of the same content won the race for the path
+            default_storage.delete(saved)
+    try:
+        with transaction.atomic():
+            return StoredBlob.objects.create(sha256=digest, path=path, size=f.size)
+    except IntegrityError:
+        return StoredBlob.objects.select_for_update().get(sha256=digest)
+
+
+def store_file(f, kind, user_id=None, filename='', digest=None):
+    """
+    Stores `f` (an uploaded or django.core.files File) and returns the new BlobReference.
+    When a blob with the same SHA-256 already exists, nothing is written.
+    """
+    filename = os.path.basename(filename or f.name or '')
+    digest = digest or file_digest(f)
+    with transaction.atomic():
+        blob = StoredBlob.objects.select_for_update().filter(sha256=digest).first()
+        if blob is None:
+            blob = _create_blob(f, digest, filename)
+        StoredBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+        ref = BlobReference.objects.create(blob=blob, user_id=user_id, kind=kind, filename=filename)
+    metrics.UPLOADS.inc(kind=kind)
+    metrics.UPLOAD_BYTES.inc(f.size, kind=kind)
+    return ref
+
+
+def release(path, kind, user_id=None):
+    """
+    Drops one reference to the blob stored at `path`; returns False if there was none.
+    The file itself is removed after commit once the reference count reaches zero.
+    """
+    with transaction.atomic():
+        blob = StoredBlob.objects.select_for_update().filter(path=path).first()
+        if blob is None:
+            return False
+        refs = BlobReference.objects.filter(blob=blob, kind=kind)
+        if user_id is not None:
+            refs = refs.filter(user_id=user_id)
+        ref = refs.order_by('id').first()
+        if ref is None:
+            return False
+        ref.delete()
+        StoredBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') - 1)
+        blob.refresh_from_db(fields=['ref_count'])
+        if blob.ref_count == 0:
+            blob.delete()
+            transaction.on_commit(lambda: default_storage.delete(path))
+        return True
+
+
+def delete_upload(path, kind, user_id=None):
+    if path.startswith(BLOB_PREFIX + '/'):
+        return release(path, kind, user_id)
+    # uploaded before content addressing: a plain per-user file
+    if default_storage.exists(path):
+        default_storage.delete(path)
+        return True
+    return False
+
+
+def user_can_read(user_id, path):
+    # Certificates stay readable by any signed-in user, as they were before content addressing.
+    return BlobReference.objects.filter(blob__path=path).filter(
+        Q(user_id=user_id) | Q(kind=BlobReference.KIND_CERTIFICATE)
+    ).exists()
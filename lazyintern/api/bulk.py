@@ -0,0 +1,92 @@
+import copy
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import StudentProfile
+
+
+def _row_id(row):
+    try:
+        return int(row.get("id"))
+    except (TypeError, ValueError):
+        return None
+
+
+class InvalidRows(ValueError):
+    def __init__(self, errors):
+        super().__init__("Invalid rows")
+        self.errors = errors
+
+
+def _row_values(row, defaults):
+    if not isinstance(row, dict):
+        raise InvalidRows({"rows": ["Each row must be an object"]})
+    return {f: row[f] if row.get(f) is not None else copy.copy(d) for f, d in defaults.items()}
+
+
+def validate_student_rows(model, rows, defaults):
+    """Runs model field validation on every row; raises InvalidRows with errors keyed by row index."""
+    errors = {}
+    for index, row in enumerate(rows):
+        try:
+            model(**_row_values(row, defaults)).clean_fields(exclude=['id', 'student'])
+        except ValidationError as e:
+            errors[str(index)] = e.message_dict
+    if errors:
+        raise InvalidRows(errors)
+
+
+def touch_student(student_id):
+    # Child rows have no timestamps; bump the profile's validators instead (see api/conditional.py).
+    StudentProfile.objects.filter(id=student_id).update(
+        content_version=F('content_version') + 1,
+        updated_at=timezone.now()
+    )
+
+
+@transaction.atomic
+def upsert_student_rows(model, student_id, rows, defaults, validate=False):
+    """
+    Diffs `rows` (dicts from the client) against the student's existing `model` rows by id:
+    new rows are bulk-created, changed rows bulk-updated, missing rows deleted and
+    unchanged rows left alone. `defaults` maps each writable field to its default value.
+    With `validate`, every row is checked before anything is written.
+
+    Returns (objects in the incoming order, {"created": n, "updated": n, "deleted": n}).
+    """
+    if validate:
+        validate_student_rows(model, rows, defaults)
+
+    fields = list(defaults)
+    existing = {obj.id: obj for obj in model.objects.filter(student_id=student_id)}
+
+    objects, to_create, to_update, kept = [], [], [], set()
+    for row in rows:
+        values = _row_values(row, defaults)
+        obj = existing.get(_row_id(row))
+        if obj is None or obj.id in kept:
+            obj = model(student_id=student_id, **values)
+            to_create.append(obj)
+        else:
+            kept.add(obj.id)
+            changed = [f for f in fields if getattr(obj, f) != values[f]]
+            if changed:
+                for f in changed:
+                    setattr(obj, f, values[f])
+                to_update.append(obj)
+        objects.append(obj)
+
+    removed = [obj_id for obj_id in existing if obj_id not in kept]
+    if removed:
+        model.objects.filter(id__in=removed).delete()
+    if to_update:
+        model.objects.bulk_update(to_update, fields)
+    if to_create:
+        model.objects.bulk_create(to_create)
+    if to_create or to_update or removed:
+        touch_student(student_id)
+
+    return objects, {"created": len(to_create), "updated": len(to_update), "deleted": len(removed)}
@@ -0,0 +1,161 @@
+import hashlib
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from .blobs import store_file
+from .models import BlobReference, ChunkedUpload
+
+# Chunked, resumable uploads: init -> PUT chunks at explicit offsets -> complete.
+# Chunks are streamed from the request straight into a temp file (never held in memory)
+# and the finished file is handed to blob storage as a temporary file, which
+# FileSystemStorage moves into place with a rename instead of copying.
+
+READ_BLOCK = 64 * 1024
+
+
+class UploadError(ValueError):
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _temp_dir():
+    path = Path(getattr(settings, 'CHUNKED_UPLOAD_TEMP_DIR', settings.BASE_DIR / '.uploads'))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def max_chunk_size():
+    return getattr(settings, 'CHUNKED_UPLOAD_MAX_CHUNK_SIZE', 8 * 1024 * 1024)
+
+
+def max_file_size():
+    return getattr(settings, 'CHUNKED_UPLOAD_MAX_FILE_SIZE', 1024 * 1024 * 1024)
+
+
+def temp_path(upload):
+    return _temp_dir() / f"{upload.id}.part"
+
+
+def start_upload(user_id, filename, total_size, project_id='', sha256=''):
+    filename = get_valid_filename(os.path.basename(filename or ''))
+    if not filename:
+        raise UploadError("filename is required")
+    if total_size <= 0 or total_size > max_file_size():
+        raise UploadError(f"total_size must be between 1 and {max_file_size()} bytes")
+    upload = ChunkedUpload.objects.create(
+        user_id=user_id, project_id=str(project_id or ''), filename=filename,
+        total_size=total_size, sha256=(sha256 or '').lower()
+    )
+    temp_path(upload).touch()
+    return upload
+
+
+def write_chunk(upload_id, offset, length, stream, checksum=''):
+    """
+    Appends `length` bytes read from `stream` at `offset`. A chunk whose sha256 does not
+    match `checksum` is truncated away again, so the client can simply retry it.
+    """
+    with transaction.atomic():
+        upload = ChunkedUpload.objects.select_for_update().filter(id=upload_id).first()
+        if upload is None:
+            raise UploadError("Upload not found", 404)
+        if upload.status != ChunkedUpload.STATUS_ACTIVE:
+            raise UploadError("Upload already completed", 409)
+        if offset != upload.offset:
+            # Tell the client where to resume from.
+            raise UploadError(f"Expected offset {upload.offset}", 409)
+        if length <= 0 or length > max_chunk_size():
+            raise UploadError(f"Chunk size must be between 1 and {max_chunk_size()} bytes")
+        if offset + length > upload.total_size:
+            raise UploadError("Chunk exceeds declared total_size")
+
+        digest = hashlib.sha256()
+        remaining = length
+        path = temp_path(upload)
+        with open(path, 'r+b') as f:
+            f.seek(offset)
+            while remaining:
+                block = stream.read(min(READ_BLOCK, remaining))
+                if not block:
+                    break
+                digest.update(block)
+                f.write(block)
+                remaining -= len(block)
+            if remaining or (checksum and digest.hexdigest() != checksum.lower()):
+                f.truncate(offset)
+                raise UploadError("Incomplete chunk" if remaining else "Chunk checksum mismatch")
+            f.truncate(offset + length)
+
+        upload.offset = offset + length
+        upload.save(update_fields=['offset', 'updated_at'])
+        return upload
+
+
+class _TempFile(File):
+    # FileSystemStorage moves (renames) files that expose temporary_file_path().
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def complete_upload(upload_id):
+    # The row stays locked until the blob reference exists, so concurrent complete calls
+    # wait here and then see STATUS_COMPLETE instead of storing the file twice.
+    with transaction.atomic():
+        upload = ChunkedUpload.objects.select_for_update().filter(id=upload_id).first()
+        if upload is None:
+            raise UploadError("Upload not found", 404)
+        if upload.status == ChunkedUpload.STATUS_COMPLETE:
+            return upload
+        if upload.offset != upload.total_size:
+            raise UploadError(f"Upload incomplete: {upload.offset} of {upload.total_size} bytes", 409)
+
+        path = temp_path(upload)
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        digest = digest.hexdigest()
+        if upload.sha256 and digest != upload.sha256:
+            raise UploadError("File checksum mismatch")
+
+        with open(path, 'rb') as f:
+            ref = store_file(
+                _TempFile(f, name=upload.filename), BlobReference.KIND_PROJECT_VIDEO,
+                user_id=upload.user_id, filename=upload.filename, digest=digest
+            )
+        if path.exists():
+            path.unlink()  # duplicate content, or a storage that copies instead of moving
+
+        upload.status = ChunkedUpload.STATUS_COMPLETE
+        upload.path = ref.blob.path
+        upload.save(update_fields=['status', 'path', 'updated_at'])
+        return upload
+
+
+def abort_upload(upload_id):
+    upload = ChunkedUpload.objects.filter(id=upload_id, status=ChunkedUpload.STATUS_ACTIVE).first()
+    if upload is None:
+        return False
+    temp_path(upload).unlink(missing_ok=True)
+    upload.delete()
+    return True
+
+
+def purge_stale_uploads(max_age=timedelta(days=1)):
+    stale = ChunkedUpload.objects.filter(
+        status=ChunkedUpload.STATUS_ACTIVE, updated_at__lt=timezone.now() - max_age
+    )
+    count = 0
+    for upload in stale.iterator():
+        temp_path(upload).unlink(missing_ok=True)
+        upload.delete()
+        count += 1
+    return count
@@ -0,0 +1,78 @@
+from django.views.decorators.http import condition
+
+from recruiter.models import RecruiterProfile
+from .models import StudentProfile
+
+# Conditional GET validators. Each one is a single indexed lookup and is cached on the
+# request, so ETag and Last-Modified cost one query together and a 304 serializes nothing.
+# Student reads are validated by ETag only: profile_views and content_version change it
+# without moving updated_at, so an If-Modified-Since check would answer 304 for stale data.
+
+
+def _cached(request, key, fetch):
+    cache = request.__dict__.setdefault('_validators', {})
+    if key not in cache:
+        cache[key] = fetch()
+    return cache[key]
+
+
+def _student_row(request, user_id):
+    # profile_views is part of the ETag because it changes without touching updated_at
+    return _cached(request, ('student', user_id), lambda: (
+        StudentProfile.objects.filter(user_id=user_id)
+        .values_list('id', 'updated_at', 'content_version', 'profile_views').first()
+    ))
+
+
+def _recruiter_row(request, user_id):
+    return _cached(request, ('recruiter', user_id), lambda: (
+        RecruiterProfile.objects.filter(user_id=user_id).values_list('id', 'updated_at').first()
+    ))
+
+
+def _etag(prefix, row):
+    if row is None:
+        return None
+    parts = [str(int(v.timestamp() * 1_000_000)) if hasattr(v, 'timestamp') else str(v) for v in row]
+    return f'"{prefix}-{"-".join(parts)}"'
+
+
+def student_etag(request, user_id, *args, **kwargs):
+    return _etag('sp', _student_row(request, user_id))
+
+
+def recruiter_etag(request, user_id, *args, **kwargs):
+    return _etag('rp', _recruiter_row(request, user_id))
+
+
+def recruiter_last_modified(request, user_id, *args, **kwargs):
+    row = _recruiter_row(request, user_id)
+    return row[1] if row else None
+
+
+def _current_user_row(request):
+    user = request.user
+    if not user.is_authenticated:
+        return None
+    role = (getattr(user, 'role', None) or '').lower()
+    if role == 'student':
+        return 'sp', _student_row(request, user.id)
+    if role == 'recruiter':
+        return 'rp', _recruiter_row(request, user.id)
+    return None
+
+
+def current_user_etag(request, *args, **kwargs):
+    found = _current_user_row(request)
+    return _etag(f"u{request.user.id}-{found[0]}", found[1]) if found else None
+
+
+def current_user_last_modified(request, *args, **kwargs):
+    found = _current_user_row(request)
+    # recruiters only, see the note at the top
+    return found[1][1] if found and found[0] == 'rp' and found[1] else None
+
+
+student_conditional = condition(etag_func=student_etag)
+recruiter_conditional = condition(etag_func=recruiter_etag, last_modified_func=recruiter_last_modified)
+current_user_conditional = condition(etag_func=current_user_etag, last_modified_func=current_user_last_modified)
@@ -0,0 +1,90 @@
+from datetime import datetime, time
+
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import StudentCertification, StudentProfile, StudentProject
+from .streaming import DEFAULT_CHUNK_SIZE
+
+# Full student directory export (ATS sync, analytics). Profiles are read with
+# .iterator(chunk_size=N); user is joined and projects / certifications are prefetched
+# per chunk, so memory depends on the chunk size, not on the number of students.
+
+DIRECTORY_EXPORT_COLUMNS = [
+    "id", "user_id", "name", "email", "university", "major", "graduation_year", "location",
+    "preferred_internship_location", "preferred_locations", "internship_type_preference",
+    "open_to_relocate", "skills", "github_url", "linkedin_url", "website_url", "profile_views",
+    "updated_at", "projects", "certifications",
+]
+
+
+def parse_updated_since(value):
+    """ISO date or datetime -> aware datetime; None when empty. Raises ValueError if invalid."""
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError("updated_since must be an ISO date or datetime")
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def directory_queryset(updated_since=None):
+    profiles = StudentProfile.objects.select_related('user').prefetch_related(
+        Prefetch('studentproject_set', queryset=StudentProject.objects.order_by('id')),
+        Prefetch('studentcertification_set', queryset=StudentCertification.objects.order_by('id')),
+    ).order_by('id')
+    if updated_since is not None:
+        profiles = profiles.filter(updated_at__gte=updated_since)
+    return profiles
+
+
+def directory_row(profile, flat=False):
+    """One export row. flat=True (CSV) lists project titles / certification names instead of objects."""
+    projects = profile.studentproject_set.all()
+    certifications = profile.studentcertification_set.all()
+    if flat:
+        projects = [p.title for p in projects]
+        certifications = [c.certification_name for c in certifications]
+    else:
+        projects = [
+            {"title": p.title, "description": p.description, "technologies": p.technologies, "video_url": p.video_url}
+            for p in projects
+        ]
+        certifications = [
+            {"certification_name": c.certification_name, "issuing_organization": c.issuing_organization,
+             "issue_date": c.issue_date, "expiry_date": c.expiry_date, "credential_url": c.credential_url}
+            for c in certifications
+        ]
+    return {
+        "id": profile.id,
+        "user_id": profile.user_id,
+        "name": profile.user.name,
+        "email": profile.user.email,
+        "university": profile.university,
+        "major": profile.major,
+        "graduation_year": profile.graduation_year,
+        "location": profile.location,
+        "preferred_internship_location": profile.preferred_internship_location,
+        "preferred_locations": profile.preferred_locations,
+        "internship_type_preference": profile.internship_type_preference,
+        "open_to_relocate": profile.open_to_relocate,
+        "skills": profile.skills,
+        "github_url": profile.github_url,
+        "linkedin_url": profile.linkedin_url,
+        "website_url": profile.website_url,
+        "profile_views": profile.profile_views,
+        "updated_at": profile.updated_at,
+        "projects": projects,
+        "certifications": certifications,
+    }
+
+
+def directory_rows(updated_since=None, flat=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    for profile in directory_queryset(updated_since).iterator(chunk_size=chunk_size):
+        yield directory_row(profile, flat=flat)
@@ -0,0 +1,27 @@
+# Sparse fieldsets: ?fields=id,name,skills narrows both the SELECT and the JSON output.
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+def requested_fields(params, available):
+    """Parses ?fields=; None means every field. Unknown names raise InvalidFields."""
+    raw = params.get('fields')
+    if not raw:
+        return None
+    fields = list(dict.fromkeys(f.strip() for f in raw.split(',') if f.strip()))
+    unknown = [f for f in fields if f not in available]
+    if unknown:
+        raise InvalidFields(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(available)}")
+    return fields or None
+
+
+def project_values(queryset, columns, fields=None, prefix=''):
+    """
+    columns: {output name: field path or expression}. Returns one dict per row with only
+    `fields`, selecting just their columns (no model instances are built).
+    """
+    names = fields or list(columns)
+    paths = [prefix + columns[name] if isinstance(columns[name], str) else columns[name] for name in names]
+    return [dict(zip(names, row)) for row in queryset.values_list(*paths)]
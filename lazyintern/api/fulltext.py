@@ -0,0 +1,102 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import StudentCertification, StudentProfile, StudentProject
+
+# One FTS5 document per student; rowid == StudentProfile.id so updates are a rowid lookup.
+# A trigger on api_studentprofile (migration 0012) removes the document of a deleted student.
+FTS_TABLE = 'api_student_fts'
+FTS_COLUMNS = ('university', 'major', 'bio', 'projects', 'certifications')
+# bm25 column weights, same order as FTS_COLUMNS
+FTS_WEIGHTS = (2.0, 2.0, 1.0, 1.0, 1.5)
+MAX_RESULTS = 100
+
+
+def is_available():
+    return connection.vendor == 'sqlite'
+
+
+def _documents(student_ids):
+    docs = {
+        sid: {"university": university, "major": major, "bio": bio, "projects": [], "certifications": []}
+        for sid, university, major, bio in StudentProfile.objects.filter(id__in=student_ids)
+        .values_list('id', 'university', 'major', 'bio')
+    }
+    projects = StudentProject.objects.filter(student_id__in=docs).values_list('student_id', 'title', 'description')
+    for sid, title, description in projects:
+        docs[sid]["projects"].extend([title, description])
+    certs = StudentCertification.objects.filter(student_id__in=docs).values_list('student_id', 'certification_name')
+    for sid, name in certs:
+        docs[sid]["certifications"].append(name)
+
+    for sid, doc in docs.items():
+        yield (sid, doc["university"], doc["major"], doc["bio"],
+               "\n".join(filter(None, doc["projects"])), "\n".join(filter(None, doc["certifications"])))
+
+
+def index_students(student_ids):
+    """(Re)indexes the given students; call after any write to a profile, project or certification."""
+    if not is_available() or not student_ids:
+        return
+    student_ids = list(student_ids)
+    columns = ', '.join(FTS_COLUMNS)
+    placeholders = ', '.join(['%s'] * (len(FTS_COLUMNS) + 1))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({', '.join(['%s'] * len(student_ids))})",
+            student_ids
+        )
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, {columns}) VALUES ({placeholders})",
+            list(_documents(student_ids))
+        )
+
+
+def index_student(student_id):
+    index_students([student_id])
+
+
+def build_match_query(text, match='all'):
+    # Quote every token so user input can never be parsed as FTS5 syntax.
+    tokens = re.findall(r'\w+', text or '')
+    if not tokens:
+        return ''
+    quoted = [f'"{t}"' for t in tokens]
+    quoted[-1] += '*'  # prefix match on the last word ("pyth" -> python)
+    return (' OR ' if match == 'any' else ' ').join(quoted)
+
+
+def search_students(text, limit=20, match='all'):
+    """Returns [(student_id, score, highlight)] ranked by bm25, best first."""
+    query = build_match_query(text, match)
+    if not query:
+        return []
+    limit = max(1, min(int(limit), MAX_RESULTS))
+
+    if not is_available():
+        return _fallback_search(text, limit)
+
+    weights = ', '.join(str(w) for w in FTS_WEIGHTS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, bm25({FTS_TABLE}, {weights}) AS score, "
+            f"snippet({FTS_TABLE}, -1, '<mark>', '</mark>', '…', 12) "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY score LIMIT %s",
+            [query, limit]
+        )
+        # bm25() is "lower is better"; flip the sign so clients sort descending
+        return [(sid, -score, highlight) for sid, score, highlight in cursor.fetchall()]
+
+
+def _fallback_search(text, limit):
+    # Unranked substring match for non-SQLite databases.
+    condition = Q()
+    for token in re.findall(r'\w+', text):
+        condition &= (Q(bio__icontains=token) | Q(major__icontains=token) | Q(university__icontains=token)
+                      | Q(studentproject__title__icontains=token)
+                      | Q(studentproject__description__icontains=token)
+                      | Q(studentcertification__certification_name__icontains=token))
+    ids = StudentProfile.objects.filter(condition).values_list('id', flat=True).distinct()[:limit]
+    return [(sid, 0.0, '') for sid in ids]
@@ -0,0 +1,271 @@
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from recruiter.models import RecruiterProfile
+from .fulltext import index_students
+from .models import StudentProfile, StudentProject, User
+from .skills import rebuild_skill_postings
+
+# Bulk onboarding of student cohorts and partner recruiters (manage.py import_profiles).
+# Rows are read lazily, validated, and written per batch with bulk_create inside one
+# transaction, so a batch is either fully imported or not at all and a checkpoint after
+# each committed batch makes the import resumable.
+
+ROLES = ('student', 'recruiter')
+STUDENT_FIELDS = {
+    f.name: f for f in StudentProfile._meta.concrete_fields
+    if f.editable and f.name not in ('id', 'user', 'profile_views', 'updated_at', 'content_version')
+}
+RECRUITER_FIELDS = ('phone', 'company_name', 'position', 'location')
+PROJECT_FIELDS = ('title', 'description', 'technologies', 'video_url')
+# CSV cells holding lists use ';' like the CSV exports (api/streaming.py)
+LIST_FIELDS = {'skills', 'preferred_locations', 'multiple_website_urls', 'projects'}
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'on'}
+
+
+class RowError(ValueError):
+    pass
+
+
+# --- Reading ---
+
+def _csv_row(row):
+    parsed = {}
+    for key, value in row.items():
+        if key is None or value is None or value == '':
+            continue
+        if key in LIST_FIELDS:
+            value = [v.strip() for v in value.split(';') if v.strip()]
+        parsed[key] = value
+    if 'projects' in parsed:
+        parsed['projects'] = [{"title": title} for title in parsed['projects']]
+    return parsed
+
+
+def read_rows(f, fmt):
+    """Yields (row number, dict or RowError) from an NDJSON or CSV stream, one row at a time."""
+    if fmt == 'csv':
+        for number, row in enumerate(csv.DictReader(f), start=1):
+            yield number, _csv_row(row)
+        return
+    for number, line in enumerate(f, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, RowError(f"Invalid JSON: {e}")
+            continue
+        yield number, row if isinstance(row, dict) else RowError("Each line must be a JSON object")
+
+
+# --- Validation ---
+
+def _as_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def _student_values(row):
+    values = {}
+    for name, field in STUDENT_FIELDS.items():
+        if name not in row:
+            continue
+        value = row[name]
+        if field.get_internal_type() == 'JSONField':
+            if not isinstance(value, list):
+                raise RowError(f"{name} must be a list")
+        elif field.get_internal_type() == 'BooleanField':
+            value = _as_bool(value)
+        elif value is None:
+            value = ''
+        else:
+            value = str(value)
+        values[name] = value
+    try:
+        StudentProfile(**values).clean_fields(exclude=['id', 'user'])
+    except ValidationError as e:
+        raise RowError(json.dumps(e.message_dict))
+    return values
+
+
+def _projects(row):
+    projects = row.get('projects') or []
+    if not isinstance(projects, list):
+        raise RowError("projects must be a list")
+    result = []
+    for project in projects:
+        if not isinstance(project, dict) or not str(project.get('title') or '').strip():
+            raise RowError("every project needs a title")
+        values = {f: project[f] for f in PROJECT_FIELDS if project.get(f) is not None}
+        try:
+            StudentProject(**values).clean_fields(exclude=['id', 'student'])
+        except ValidationError as e:
+            raise RowError(json.dumps(e.message_dict))
+        result.append(values)
+    return result
+
+
+def validate_row(row, default_role=None):
+    """Normalizes one input row into the values the importer writes; raises RowError."""
+    email = User.objects.normalize_email(str(row.get('email') or '').strip())
+    name = str(row.get('name') or '').strip()
+    role = str(row.get('role') or default_role or '').strip()
+    if not email or not name:
+        raise RowError("email and name are required")
+    try:
+        validate_email(email)
+    except ValidationError:
+        raise RowError(f"Invalid email: {email}")
+    if role not in ROLES:
+        raise RowError(f"role must be one of: {', '.join(ROLES)}")
+
+    password_hash = row.get('password_hash')
+    if password_hash:
+        try:
+            identify_hasher(password_hash)
+        except ValueError:
+            raise RowError("password_hash is not a recognized Django password hash")
+
+    parsed = {
+        "email": email,
+        "name": name,
+        "role": role,
+        "password": row.get('password') or None,
+        "password_hash": password_hash or None,
+    }
+    if role == 'student':
+        parsed["profile"] = _student_values(row)
+        parsed["projects"] = _projects(row)
+    else:
+        parsed["profile"] = {f: str(row[f]) for f in RECRUITER_FIELDS if row.get(f) is not None}
+    return parsed
+
+
+# --- Password hashing ---
+
+def _init_worker():
+    # spawn-based pools start without Django configured
+    django.setup()
+
+
+class PasswordHasher:
+    """
+    make_password for a batch: plaintext passwords are hashed in a process pool (each
+    PBKDF2 hash is CPU bound); with unusable=True they are ignored and the accounts get
+    unusable passwords (password reset / OTP flow). Pre-hashed values pass through.
+    """
+
+    def __init__(self, workers=None, unusable=False):
+        self.unusable = unusable
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self._pool = None
+
+    def __enter__(self):
+        if not self.unusable and self.workers > 1:
+            self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker)
+        return self
+
+    def __exit__(self, *exc):
+        if self._pool is not None:
+            self._pool.shutdown()
+
+    def hash_all(self, rows):
+        plain = [] if self.unusable else [r["password"] for r in rows if r["password"] and not r["password_hash"]]
+        if self._pool is not None and len(plain) > 1:
+            hashed = iter(self._pool.map(make_password, plain, chunksize=max(1, len(plain) // (self.workers * 4))))
+        else:
+            hashed = iter([make_password(p) for p in plain])
+        result = []
+        for r in rows:
+            if r["password_hash"]:
+                result.append(r["password_hash"])
+            elif r["password"] and not self.unusable:
+                result.append(next(hashed))
+            else:
+                result.append(make_password(None))
+        return result
+
+
+# --- Writing ---
+
+def import_batch(rows, hasher, verified=False):
+    """
+    rows: [(row number, parsed row)]. Returns (created, [(row number, reason)]) — rows whose
+    email already exists or repeats inside the batch are skipped, not failed.
+    """
+    skipped, unique = [], {}
+    for number, row in rows:
+        if row["email"] in unique:
+            skipped.append((number, f"duplicate email in input: {row['email']}"))
+        else:
+            unique[row["email"]] = (number, row)
+    existing = set(User.objects.filter(email__in=unique).values_list('email', flat=True))
+    for email in existing:
+        skipped.append((unique.pop(email)[0], f"user already exists: {email}"))
+    if not unique:
+        return 0, skipped
+
+    parsed = [row for _, row in unique.values()]
+    passwords = hasher.hash_all(parsed)
+    with transaction.atomic():
+        User.objects.bulk_create([
+            User(email=row["email"], name=row["name"], role=row["role"], password=password,
+                 is_verified=verified and row["role"] == 'recruiter')
+            for row, password in zip(parsed, passwords)
+        ])
+        # looked up rather than read back, so it also works on backends without RETURNING
+        user_ids = dict(User.objects.filter(email__in=unique).values_list('email', 'id'))
+
+        students = [row for row in parsed if row["role"] == 'student']
+        StudentProfile.objects.bulk_create([
+            StudentProfile(user_id=user_ids[row["email"]], **row["profile"]) for row in students
+        ])
+        student_ids = dict(
+            StudentProfile.objects.filter(user_id__in=[user_ids[row["email"]] for row in students])
+            .values_list('user_id', 'id')
+        )
+        StudentProject.objects.bulk_create([
+            StudentProject(student_id=student_ids[user_ids[row["email"]]], **project)
+            for row in students for project in row["projects"]
+        ])
+        RecruiterProfile.objects.bulk_create([
+            RecruiterProfile(user_id=user_ids[row["email"]], name=row["name"], **row["profile"])
+            for row in parsed if row["role"] == 'recruiter'
+        ])
+        if student_ids:
+            # keep the skill and full-text indexes in step with the new profiles
+            rebuild_skill_postings(list(student_ids.values()))
+            index_students(list(student_ids.values()))
+    return len(parsed), skipped
+
+
+# --- Checkpoints ---
+
+def load_checkpoint(path, source):
+    """Returns the saved state ({"rows_done": n, totals...}) or {} when starting fresh."""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        state = json.load(f)
+    if state.get("source") != source:
+        raise ValueError(f"Checkpoint {path} belongs to {state.get('source')}, not {source}")
+    return state
+
+
+def save_checkpoint(path, source, rows_done, totals):
+    if not path:
+        return
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump({"source": source, "rows_done": rows_done, **totals}, f)
+    os.replace(tmp, path)   # never leaves a half-written checkpoint
@@ -0,0 +1,220 @@
+import random
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import connection
+
+# Per-request performance instrumentation (PerformanceMiddleware, first in MIDDLEWARE).
+# A sampled request records wall time, SQL (count and time, via connection.execute_wrapper;
+# queries against django_session are reported separately as "session"), DRF rendering time
+# and response size. These go out as a Server-Timing header and into rolling per-route
+# histograms in this process (GET /api/perf/routes/, staff only).
+# Requests that are not sampled only pay for one random() call.
+
+# Upper bounds (ms) of the latency buckets; the last bucket is open ended.
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+UNMATCHED_ROUTE = '<unmatched>'
+SESSION_TABLE = 'django_session'
+
+
+def sample_rate():
+    return getattr(settings, 'PERF_SAMPLE_RATE', 0.1)
+
+
+class RequestTimings:
+    """Collected for one sampled request; also the execute_wrapper that times SQL."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total_ms = 0.0
+        self.db_ms = 0.0
+        self.queries = 0
+        self.session_ms = 0.0
+        self.render_ms = 0.0
+        self.response_bytes = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.queries += 1
+            if SESSION_TABLE in sql:
+                self.session_ms += elapsed
+            else:
+                self.db_ms += elapsed
+
+    def wrap_render(self, response):
+        """Times response.render() (DRF serialization), which runs after the view returns."""
+        render = response.render
+
+        def timed_render():
+            started = time.perf_counter()
+            try:
+                return render()
+            finally:
+                self.render_ms += (time.perf_counter() - started) * 1000
+        response.render = timed_render
+
+    @property
+    def app_ms(self):
+        return max(0.0, self.total_ms - self.db_ms - self.session_ms - self.render_ms)
+
+    def server_timing(self):
+        parts = [
+            f'app;dur={self.app_ms:.2f}',
+            f'db;dur={self.db_ms:.2f};desc="{self.queries} queries"',
+            f'session;dur={self.session_ms:.2f}',
+            f'render;dur={self.render_ms:.2f}',
+            f'total;dur={self.total_ms:.2f}',
+        ]
+        if self.response_bytes is not None:
+            parts.append(f'size;desc="{self.response_bytes} bytes"')
+        return ', '.join(parts)
+
+
+class RouteStats:
+    __slots__ = ('buckets', 'count', 'total_ms', 'db_ms', 'queries', 'session_ms', 'render_ms', 'response_bytes')
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = self.db_ms = self.session_ms = self.render_ms = 0.0
+        self.queries = 0
+        self.response_bytes = 0
+
+    def add(self, timings):
+        self.buckets[bisect_left(BUCKETS_MS, timings.total_ms)] += 1
+        self.count += 1
+        self.total_ms += timings.total_ms
+        self.db_ms += timings.db_ms
+        self.queries += timings.queries
+        self.session_ms += timings.session_ms
+        self.render_ms += timings.render_ms
+        self.response_bytes += timings.response_bytes or 0
+
+    def merge(self, other):
+        for i, n in enumerate(other.buckets):
+            self.buckets[i] += n
+        for name in ('count', 'total_ms', 'db_ms', 'queries', 'session_ms', 'render_ms', 'response_bytes'):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile (None past the last bound)."""
+        target = p / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= target:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else None
+        return None
+
+    def as_dict(self):
+        count = self.count or 1
+        return {
+            "count": self.count,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "mean_ms": round(self.total_ms / count, 2),
+            "mean_db_ms": round(self.db_ms / count, 2),
+            "mean_queries": round(self.queries / count, 2),
+            "mean_session_ms": round(self.session_ms / count, 2),
+            "mean_render_ms": round(self.render_ms / count, 2),
+            "mean_response_bytes": round(self.response_bytes / count),
+            "buckets": dict(zip([*map(str, BUCKETS_MS), '+Inf'], self.buckets)),
+        }
+
+
+class RollingHistograms:
+    """
+    Per-(method, route) stats over the current and the previous window, so a snapshot
+    always covers between one and two windows of traffic.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._current = {}
+        self._previous = {}
+        self._window_started = time.monotonic()
+
+    def _window(self):
+        return getattr(settings, 'PERF_HISTOGRAM_WINDOW', 300)
+
+    def _rotate(self, now):
+        elapsed = now - self._window_started
+        if elapsed < self._window():
+            return
+        # a window with no traffic at all leaves nothing worth keeping
+        self._previous = self._current if elapsed < 2 * self._window() else {}
+        self._current = {}
+        self._window_started = now
+
+    def record(self, key, timings):
+        with self._lock:
+            self._rotate(time.monotonic())
+            stats = self._current.get(key)
+            if stats is None:
+                stats = self._current[key] = RouteStats()
+            stats.add(timings)
+
+    def snapshot(self):
+        with self._lock:
+            self._rotate(time.monotonic())
+            merged = {}
+            for window in (self._previous, self._current):
+                for key, stats in window.items():
+                    merged.setdefault(key, RouteStats()).merge(stats)
+        return merged
+
+    def clear(self):
+        with self._lock:
+            self._current, self._previous = {}, {}
+            self._window_started = time.monotonic()
+
+
+histograms = RollingHistograms()
+
+
+def route_of(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.route if match is not None else UNMATCHED_ROUTE
+
+
+def route_stats():
+    """[{method, route, count, p50_ms, ...}] for this process, busiest routes first."""
+    rows = [{"method": method, "route": route, **stats.as_dict()} for (method, route), stats in histograms.snapshot().items()]
+    rows.sort(key=lambda row: -row["count"])
+    return rows
+
+
+class PerformanceMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = sample_rate()
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return self.get_response(request)
+
+        timings = request._perf_timings = RequestTimings()
+        with connection.execute_wrapper(timings):
+            response = self.get_response(request)
+        timings.total_ms = (time.perf_counter() - timings.started) * 1000
+        if not response.streaming:
+            timings.response_bytes = len(response.content)
+
+        if getattr(settings, 'PERF_SERVER_TIMING', True):
+            response['Server-Timing'] = timings.server_timing()
+        histograms.record((request.method, route_of(request)), timings)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after every process_template_response hook has run
+        timings = getattr(request, '_perf_timings', None)
+        if timings is not None:
+            timings.wrap_render(response)
+        return response
@@ -0,0 +1,160 @@
+import logging
+import threading
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections, transaction
+from django.db.models import Avg, F, Min
+from django.utils import timezone
+
+from . import metrics
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+# Outbound mail goes through the OutboundEmail table instead of blocking the request on SMTP.
+# deliver_pending() claims a batch of due rows, sends them over one pooled connection and
+# reschedules failures with exponential backoff. It runs in a background thread of the web
+# process (EMAIL_QUEUE_THREAD) and/or in `manage.py send_queued_mail` workers.
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def enqueue_email(subject, body, to, from_email=None):
+    email = OutboundEmail.objects.create(
+        subject=subject,
+        body=body,
+        to=list(to),
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL or '',
+        next_attempt_at=timezone.now(),
+    )
+    if _setting('EMAIL_QUEUE_THREAD', True):
+        transaction.on_commit(_worker.wake)
+    return email
+
+
+def _claim(batch_size):
+    # Optimistic claim so several workers never send the same row twice.
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    due = list(OutboundEmail.objects.filter(
+        status=OutboundEmail.STATUS_PENDING, next_attempt_at__lte=now
+    ).order_by('next_attempt_at').values_list('id', flat=True)[:batch_size])
+    if not due:
+        return []
+    lease = timedelta(seconds=_setting('EMAIL_QUEUE_LEASE_SECONDS', 120))
+    OutboundEmail.objects.filter(
+        id__in=due, status=OutboundEmail.STATUS_PENDING, next_attempt_at__lte=now
+    ).update(claim=token, next_attempt_at=now + lease)
+    return list(OutboundEmail.objects.filter(claim=token))
+
+
+def _backoff(attempts):
+    base = _setting('EMAIL_QUEUE_RETRY_BASE_SECONDS', 30)
+    return timedelta(seconds=base * 2 ** (attempts - 1))
+
+
+def _record_failure(email, error, max_attempts):
+    attempts = email.attempts + 1
+    exhausted = attempts >= max_attempts
+    OutboundEmail.objects.filter(id=email.id).update(
+        attempts=attempts,
+        last_error=str(error)[:1000],
+        claim='',
+        status=OutboundEmail.STATUS_FAILED if exhausted else OutboundEmail.STATUS_PENDING,
+        next_attempt_at=timezone.now() + _backoff(attempts),
+    )
+    logger.warning("Email %s to %s failed (attempt %d): %s", email.id, email.to, attempts, error)
+
+
+def deliver_pending(batch_size=None):
+    """Sends one batch of due mail; returns (sent, failed)."""
+    emails = _claim(batch_size or _setting('EMAIL_QUEUE_BATCH_SIZE', 50))
+    if not emails:
+        return 0, 0
+
+    sent = failed = 0
+    max_attempts = _setting('EMAIL_QUEUE_MAX_ATTEMPTS', 5)
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        # SMTP unreachable: the whole batch counts as one failed attempt and backs off,
+        # instead of being re-claimed unchanged after every lease expiry
+        for email in emails:
+            _record_failure(email, e, max_attempts)
+        metrics.EMAIL_DELIVERIES.inc(len(emails), result='failed')
+        return 0, len(emails)
+
+    try:
+        for email in emails:
+            message = EmailMessage(email.subject, email.body, email.from_email, email.to, connection=connection)
+            try:
+                connection.send_messages([message])
+            except Exception as e:
+                failed += 1
+                _record_failure(email, e, max_attempts)
+            else:
+                sent += 1
+                OutboundEmail.objects.filter(id=email.id).update(
+                    status=OutboundEmail.STATUS_SENT, attempts=F('attempts') + 1,
+                    claim='', sent_at=timezone.now(), last_error='',
+                    body=''  # don't keep delivered OTP codes at rest
+                )
+    finally:
+        connection.close()
+        if sent:
+            metrics.EMAIL_DELIVERIES.inc(sent, result='sent')
+        if failed:
+            metrics.EMAIL_DELIVERIES.inc(failed, result='failed')
+    return sent, failed
+
+
+def queue_stats():
+    now = timezone.now()
+    pending = OutboundEmail.objects.filter(status=OutboundEmail.STATUS_PENDING)
+    oldest = pending.aggregate(oldest=Min('created_at'))['oldest']
+    recent = OutboundEmail.objects.filter(
+        status=OutboundEmail.STATUS_SENT, sent_at__gte=now - timedelta(hours=1)
+    ).aggregate(latency=Avg(F('sent_at') - F('created_at')))['latency']
+    return {
+        "pending": pending.count(),
+        "failed": OutboundEmail.objects.filter(status=OutboundEmail.STATUS_FAILED).count(),
+        "oldest_pending_seconds": (now - oldest).total_seconds() if oldest else 0,
+        "avg_delivery_seconds_last_hour": recent.total_seconds() if recent else None,
+    }
+
+
+class _QueueWorker:
+    # One daemon thread per process; woken on enqueue, otherwise polls for retries.
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def wake(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='mail-queue', daemon=True)
+                self._thread.start()
+        self._event.set()
+
+    def _run(self):
+        while True:
+            self._event.wait(timeout=_setting('EMAIL_QUEUE_POLL_SECONDS', 30))
+            self._event.clear()
+            try:
+                while any(deliver_pending()):
+                    pass
+            except Exception:
+                logger.exception("Mail queue delivery failed")
+            finally:
+                close_old_connections()
+
+
+_worker = _QueueWorker()
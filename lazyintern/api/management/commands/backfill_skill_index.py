@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from api.models import StudentProfile
+from api.skills import rebuild_skill_postings
+
+
+class Command(BaseCommand):
+    help = "Builds the normalized skill index (Skill / StudentSkill) from existing profiles and projects."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        ids = StudentProfile.objects.order_by('id').values_list('id', flat=True)
+
+        students = postings = 0
+        batch = []
+        for student_id in ids.iterator(chunk_size=batch_size):
+            batch.append(student_id)
+            if len(batch) >= batch_size:
+                postings += rebuild_skill_postings(batch)
+                students += len(batch)
+                batch = []
+        if batch:
+            postings += rebuild_skill_postings(batch)
+            students += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {postings} skills for {students} students"))
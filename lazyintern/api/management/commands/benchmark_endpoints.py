@@ -0,0 +1,91 @@
+import json
+import platform
+import subprocess
+import time
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from api import benchmark, ranking, synthetic
+from recruiter import similar
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=settings.BASE_DIR, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = ("Benchmarks the API endpoints on synthetic data in a throwaway test database and "
+            "reports p50/p95/p99 latency, queries per request and peak memory as JSON.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='1000,10000,100000', help="Comma separated student counts")
+        parser.add_argument('--recruiters-per-1000', type=int, default=10)
+        parser.add_argument('--bookmarks', type=int, default=30, help="Average bookmarks per recruiter")
+        parser.add_argument('--requests', type=int, default=20, help="Timed requests per endpoint")
+        parser.add_argument('--warmup', type=int, default=1)
+        parser.add_argument('--endpoints', help=f"Comma separated subset of: {', '.join(benchmark.ENDPOINTS)}")
+        parser.add_argument('--warm-cache', action='store_true', help="Keep the response cache between requests")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="Write the JSON report to this file (default: stdout)")
+
+    def handle(self, *args, **options):
+        scales = [int(s) for s in options['scales'].split(',') if s.strip()]
+        endpoints = [e.strip() for e in options['endpoints'].split(',')] if options['endpoints'] else None
+        report = {
+            "meta": {
+                "commit": _git_commit(),
+                "created_at": time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                "seed": options['seed'],
+                "requests": options['requests'],
+                "warm_cache": options['warm_cache'],
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+            },
+            "scales": {},
+        }
+
+        # Never touch the real database or cache: a test database and a private locmem cache.
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+                                   EMAIL_QUEUE_THREAD=False):
+                for scale in scales:
+                    call_command('flush', interactive=False, verbosity=0)
+                    started = time.monotonic()
+                    counts = synthetic.generate(
+                        scale, max(1, scale * options['recruiters_per_1000'] // 1000), options['bookmarks'],
+                        seed=options['seed'],
+                    )
+                    similar.rebuild_all()
+                    if ranking.is_available():
+                        ranking.rebuild()   # the previous scale's rows were flushed
+                    self.stderr.write(f"{scale}: generated in {time.monotonic() - started:.1f}s, benchmarking")
+                    results = benchmark.run_all(endpoints, options['requests'], options['warmup'], options['warm_cache'])
+                    report["scales"][str(scale)] = {"dataset": counts, "endpoints": results}
+                    for name, r in results.items():
+                        if "p50_ms" in r:
+                            self.stderr.write(f"  {name:32} p50 {r['p50_ms']:>9} ms  p95 {r['p95_ms']:>9} ms  "
+                                              f"p99 {r['p99_ms']:>9} ms  {r['queries']:>3} queries  "
+                                              f"{r['peak_memory_kb']:>8} KB")
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+        report["meta"]["max_rss_kb"] = benchmark.max_rss_kb()
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
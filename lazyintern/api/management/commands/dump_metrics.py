@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.metrics import render
+
+
+class Command(BaseCommand):
+    help = ("Prints the /metrics exposition text. With PROMETHEUS_MULTIPROC_DIR set, this is the "
+            "total over every worker process that wrote to that directory.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(render(), ending='')
@@ -0,0 +1,36 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.directory import DIRECTORY_EXPORT_COLUMNS, directory_rows, parse_updated_since
+from api.streaming import DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, encode_rows
+
+
+class Command(BaseCommand):
+    help = "Streams the student directory as CSV or NDJSON to a file or stdout."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', choices=list(EXPORT_FORMATS), default='ndjson')
+        parser.add_argument('--file', help="Destination path (default: stdout)")
+        parser.add_argument('--updated-since', help="Only profiles updated at or after this ISO date/datetime")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            updated_since = parse_updated_since(options['updated_since'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        fmt = options['output']
+        rows = directory_rows(updated_since, flat=fmt == 'csv', chunk_size=options['chunk_size'])
+        out = open(options['file'], 'w', encoding='utf-8', newline='') if options['file'] else sys.stdout
+        started, count = time.monotonic(), -1 if fmt == 'csv' else 0  # csv header is not a row
+        try:
+            for line in encode_rows(rows, DIRECTORY_EXPORT_COLUMNS, fmt):
+                out.write(line)
+                count += 1
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        self.stderr.write(f"Exported {count} students in {time.monotonic() - started:.1f}s")
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api import ranking, response_cache, synthetic
+from recruiter import similar
+
+
+class Command(BaseCommand):
+    help = "Creates deterministic synthetic students, recruiters and bookmarks for load testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=1000)
+        parser.add_argument('--recruiters', type=int, default=50)
+        parser.add_argument('--bookmarks', type=int, default=30, help="Average bookmarks per recruiter")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--clear', action='store_true', help="Delete previously generated synthetic users first")
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            self.stdout.write(f"Deleted {synthetic.clear()} synthetic rows")
+        started = time.monotonic()
+        counts = synthetic.generate(
+            options['students'], options['recruiters'], options['bookmarks'],
+            seed=options['seed'], batch_size=options['batch_size'],
+            progress=lambda n: self.stdout.write(f"{n} students"),
+        )
+        similar.rebuild_all()
+        response_cache.invalidate(response_cache.directory_scope())
+        ranking.mark_dirty()
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {counts['students']} students, {counts['recruiters']} recruiters and "
+            f"{counts['bookmarks']} bookmarks in {time.monotonic() - started:.1f}s"
+        ))
@@ -0,0 +1,97 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import ranking, response_cache
+from api.importer import (
+    PasswordHasher, RowError, import_batch, load_checkpoint, read_rows, save_checkpoint, validate_row,
+)
+
+
+class Command(BaseCommand):
+    help = ("Bulk-imports student and recruiter profiles from NDJSON or CSV "
+            "(email, name, role, password | password_hash, profile fields, projects).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Input file, or - for stdin")
+        parser.add_argument('--format', choices=['ndjson', 'csv'], help="Default: from the file extension")
+        parser.add_argument('--role', choices=['student', 'recruiter'], help="Role for rows without one")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--hash-workers', type=int, default=None,
+                            help="Processes for password hashing (default: CPU count, 1 = in process)")
+        parser.add_argument('--unusable-passwords', action='store_true',
+                            help="Ignore plaintext passwords; accounts must set one via reset")
+        parser.add_argument('--verified', action='store_true', help="Mark imported recruiters as verified")
+        parser.add_argument('--checkpoint', help="JSON file recording progress; rerun with it to resume")
+        parser.add_argument('--errors', help="Write rejected rows as NDJSON to this file")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('csv' if path.lower().endswith('.csv') else 'ndjson')
+        try:
+            state = load_checkpoint(options['checkpoint'], path)
+        except ValueError as e:
+            raise CommandError(str(e))
+        resume_after = state.get("rows_done", 0)
+        if resume_after:
+            self.stdout.write(f"Resuming after row {resume_after}")
+
+        source = sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')
+        errors = open(options['errors'], 'a', encoding='utf-8') if options['errors'] else None
+        # totals cover the whole import, including runs before a resume
+        totals = {key: state.get(key, 0) for key in ("created", "skipped", "failed")}
+        started = time.monotonic()
+        batch, last_row, processed = [], resume_after, 0
+
+        def reject(number, reason, key):
+            totals[key] += 1
+            if errors:
+                errors.write(json.dumps({"row": number, "error": reason}) + '\n')
+
+        def flush():
+            nonlocal batch
+            if batch:
+                created, skipped = import_batch(batch, hasher, verified=options['verified'])
+                totals["created"] += created
+                for number, reason in skipped:
+                    reject(number, reason, "skipped")
+                batch = []
+            save_checkpoint(options['checkpoint'], path, last_row, totals)
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f"row {last_row}: created {totals['created']}, skipped {totals['skipped']}, "
+                f"failed {totals['failed']} ({processed / elapsed if elapsed else 0:.0f} rows/s)"
+            )
+
+        try:
+            with PasswordHasher(options['hash_workers'], unusable=options['unusable_passwords']) as hasher:
+                for number, row in read_rows(source, fmt):
+                    if number <= resume_after:
+                        continue
+                    processed += 1
+                    try:
+                        if isinstance(row, RowError):
+                            raise row
+                        batch.append((number, validate_row(row, options['role'])))
+                    except RowError as e:
+                        reject(number, str(e), "failed")
+                    last_row = number
+                    if len(batch) >= options['batch_size']:
+                        flush()
+                flush()
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if errors:
+                errors.close()
+
+        response_cache.invalidate(response_cache.directory_scope())
+        ranking.mark_dirty()
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {totals['created']} profiles in total; {processed} rows read in {elapsed:.1f}s "
+            f"({processed / elapsed if elapsed else 0:.0f} rows/s); "
+            f"skipped {totals['skipped']}, failed {totals['failed']}"
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.otp import purge_expired
+
+
+class Command(BaseCommand):
+    help = "Deletes expired OTP codes."
+
+    def handle(self, *args, **options):
+        deleted = purge_expired()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired OTP codes"))
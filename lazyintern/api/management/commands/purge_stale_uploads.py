@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from api.chunked_upload import purge_stale_uploads
+
+
+class Command(BaseCommand):
+    help = "Removes chunked uploads (and their temp files) that have not received data for a while."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24)
+
+    def handle(self, *args, **options):
+        count = purge_stale_uploads(timedelta(hours=options['hours']))
+        self.stdout.write(self.style.SUCCESS(f"Removed {count} stale uploads"))
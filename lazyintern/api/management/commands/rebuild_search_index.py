@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from api import fulltext
+from api.models import StudentProfile
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the full-text search index over student profiles, projects and certifications."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if not fulltext.is_available():
+            raise CommandError("Full-text index requires SQLite FTS5")
+
+        batch_size = options['batch_size']
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {fulltext.FTS_TABLE}")
+            ids = StudentProfile.objects.order_by('id').values_list('id', flat=True)
+            batch, total = [], 0
+            for student_id in ids.iterator(chunk_size=batch_size):
+                batch.append(student_id)
+                if len(batch) >= batch_size:
+                    fulltext.index_students(batch)
+                    total += len(batch)
+                    batch = []
+            fulltext.index_students(batch)
+            total += len(batch)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {fulltext.FTS_TABLE}({fulltext.FTS_TABLE}) VALUES ('optimize')")
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} students"))
@@ -0,0 +1,30 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.mail_queue import deliver_pending, queue_stats
+
+
+class Command(BaseCommand):
+    help = "Delivers queued outbound email; with --loop keeps running as a worker."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Keep polling for new mail")
+        parser.add_argument('--interval', type=float, default=5, help="Seconds between polls with --loop")
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--stats', action='store_true', help="Print queue depth and latency, then exit")
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.stdout.write(json.dumps(queue_stats(), indent=2))
+            return
+
+        while True:
+            sent, failed = deliver_pending(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed}")
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,169 @@
+import os
+import re
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseForbidden
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_http_methods
+
+from .blobs import BLOB_PREFIX, user_can_read
+
+# Range-aware serving for uploaded media (resumes, project videos, certificates).
+# The response wraps the open file, so a WSGI server with wsgi.file_wrapper (gunicorn,
+# uwsgi) sends the requested slice with sendfile(); memory use does not depend on the
+# file or range size.
+
+MEDIA_PREFIXES = ('resumes', 'project-videos', 'certificates', BLOB_PREFIX)
+OWNED_PREFIXES = ('resumes', 'project-videos')   # <prefix>/<user_id>/<filename>
+BLOCK_SIZE = 256 * 1024
+CACHE_CONTROL = 'private, max-age=3600'
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class _FileSlice:
+    """
+    File object limited to `length` bytes from the current position. It exposes fileno()
+    so file_wrapper implementations can sendfile() the slice (they stop at Content-Length),
+    and read() stops at the end of the slice for servers that iterate instead.
+    """
+
+    def __init__(self, f, start, length):
+        f.seek(start)
+        self._file = f
+        self._remaining = length
+        self.name = f.name
+
+    def read(self, size=-1):
+        if self._remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def close(self):
+        self._file.close()
+
+
+def can_access(user, path):
+    if not user.is_authenticated:
+        return False
+    if user.is_staff or user.role == 'recruiter':
+        return True
+    parts = path.split('/')
+    if parts[0] == BLOB_PREFIX:
+        return user_can_read(user.id, path)
+    if parts[0] in OWNED_PREFIXES:
+        return len(parts) > 2 and parts[1] == str(user.id)
+    # Certificates are stored without an owner directory; any signed-in user may read them.
+    return True
+
+
+def parse_range(header, size):
+    """
+    Returns (start, end) for a single byte range, None to ignore the header (multi-range
+    or malformed, served as a full 200) or raises ValueError when it is unsatisfiable.
+    """
+    match = _RANGE_RE.match(header.strip()) if header else None
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError(header)
+    return start, end
+
+
+def _etag(stat):
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def _not_modified(request, etag, mtime):
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        return if_none_match.strip() == '*' or etag in [t.strip() for t in if_none_match.split(',')]
+    since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return since is not None and int(mtime) <= since
+
+
+def _if_range_ok(request, etag, mtime):
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"'):
+        return if_range == etag
+    since = parse_http_date_safe(if_range)
+    return since is not None and int(mtime) == since
+
+
+@require_http_methods(['GET', 'HEAD'])
+def serve_media(request, path):
+    try:
+        full_path = default_storage.path(path)
+    except (SuspiciousFileOperation, NotImplementedError):
+        raise Http404("File not found")
+    if path.split('/')[0] not in MEDIA_PREFIXES:
+        raise Http404("File not found")
+    # Access is checked before the file is even opened.
+    if not can_access(request.user, path):
+        return HttpResponseForbidden("You do not have access to this file")
+
+    try:
+        f = open(full_path, 'rb')
+    except (FileNotFoundError, IsADirectoryError):
+        raise Http404("File not found")
+    stat = os.fstat(f.fileno())
+    size = stat.st_size
+    etag = _etag(stat)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Accept-Ranges': 'bytes',
+        'Cache-Control': CACHE_CONTROL,
+    }
+
+    if _not_modified(request, etag, stat.st_mtime):
+        f.close()
+        response = HttpResponse(status=304)
+        for key, value in headers.items():
+            response[key] = value
+        return response
+
+    byte_range = None
+    if size and _if_range_ok(request, etag, stat.st_mtime):
+        try:
+            byte_range = parse_range(request.headers.get('Range'), size)
+        except ValueError:
+            f.close()
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            response['Accept-Ranges'] = 'bytes'
+            return response
+
+    start, end = byte_range or (0, size - 1)
+    length = end - start + 1 if size else 0
+    # Content-Type and Content-Disposition are derived from the file name by FileResponse.
+    response = FileResponse(_FileSlice(f, start, length), status=206 if byte_range else 200)
+    response.block_size = BLOCK_SIZE
+    response['Content-Length'] = str(length)
+    if byte_range:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    for key, value in headers.items():
+        response[key] = value
+    return response
@@ -0,0 +1,287 @@
+import atexit
+import glob
+import hmac
+import json
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.db import DatabaseError, connection
+from django.http import HttpResponse
+from django.utils import timezone
+
+from .instrumentation import route_of
+
+# Prometheus metrics in the text exposition format (GET /metrics, manage.py dump_metrics).
+#
+# Counters and histograms live in a per-process dict of samples. With several worker
+# processes, set PROMETHEUS_MULTIPROC_DIR to a directory shared by all of them (and empty
+# it when the service is restarted): every process writes its samples to its own file at
+# most every METRICS_FLUSH_INTERVAL seconds, and a scrape adds up the files of all
+# processes, including those that have exited, so counters never go backwards.
+# Gauges (active sessions, mail queue) are read from the database at scrape time.
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+logger = logging.getLogger(__name__)
+
+
+def multiproc_dir():
+    return getattr(settings, 'METRICS_MULTIPROC_DIR', '')
+
+
+class _Samples:
+    """{(sample name, ((label, value), ...)): value} of this process, flushed to its own file."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = defaultdict(float)
+        self._path = None
+        self._timer = None
+
+    def after_fork(self):
+        # forked worker: the parent's samples are the parent's, and the lock may have been
+        # held by one of its threads at fork time
+        self._lock = threading.Lock()
+        self._values = defaultdict(float)
+        self._path = None
+        self._timer = None
+
+    def add(self, items):
+        with self._lock:
+            for key, amount in items:
+                self._values[key] += amount
+            if self._timer is None and multiproc_dir():
+                self._timer = threading.Timer(getattr(settings, 'METRICS_FLUSH_INTERVAL', 1), self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def local(self):
+        with self._lock:
+            return dict(self._values)
+
+    def own_path(self):
+        if self._path is None and multiproc_dir():
+            self._path = os.path.join(multiproc_dir(), f"metrics-{os.getpid()}-{uuid.uuid4().hex[:8]}.json")
+        return self._path
+
+    def flush(self):
+        with self._lock:
+            self._timer = None
+            path = self.own_path()
+            if path is None:
+                return
+            rows = [[name, [list(pair) for pair in labels], value] for (name, labels), value in self._values.items()]
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(rows, f)
+        os.replace(tmp, path)   # a scrape never reads a half-written file
+
+    def collect(self):
+        """Samples of every process: this one live, the others from their last flushed file."""
+        values = defaultdict(float, self.local())
+        directory = multiproc_dir()
+        if directory:
+            own = self.own_path()
+            for path in glob.glob(os.path.join(directory, 'metrics-*.json')):
+                if path == own:
+                    continue
+                try:
+                    with open(path) as f:
+                        rows = json.load(f)
+                except (OSError, ValueError):
+                    continue    # removed or replaced between glob and open
+                for name, labels, value in rows:
+                    values[(name, tuple(tuple(pair) for pair in labels))] += value
+        return values
+
+
+_samples = _Samples()
+atexit.register(_samples.flush)
+os.register_at_fork(after_in_child=_samples.after_fork)
+REGISTRY = []
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        REGISTRY.append(self)
+
+    def _labels(self, labels):
+        return tuple((name, str(labels[name])) for name in self.labelnames)
+
+    def sample_names(self):
+        return (self.name,)
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        _samples.add([((self.name, self._labels(labels)), amount)])
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets) + (math.inf,)
+
+    def observe(self, value, **labels):
+        labels = self._labels(labels)
+        # buckets are stored cumulatively, so samples from several processes just add up;
+        # the ones below `value` get 0 so every bucket of a label set is always exposed
+        items = [((f'{self.name}_bucket', labels + (('le', _format_value(le)),)), int(value <= le))
+                 for le in self.buckets]
+        items.append(((f'{self.name}_sum', labels), value))
+        items.append(((f'{self.name}_count', labels), 1))
+        _samples.add(items)
+
+    def sample_names(self):
+        return (f'{self.name}_bucket', f'{self.name}_sum', f'{self.name}_count')
+
+
+class Gauge(_Metric):
+    """Read at scrape time from the values returned by _gauge_values()."""
+    kind = 'gauge'
+
+
+# --- Metrics ---
+
+REQUESTS = Counter('lazyintern_http_requests_total', 'HTTP requests by route, method and status code.',
+                   ('route', 'method', 'status'))
+REQUEST_DURATION = Histogram('lazyintern_http_request_duration_seconds', 'Time spent serving a request.',
+                             ('route', 'method'))
+DB_QUERIES = Counter('lazyintern_db_queries_total', 'SQL queries executed while serving requests.', ('route',))
+OTP_ISSUED = Counter('lazyintern_otp_issued_total', 'OTP codes issued.', ('purpose',))
+OTP_EMAILS = Counter('lazyintern_otp_emails_total', 'OTP emails by queueing result (queued / failed).', ('result',))
+OTP_VERIFICATIONS = Counter('lazyintern_otp_verifications_total', 'OTP checks by result.', ('purpose', 'result'))
+EMAIL_DELIVERIES = Counter('lazyintern_email_deliveries_total', 'Queued mail delivery attempts (sent / failed).',
+                           ('result',))
+UPLOADS = Counter('lazyintern_uploads_total', 'Uploaded files by kind.', ('kind',))
+UPLOAD_BYTES = Counter('lazyintern_upload_bytes_total', 'Uploaded bytes by kind.', ('kind',))
+RESPONSE_CACHE = Counter('lazyintern_response_cache_requests_total', 'Response cache lookups (hit / miss).',
+                         ('view', 'result'))
+
+
+ACTIVE_SESSIONS = Gauge('lazyintern_active_sessions', 'Unexpired sessions in the session store.')
+EMAIL_QUEUE_PENDING = Gauge('lazyintern_email_queue_pending', 'Outbound emails waiting for delivery.')
+EMAIL_QUEUE_FAILED = Gauge('lazyintern_email_queue_failed', 'Outbound emails that exhausted their retries.')
+EMAIL_QUEUE_OLDEST = Gauge('lazyintern_email_queue_oldest_pending_seconds', 'Age of the oldest pending outbound email.')
+
+
+def _gauge_values():
+    """{gauge name: value}; a database error leaves the gauges out instead of failing the scrape."""
+    from .mail_queue import queue_stats
+    try:
+        queue = queue_stats()
+        return {
+            ACTIVE_SESSIONS.name: Session.objects.filter(expire_date__gt=timezone.now()).count(),
+            EMAIL_QUEUE_PENDING.name: queue["pending"],
+            EMAIL_QUEUE_FAILED.name: queue["failed"],
+            EMAIL_QUEUE_OLDEST.name: queue["oldest_pending_seconds"],
+        }
+    except DatabaseError:
+        logger.exception("Could not read gauge values for /metrics")
+        return {}
+
+
+# --- Exposition ---
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _line(name, labels, value):
+    if labels:
+        name += '{' + ','.join(f'{key}="{_escape(val)}"' for key, val in labels) + '}'
+    return f'{name} {_format_value(value)}'
+
+
+def _bucket_order(item):
+    (name, labels), _ = item
+    le = labels[-1][1] if name.endswith('_bucket') else ''
+    return (labels[:-1] if le else labels, math.inf if le == '+Inf' else float(le or 0))
+
+
+def render():
+    """The text exposition of every registered metric, aggregated over all processes."""
+    values = _samples.collect()
+    gauges = _gauge_values()
+    by_name = defaultdict(list)
+    for key, value in values.items():
+        by_name[key[0]].append((key, value))
+
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        if isinstance(metric, Gauge):
+            if metric.name in gauges:
+                lines.append(_line(metric.name, (), gauges[metric.name]))
+            continue
+        for sample_name in metric.sample_names():
+            for (name, labels), value in sorted(by_name[sample_name], key=_bucket_order):
+                lines.append(_line(name, labels, value))
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        given = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(given.encode(), f'Bearer {token}'.encode()):
+            return HttpResponse('Unauthorized\n', status=401, content_type='text/plain')
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
+
+
+# --- Middleware ---
+
+class MetricsMiddleware:
+    """Counts every request (unsampled): status, latency and SQL queries per route."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            return self.get_response(request)
+
+        queries = [0]
+
+        def count_query(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        with connection.execute_wrapper(count_query):
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        # the URL pattern, as PerformanceMiddleware uses: URL names repeat across apps
+        route = route_of(request)
+        REQUESTS.inc(route=route, method=request.method, status=response.status_code)
+        REQUEST_DURATION.observe(elapsed, route=route, method=request.method)
+        if queries[0]:
+            DB_QUERIES.inc(queries[0], route=route)
+        return response
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_studentprofile_recent_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('display_name', models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StudentSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('profile', 'Profile'), ('project', 'Project')], max_length=10)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='api.skill')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_postings', to='api.studentprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['skill', 'source', 'student'], name='studentskill_lookup_idx')],
+                'constraints': [models.UniqueConstraint(fields=('student', 'skill', 'source'), name='unique_student_skill_source')],
+            },
+        ),
+    ]
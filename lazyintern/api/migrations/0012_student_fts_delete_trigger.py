@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def create_delete_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    # rows of students deleted before the trigger existed
+    schema_editor.execute("DELETE FROM api_student_fts WHERE rowid NOT IN (SELECT id FROM api_studentprofile)")
+    schema_editor.execute(
+        "CREATE TRIGGER IF NOT EXISTS api_student_fts_delete AFTER DELETE ON api_studentprofile "
+        "BEGIN DELETE FROM api_student_fts WHERE rowid = old.id; END"
+    )
+
+
+def drop_delete_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TRIGGER IF EXISTS api_student_fts_delete")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_stored_blobs'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_delete_trigger, drop_delete_trigger),
+    ]
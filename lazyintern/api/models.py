@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 
@@ -54,6 +56,13 @@ class StudentProfile(models.Model):
     skills = models.JSONField(blank=True, default=list)
     profile_views = models.IntegerField(default=0)
     updated_at = models.DateTimeField(auto_now=True)
+    content_version = models.PositiveIntegerField(default=0)  # projeler / sertifikalar her değiştiğinde artar
+
+    class Meta:
+        indexes = [
+            # Keyset pagination order for recruiter search ("recent" first)
+            models.Index(fields=['-updated_at', '-id'], name='studentprofile_recent_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.name}'s profile"
@@ -85,3 +94,139 @@ class StudentCertification(models.Model):
 
     def __str__(self):
         return self.certification_name
+
+
+# Normalized skill dictionary (case-folded) for indexed skill queries
+class Skill(models.Model):
+    name = models.CharField(max_length=100, unique=True)  # normalized, see api.skills.normalize_skill
+    display_name = models.CharField(max_length=100)
+
+    def __str__(self):
+        return self.display_name
+
+
+# Posting table: which student has which skill, and where it was declared
+class StudentSkill(models.Model):
+    SOURCE_PROFILE = 'profile'
+    SOURCE_PROJECT = 'project'
+    SOURCE_CHOICES = [(SOURCE_PROFILE, 'Profile'), (SOURCE_PROJECT, 'Project')]
+
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='skill_postings')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='postings')
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'skill', 'source'], name='unique_student_skill_source'),
+        ]
+        indexes = [
+            # skill -> students lookups for all-of / any-of queries
+            models.Index(fields=['skill', 'source', 'student'], name='studentskill_lookup_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id}: {self.skill_id} ({self.source})"
+
+
+# One pending OTP per (email, purpose); only an HMAC of the code is stored
+class OTPCode(models.Model):
+    email = models.EmailField()
+    purpose = models.CharField(max_length=20, default='signup')
+    code_hash = models.CharField(max_length=64)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['email', 'purpose'], name='unique_otp_email_purpose'),
+        ]
+
+    def __str__(self):
+        return f"{self.email} ({self.purpose})"
+
+
+# Outbox for asynchronous mail delivery (api/mail_queue.py)
+class OutboundEmail(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [(STATUS_PENDING, 'Pending'), (STATUS_SENT, 'Sent'), (STATUS_FAILED, 'Failed')]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255, blank=True)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    claim = models.CharField(max_length=32, blank=True)
+    next_attempt_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outboundemail_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)}"
+
+
+# Resumable, chunked project video upload (api/chunked_upload.py)
+class ChunkedUpload(models.Model):
+    STATUS_ACTIVE = 'active'
+    STATUS_COMPLETE = 'complete'
+    STATUS_CHOICES = [(STATUS_ACTIVE, 'Active'), (STATUS_COMPLETE, 'Complete')]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user_id = models.BigIntegerField()
+    project_id = models.CharField(max_length=64, blank=True)
+    filename = models.CharField(max_length=255)
+    total_size = models.BigIntegerField()
+    offset = models.BigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, blank=True)  # optional checksum of the whole file
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_ACTIVE)
+    path = models.CharField(max_length=500, blank=True)  # storage path once complete
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.total_size})"
+
+
+# Content-addressed file storage: one StoredBlob per distinct file content, one
+# BlobReference per upload that points at it. ref_count mirrors the number of references.
+class StoredBlob(models.Model):
+    sha256 = models.CharField(max_length=64, unique=True)
+    path = models.CharField(max_length=500)
+    size = models.BigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.path} ({self.ref_count} refs)"
+
+
+class BlobReference(models.Model):
+    KIND_RESUME = 'resume'
+    KIND_CERTIFICATE = 'certificate'
+    KIND_PROJECT_VIDEO = 'project_video'
+    KIND_CHOICES = [
+        (KIND_RESUME, 'Resume'),
+        (KIND_CERTIFICATE, 'Certificate'),
+        (KIND_PROJECT_VIDEO, 'Project video'),
+    ]
+
+    blob = models.ForeignKey(StoredBlob, on_delete=models.PROTECT, related_name='references')
+    user_id = models.BigIntegerField(null=True, blank=True)  # null on certificates uploaded before user_id was required
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    filename = models.CharField(max_length=255, blank=True)  # original upload name
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['user_id', 'kind'], name='blobref_user_kind_idx')]
+
+    def __str__(self):
+        return f"{self.kind}: {self.filename} -> {self.blob_id}"
@@ -0,0 +1,81 @@
+import hmac
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+from . import metrics
+from .models import OTPCode
+
+# Shared OTP store on the database, so signup / resend / verify work no matter which
+# worker handles them. Codes expire after OTP_TTL_SECONDS and are burned after
+# OTP_MAX_ATTEMPTS wrong guesses; purge_expired() (manage.py purge_expired_otps)
+# removes stale rows in one DELETE.
+
+OTP_OK = 'ok'
+OTP_NOT_FOUND = 'not_found'
+OTP_EXPIRED = 'expired'
+OTP_INVALID = 'invalid'
+OTP_LOCKED = 'locked'
+
+
+def _ttl():
+    return getattr(settings, 'OTP_TTL_SECONDS', 600)
+
+
+def _max_attempts():
+    return getattr(settings, 'OTP_MAX_ATTEMPTS', 5)
+
+
+def _hash(email, purpose, code):
+    return salted_hmac('api.otp', f"{email.lower()}:{purpose}:{code}").hexdigest()
+
+
+def issue_otp(email, purpose='signup'):
+    """Creates (or replaces) the pending code for email/purpose and returns the plain code."""
+    code = f"{secrets.randbelow(900000) + 100000}"
+    OTPCode.objects.update_or_create(
+        email=email.lower(), purpose=purpose,
+        defaults={
+            "code_hash": _hash(email, purpose, code),
+            "attempts": 0,
+            "expires_at": timezone.now() + timedelta(seconds=_ttl()),
+        }
+    )
+    metrics.OTP_ISSUED.inc(purpose=purpose)
+    return code
+
+
+def check_otp(email, code, purpose='signup'):
+    """Returns one of the OTP_* results; a correct code is consumed."""
+    result = _check_otp(email, code, purpose)
+    metrics.OTP_VERIFICATIONS.inc(purpose=purpose, result=result)
+    return result
+
+
+@transaction.atomic
+def _check_otp(email, code, purpose):
+    otp = OTPCode.objects.select_for_update().filter(email=email.lower(), purpose=purpose).first()
+    if otp is None:
+        return OTP_NOT_FOUND
+    if otp.expires_at <= timezone.now():
+        otp.delete()
+        return OTP_EXPIRED
+    if otp.attempts >= _max_attempts():
+        return OTP_LOCKED
+
+    if not hmac.compare_digest(otp.code_hash, _hash(email, purpose, str(code).strip())):
+        OTPCode.objects.filter(id=otp.id).update(attempts=F('attempts') + 1)
+        return OTP_LOCKED if otp.attempts + 1 >= _max_attempts() else OTP_INVALID
+
+    otp.delete()
+    return OTP_OK
+
+
+def purge_expired():
+    deleted, _ = OTPCode.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
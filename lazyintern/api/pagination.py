@@ -0,0 +1,106 @@
+import base64
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+# Keyset (cursor) pagination: page N costs the same as page 1, no OFFSET scans.
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder rounds datetimes to milliseconds, which would skip rows on a keyset boundary.
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, cls=_CursorEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+    if not isinstance(values, list):
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def get_page_size(params, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    try:
+        page_size = int(params.get('page_size', default))
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(page_size, maximum))
+
+
+def _keyset_filter(ordering, values):
+    # (a, b) > (x, y)  ==>  a > x OR (a = x AND b > y)
+    condition = Q()
+    for i, field in enumerate(ordering):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        term = Q(**{f"{name}__{lookup}": values[i]})
+        for prev_field, prev_value in zip(ordering[:i], values[:i]):
+            term &= Q(**{prev_field.lstrip('-'): prev_value})
+        condition |= term
+    return condition
+
+
+def _model_field(model, path):
+    for part in path.lstrip('-').split('__'):
+        field = model._meta.get_field(part)
+        model = field.related_model
+    return field
+
+
+def _cursor_values(model, ordering, values):
+    """The decoded cursor values as the Python types of their ordering fields."""
+    if len(values) != len(ordering):
+        raise InvalidCursor("Invalid cursor")
+    try:
+        converted = [_model_field(model, field).to_python(value) for field, value in zip(ordering, values)]
+    except (ValidationError, TypeError, ValueError):
+        raise InvalidCursor("Invalid cursor")
+    if any(value is None for value in converted):
+        raise InvalidCursor("Invalid cursor")
+    return converted
+
+
+def _cursor_value(obj, field):
+    value = obj
+    for part in field.lstrip('-').split('__'):
+        value = getattr(value, part)
+    return value
+
+
+def keyset_page(queryset, ordering, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    The last ordering field must be unique (usually id) so the sort order is stable.
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = _cursor_values(queryset.model, ordering, decode_cursor(cursor))
+        queryset = queryset.filter(_keyset_filter(ordering, values))
+
+    items = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        next_cursor = encode_cursor([_cursor_value(last, f) for f in ordering])
+    return items, next_cursor
@@ -0,0 +1,24 @@
+from rest_framework.parsers import MultiPartParser
+
+from .blobs import HashingUploadHandler
+
+# The upload handlers are fixed once the multipart body has been parsed, and for session
+# authenticated requests DRF's CSRF check reads request.POST before the view runs. So the
+# hashing handler is installed by the parser itself rather than from inside the view.
+
+
+class HashingMultiPartParser(MultiPartParser):
+    """MultiPartParser that also computes the SHA-256 of every uploaded file as it streams in."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = parser_context['request']
+        handler = HashingUploadHandler(request._request)
+        request.upload_handlers.insert(0, handler)
+        request._request.upload_hashing = handler
+        return super().parse(stream, media_type, parser_context)
+
+
+def upload_digest(request, field):
+    """SHA-256 of the file uploaded as `field`, or None when it was not hashed while parsing."""
+    handler = getattr(request._request, 'upload_hashing', None)
+    return handler.digests.get(field) if handler is not None else None
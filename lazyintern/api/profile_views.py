@@ -0,0 +1,123 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import F
+
+from . import response_cache
+from .models import StudentProfile
+
+logger = logging.getLogger(__name__)
+
+# Existing profiles are remembered in the cache, so a burst of views costs one lookup.
+EXISTS_CACHE_TIMEOUT = 3600
+
+
+class ProfileViewBuffer:
+    """
+    Coalesces profile views in memory and writes them as batched atomic
+    UPDATE ... SET profile_views = profile_views + n statements.
+
+    A flush happens when `flush_interval` seconds have passed or `batch_size`
+    views are pending, whichever comes first, and once more at interpreter
+    exit; a crashed worker loses at most one interval / batch of views.
+    """
+
+    def __init__(self, flush_interval=10, batch_size=100):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending = Counter()
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._timer = None
+
+    def record(self, user_id, count=1):
+        with self._lock:
+            self._pending[user_id] += count
+            self._pending_total += count
+            due = (self._pending_total >= self.batch_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+            if not due and self._timer is None:
+                # Make sure a quiet worker still flushes its last views.
+                self._timer = threading.Timer(self.flush_interval, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.flush()
+
+    def pending(self, user_id):
+        with self._lock:
+            return self._pending.get(user_id, 0)
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._pending_total = 0
+            self._last_flush = time.monotonic()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not pending:
+            return 0
+
+        # One UPDATE per distinct increment instead of one per student.
+        by_count = defaultdict(list)
+        for user_id, count in pending.items():
+            by_count[count].append(user_id)
+        try:
+            for count, user_ids in by_count.items():
+                StudentProfile.objects.filter(user_id__in=user_ids).update(
+                    profile_views=F('profile_views') + count
+                )
+        except Exception:
+            logger.exception("Profile view flush failed, re-queueing %d views", sum(pending.values()))
+            with self._lock:
+                self._pending.update(pending)
+                self._pending_total += sum(pending.values())
+            return 0
+        # the directory listing shows profile_views as well
+        response_cache.invalidate(
+            response_cache.directory_scope(),
+            *(response_cache.student_scope(user_id) for user_id in pending)
+        )
+        return sum(pending.values())
+
+    def _flush_from_timer(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        finally:
+            close_old_connections()
+
+
+profile_view_buffer = ProfileViewBuffer(
+    flush_interval=getattr(settings, 'PROFILE_VIEW_FLUSH_INTERVAL', 10),
+    batch_size=getattr(settings, 'PROFILE_VIEW_FLUSH_BATCH_SIZE', 100),
+)
+atexit.register(profile_view_buffer.flush)
+
+
+def student_exists(user_id):
+    key = f"profile-exists:{user_id}"
+    if cache.get(key):
+        return True
+    exists = StudentProfile.objects.filter(user_id=user_id).exists()
+    if exists:
+        cache.set(key, 1, timeout=EXISTS_CACHE_TIMEOUT)
+    return exists
+
+
+def record_profile_view(user_id, viewer_key):
+    """Buffers one view of the student `user_id`; returns False for a duplicate within the window."""
+    window = getattr(settings, 'PROFILE_VIEW_DEDUP_WINDOW', 0)
+    if window and viewer_key and not cache.add(f"profile-view:{viewer_key}:{user_id}", 1, timeout=window):
+        return False
+    profile_view_buffer.record(user_id)
+    return True
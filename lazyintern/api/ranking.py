@@ -0,0 +1,287 @@
+import re
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Q
+
+from .models import Skill, StudentProfile, StudentSkill
+from .skills import normalize_skill
+
+try:
+    import numpy as np
+except ImportError:  # ranking is unavailable without numpy; the endpoint answers 503
+    np = None
+
+# In-memory ranking index over all students, scored with numpy instead of per-row Python.
+#
+# Skills and locations are stored column-wise (CSC style): for every skill id the array of
+# student rows that have it plus a weight per row. A query only touches the columns of the
+# requested skills, so scoring cost is proportional to their postings, not to the number
+# of skills in the catalogue. Numeric columns (graduation year, recency) are dense arrays.
+#
+# The index is refreshed incrementally: profiles past the (updated_at, id) watermark are
+# tombstoned in the base arrays and kept in a small overlay that is scored in Python, and
+# deleted profiles are tombstoned once the row count shows some are gone.
+# When the overlay grows too large the base arrays are rebuilt.
+
+PROFILE_SKILL_WEIGHT = 1.0
+PROJECT_SKILL_WEIGHT = 0.5     # skill only seen in project technologies
+RECENCY_WEIGHT = 0.05          # tie-breaker for recently updated profiles
+MAX_LIMIT = 100
+
+_YEAR_RE = re.compile(r'(\d{4})')
+
+
+def is_available():
+    return np is not None
+
+
+def parse_year(value):
+    match = _YEAR_RE.search(value or '')
+    return int(match.group(1)) if match else 0
+
+
+def normalize_location(value):
+    return re.sub(r'\s+', ' ', value).strip().casefold() if isinstance(value, str) else ''
+
+
+def _locations(location, preferred, preferred_list):
+    names = {normalize_location(location), normalize_location(preferred)}
+    names.update(normalize_location(v) for v in preferred_list or [])
+    names.discard('')
+    return names
+
+
+def _skill_weight(source):
+    return PROFILE_SKILL_WEIGHT if source == StudentSkill.SOURCE_PROFILE else PROJECT_SKILL_WEIGHT
+
+
+def _load(student_ids=None):
+    """Returns {student_id: (year, updated_ts, {skill_id: weight}, {location})} from the database."""
+    profiles = StudentProfile.objects.all()
+    postings = StudentSkill.objects.all()
+    if student_ids is not None:
+        profiles = profiles.filter(id__in=student_ids)
+        postings = postings.filter(student_id__in=student_ids)
+
+    records = {}
+    fields = ('id', 'graduation_year', 'updated_at', 'location', 'preferred_internship_location', 'preferred_locations')
+    for sid, year, updated_at, location, preferred, preferred_list in profiles.values_list(*fields).iterator(chunk_size=5000):
+        records[sid] = (parse_year(year), updated_at.timestamp(), {}, _locations(location, preferred, preferred_list))
+    for sid, skill_id, source in postings.values_list('student_id', 'skill_id', 'source').iterator(chunk_size=20000):
+        if sid in records:
+            skills = records[sid][2]
+            skills[skill_id] = max(skills.get(skill_id, 0.0), _skill_weight(source))
+    return records
+
+
+class _Snapshot:
+    """Immutable base arrays plus overlay; queries read one snapshot without locking."""
+
+    def __init__(self, records):
+        ids = sorted(records)
+        self.ids = np.array(ids, dtype=np.int64)
+        self.years = np.zeros(len(ids), dtype=np.int16)
+        updated = np.zeros(len(ids), dtype=np.float64)
+        skill_rows, skill_weights, location_rows = defaultdict(list), defaultdict(list), defaultdict(list)
+        for row, sid in enumerate(ids):
+            year, updated_ts, skills, locations = records[sid]
+            self.years[row] = year
+            updated[row] = updated_ts
+            for skill_id, weight in skills.items():
+                skill_rows[skill_id].append(row)
+                skill_weights[skill_id].append(weight)
+            for location in locations:
+                location_rows[location].append(row)
+
+        self.t0 = float(updated.min()) if len(ids) else 0.0
+        self.t1 = float(updated.max()) if len(ids) else 0.0
+        self.recency = self._recency(updated).astype(np.float32)
+        self.skills = {
+            skill_id: (np.array(rows, dtype=np.int32), np.array(skill_weights[skill_id], dtype=np.float32))
+            for skill_id, rows in skill_rows.items()
+        }
+        self.locations = {name: np.array(rows, dtype=np.int32) for name, rows in location_rows.items()}
+        self.alive = np.ones(len(ids), dtype=bool)
+        self.overlay = {}
+
+    def _recency(self, updated):
+        span = self.t1 - self.t0
+        if span <= 0:
+            return np.zeros_like(updated) if hasattr(updated, 'shape') else 0.0
+        return np.clip((updated - self.t0) / span, 0.0, 1.0)
+
+    def row_of(self, sid):
+        row = int(np.searchsorted(self.ids, sid))
+        return row if row < len(self.ids) and self.ids[row] == sid else None
+
+    def live_count(self):
+        # overlay ids are tombstoned in the base arrays, so nothing is counted twice
+        return int(self.alive.sum()) + len(self.overlay)
+
+    def live_ids(self):
+        return set(self.ids[self.alive].tolist()) | set(self.overlay)
+
+    def with_changes(self, records, removed=()):
+        """Copy of this snapshot where `records` replace (tombstone + overlay) existing rows and `removed` are dropped."""
+        changed = object.__new__(_Snapshot)
+        changed.__dict__.update(self.__dict__)
+        changed.alive = self.alive.copy()
+        changed.overlay = dict(self.overlay)
+        for sid in removed:
+            row = self.row_of(sid)
+            if row is not None:
+                changed.alive[row] = False
+            changed.overlay.pop(sid, None)
+        for sid, record in records.items():
+            row = self.row_of(sid)
+            if row is not None:
+                changed.alive[row] = False
+            changed.overlay[sid] = record
+        return changed
+
+    def rank(self, skill_ids, location=None, year_range=None, limit=20, requested=None):
+        # requested: number of skills asked for (some may be unknown), the score denominator
+        requested = requested or len(skill_ids)
+        n = len(self.ids)
+        scores = np.zeros(n, dtype=np.float32)
+        for skill_id in skill_ids:
+            column = self.skills.get(skill_id)
+            if column is not None:
+                rows, weights = column
+                scores[rows] += weights     # rows are unique within a column
+        if skill_ids:
+            scores /= requested
+
+        mask = self.alive.copy()
+        if skill_ids:
+            mask &= scores > 0
+        if year_range:
+            mask &= (self.years >= year_range[0]) & (self.years <= year_range[1])
+        if location:
+            # substring match over the (small) location vocabulary, then a union of its rows
+            in_location = np.zeros(n, dtype=bool)
+            for name, rows in self.locations.items():
+                if location in name:
+                    in_location[rows] = True
+            mask &= in_location
+
+        scores += RECENCY_WEIGHT * self.recency
+        candidates = np.flatnonzero(mask)
+        if len(candidates) > limit:
+            # partial sort: only the top `limit` candidates are ordered
+            top = np.argpartition(-scores[candidates], limit - 1)[:limit]
+            candidates = candidates[top]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        results = [(int(self.ids[row]), float(scores[row])) for row in candidates]
+
+        for sid, record in self.overlay.items():
+            score = self._score_record(record, skill_ids, location, year_range, requested)
+            if score is not None:
+                results.append((sid, score))
+        results.sort(key=lambda hit: -hit[1])
+        return results[:limit]
+
+    def _score_record(self, record, skill_ids, location, year_range, requested):
+        year, updated_ts, skills, locations = record
+        if year_range and not (year_range[0] <= year <= year_range[1]):
+            return None
+        if location and not any(location in name for name in locations):
+            return None
+        score = 0.0
+        if skill_ids:
+            score = sum(skills.get(skill_id, 0.0) for skill_id in skill_ids) / requested
+            if score <= 0:
+                return None
+        return score + RECENCY_WEIGHT * float(self._recency(updated_ts))
+
+
+class RankingIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._watermark = None
+        self._last_id = 0
+        self._checked_at = 0.0
+        self._dirty = False
+
+    def mark_dirty(self):
+        self._dirty = True
+
+    def _refresh_interval(self):
+        return getattr(settings, 'RANKING_REFRESH_SECONDS', 5)
+
+    def _max_overlay(self, snapshot):
+        return max(getattr(settings, 'RANKING_MAX_OVERLAY', 1000), len(snapshot.ids) // 100)
+
+    def rebuild(self):
+        with self._lock:
+            self._rebuild()
+        return self._snapshot
+
+    def _rebuild(self):
+        self._watermark = StudentProfile.objects.order_by('-updated_at', '-id').values_list('updated_at', 'id').first()
+        self._last_id = StudentProfile.objects.aggregate(id=Max('id'))['id'] or 0
+        self._snapshot = _Snapshot(_load())
+        self._checked_at = time.monotonic()
+        self._dirty = False
+
+    def snapshot(self):
+        """Current snapshot, after applying profile changes since the last refresh."""
+        snapshot = self._snapshot
+        if snapshot is not None and not self._dirty and time.monotonic() - self._checked_at < self._refresh_interval():
+            return snapshot
+        with self._lock:
+            if self._snapshot is None:
+                self._rebuild()
+                return self._snapshot
+            self._dirty = False
+            self._checked_at = time.monotonic()
+            changed = StudentProfile.objects.all()
+            if self._watermark is not None:
+                # rows after the (updated_at, id) keyset of the last applied row; new ids catch
+                # rows inserted with an older updated_at (imports, synthetic data)
+                updated_at, sid = self._watermark
+                changed = changed.filter(
+                    Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=sid) | Q(id__gt=self._last_id)
+                )
+            changed = list(changed.values_list('updated_at', 'id'))
+            if len(self._snapshot.overlay) + len(changed) > self._max_overlay(self._snapshot):
+                self._rebuild()
+                return self._snapshot
+            snapshot = self._snapshot
+            if changed:
+                snapshot = snapshot.with_changes(_load([sid for _, sid in changed]))
+                self._watermark = max(changed + ([self._watermark] if self._watermark else []))
+                self._last_id = max(self._last_id, max(sid for _, sid in changed))
+            if StudentProfile.objects.count() != snapshot.live_count():
+                # some profiles were deleted; one id scan finds which
+                gone = snapshot.live_ids() - set(StudentProfile.objects.values_list('id', flat=True))
+                snapshot = snapshot.with_changes({}, removed=gone)
+            self._snapshot = snapshot
+            return self._snapshot
+
+
+_index = RankingIndex()
+
+
+def mark_dirty():
+    """Call after writes that change skills, locations or graduation year."""
+    transaction.on_commit(_index.mark_dirty)
+
+
+def rebuild():
+    return _index.rebuild()
+
+
+def rank_students(skills=(), location='', year_range=None, limit=20):
+    """Returns [(student_id, score)] best first. score is the matched-skill fraction plus a small recency boost."""
+    names = {normalize_skill(s) for s in skills} - {''}
+    skill_ids = list(Skill.objects.filter(name__in=names).values_list('id', flat=True)) if names else []
+    if names and not skill_ids:
+        return []
+    limit = max(1, min(limit, MAX_LIMIT))
+    return _index.snapshot().rank(skill_ids, normalize_location(location), year_range, limit, requested=len(names))
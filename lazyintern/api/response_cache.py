@@ -0,0 +1,92 @@
+import threading
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from . import metrics
+
+# Read-through cache for JSON payloads with versioned keys.
+#
+# Every payload is stored under the current version token of the scopes it depends on
+# ("directory", "student:<user_id>", "bookmarks:<recruiter_id>"). A write replaces the
+# token of its scopes after commit, so older entries become unreachable immediately and
+# simply age out. Readers fetch the tokens before building, so a payload built from
+# pre-commit data can only be stored under a token that is already dead.
+
+KEY_PREFIX = 'resp'
+MISSING = object()
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _timeout():
+    return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+
+def _count(name, outcome):
+    with _stats_lock:
+        _stats[(name, outcome)] += 1
+    metrics.RESPONSE_CACHE.inc(view=name, result=outcome)
+
+
+def stats():
+    """{view name: {"hit": n, "miss": n}} for this process."""
+    with _stats_lock:
+        result = {}
+        for (name, outcome), n in _stats.items():
+            result.setdefault(name, {"hit": 0, "miss": 0})[outcome] = n
+        return result
+
+
+def directory_scope():
+    return 'directory'
+
+
+def student_scope(user_id):
+    return f'student:{user_id}'
+
+
+def bookmarks_scope(recruiter_id):
+    return f'bookmarks:{recruiter_id}'
+
+
+def _version_key(scope):
+    return f'{KEY_PREFIX}:version:{scope}'
+
+
+def _versions(scopes):
+    keys = [_version_key(s) for s in scopes]
+    found = cache.get_many(keys)
+    missing = {k: uuid.uuid4().hex for k in keys if k not in found}
+    if missing:
+        # add() so two readers racing on a cold scope agree on one token
+        for key, token in missing.items():
+            if not cache.add(key, token, timeout=None):
+                token = cache.get(key, token)
+            found[key] = token
+    return [found[k] for k in keys]
+
+
+def get_or_build(name, key_parts, scopes, build):
+    """Returns the cached payload for (name, key_parts) or builds, stores and returns it."""
+    versions = _versions(scopes)
+    key = ':'.join([KEY_PREFIX, name, *map(str, key_parts), *versions])
+    payload = cache.get(key, MISSING)
+    if payload is not MISSING:
+        _count(name, 'hit')
+        return payload
+    _count(name, 'miss')
+    payload = build()
+    cache.set(key, payload, timeout=_timeout())
+    return payload
+
+
+def invalidate(*scopes):
+    """Retires the given scopes once the current transaction commits (immediately outside one)."""
+    def bump():
+        cache.set_many({_version_key(s): uuid.uuid4().hex for s in scopes}, timeout=None)
+    transaction.on_commit(bump)
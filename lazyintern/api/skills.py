@@ -0,0 +1,106 @@
+import re
+
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Skill, StudentProfile, StudentProject, StudentSkill
+
+MAX_SKILL_LENGTH = 100
+
+
+def normalize_skill(value):
+    if not isinstance(value, str):
+        return ''
+    return re.sub(r'\s+', ' ', value).strip().casefold()[:MAX_SKILL_LENGTH]
+
+
+def _collect(values, source, wanted, display):
+    for value in values or []:
+        name = normalize_skill(value)
+        if name:
+            wanted.add((name, source))
+            display.setdefault(name, value.strip()[:MAX_SKILL_LENGTH])
+
+
+def get_or_create_skills(display):
+    """display: {normalized name: display name}. Returns {normalized name: skill id}."""
+    if not display:
+        return {}
+    Skill.objects.bulk_create(
+        [Skill(name=name, display_name=shown) for name, shown in display.items()],
+        ignore_conflicts=True
+    )
+    return dict(Skill.objects.filter(name__in=display).values_list('name', 'id'))
+
+
+@transaction.atomic
+def sync_student_skills(student_id):
+    """Rebuilds the skill postings of one student from profile.skills and project technologies."""
+    skills = StudentProfile.objects.filter(id=student_id).values_list('skills', flat=True).first()
+    wanted, display = set(), {}
+    _collect(skills, StudentSkill.SOURCE_PROFILE, wanted, display)
+    for technologies in StudentProject.objects.filter(student_id=student_id).values_list('technologies', flat=True):
+        _collect(technologies, StudentSkill.SOURCE_PROJECT, wanted, display)
+
+    skill_ids = get_or_create_skills(display)
+    wanted = {(skill_ids[name], source) for name, source in wanted}
+
+    existing = {
+        (skill_id, source): posting_id
+        for posting_id, skill_id, source in StudentSkill.objects.filter(student_id=student_id)
+        .values_list('id', 'skill_id', 'source')
+    }
+    stale = [posting_id for key, posting_id in existing.items() if key not in wanted]
+    if stale:
+        StudentSkill.objects.filter(id__in=stale).delete()
+    StudentSkill.objects.bulk_create(
+        [StudentSkill(student_id=student_id, skill_id=skill_id, source=source)
+         for skill_id, source in wanted - existing.keys()],
+        ignore_conflicts=True
+    )
+
+
+@transaction.atomic
+def rebuild_skill_postings(student_ids):
+    """Batch variant used by the backfill: replaces all postings of the given students."""
+    wanted, display = set(), {}
+    for student_id, skills in StudentProfile.objects.filter(id__in=student_ids).values_list('id', 'skills'):
+        names = set()
+        _collect(skills, StudentSkill.SOURCE_PROFILE, names, display)
+        wanted.update((student_id, name, source) for name, source in names)
+    projects = StudentProject.objects.filter(student_id__in=student_ids).values_list('student_id', 'technologies')
+    for student_id, technologies in projects:
+        names = set()
+        _collect(technologies, StudentSkill.SOURCE_PROJECT, names, display)
+        wanted.update((student_id, name, source) for name, source in names)
+
+    skill_ids = get_or_create_skills(display)
+    StudentSkill.objects.filter(student_id__in=student_ids).delete()
+    StudentSkill.objects.bulk_create([
+        StudentSkill(student_id=student_id, skill_id=skill_ids[name], source=source)
+        for student_id, name, source in wanted
+    ])
+    return len(wanted)
+
+
+def filter_by_skills(queryset, skills, match='all', source=None, field='id'):
+    """
+    Restricts a StudentProfile queryset (or any queryset whose `field` holds a student id)
+    to students having all / any of the given skills, answered from the posting index.
+    """
+    names = {normalize_skill(s) for s in skills} - {''}
+    if not names:
+        return queryset
+
+    postings = StudentSkill.objects.filter(skill__name__in=names)
+    if source:
+        postings = postings.filter(source=source)
+
+    if match == 'any':
+        return queryset.filter(**{f"{field}__in": postings.values('student_id')})
+
+    matching = (postings.values('student_id')
+                .annotate(matched=Count('skill_id', distinct=True))
+                .filter(matched=len(names))
+                .values('student_id'))
+    return queryset.filter(**{f"{field}__in": matching})
@@ -0,0 +1,52 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+# Constant-memory CSV / NDJSON exports: rows are encoded one at a time as the
+# queryset iterator yields them, nothing is collected into a list first.
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+DEFAULT_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    # csv.writer needs a file-like object; return the line instead of buffering it.
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, (list, tuple)):
+        return ';'.join(str(v) for v in value)
+    return '' if value is None else value
+
+
+def encode_csv(rows, columns):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([_csv_value(row.get(c)) for c in columns])
+
+
+def encode_ndjson(rows, columns=None):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def encode_rows(rows, columns, fmt):
+    if fmt == 'csv':
+        return encode_csv(rows, columns)
+    return encode_ndjson(rows, columns)
+
+
+def streaming_export(rows, columns, fmt, filename):
+    """`rows` should be a lazy iterable of dicts, e.g. built over queryset.iterator(chunk_size=...)."""
+    response = StreamingHttpResponse(encode_rows(rows, columns, fmt), content_type=EXPORT_FORMATS[fmt])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+    response['Cache-Control'] = 'no-store'
+    return response
@@ -0,0 +1,196 @@
+import random
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from recruiter.models import Bookmark, RecruiterProfile
+from .fulltext import index_students
+from .models import StudentCertification, StudentProfile, StudentProject, User
+from .skills import rebuild_skill_postings
+
+# Deterministic synthetic data for load testing (generate_synthetic_data, benchmark_endpoints).
+# Every student / recruiter draws from its own Random seeded with (seed, kind, index), so
+# the same seed always yields the same rows, whatever the batch size.
+
+EMAIL_DOMAIN = 'synthetic.lazyintern.test'
+
+# Roughly Zipf-distributed popularity: a few skills are everywhere, most are rare.
+SKILLS = [
+    'Python', 'JavaScript', 'SQL', 'Java', 'React', 'Git', 'HTML', 'CSS', 'TypeScript', 'C++',
+    'Django', 'Node.js', 'Docker', 'Linux', 'C', 'Excel', 'Machine Learning', 'Pandas', 'AWS',
+    'Spring Boot', 'Figma', 'Flutter', 'Kotlin', 'Swift', 'PostgreSQL', 'MongoDB', 'Go', 'C#',
+    '.NET', 'TensorFlow', 'PyTorch', 'Kubernetes', 'Vue.js', 'Angular', 'Rust', 'R', 'MATLAB',
+    'Unity', 'Tableau', 'Power BI', 'GraphQL', 'Redis', 'Azure', 'GCP', 'Scala', 'Hadoop',
+    'Spark', 'Solidity', 'Embedded C', 'Verilog', 'AutoCAD', 'SolidWorks', 'Photoshop', 'SEO',
+]
+SKILL_CUM_WEIGHTS = list(accumulate(1 / (rank + 1) ** 0.9 for rank in range(len(SKILLS))))
+UNIVERSITIES = [
+    'Boğaziçi Üniversitesi', 'ODTÜ', 'İTÜ', 'Bilkent Üniversitesi', 'Koç Üniversitesi',
+    'Sabancı Üniversitesi', 'Hacettepe Üniversitesi', 'Ege Üniversitesi', 'Yıldız Teknik Üniversitesi',
+    'Ankara Üniversitesi', 'Dokuz Eylül Üniversitesi', 'Gazi Üniversitesi',
+]
+MAJORS = [
+    'Computer Engineering', 'Software Engineering', 'Electrical Engineering', 'Industrial Engineering',
+    'Mathematics', 'Statistics', 'Mechanical Engineering', 'Economics', 'Business Administration',
+]
+LOCATIONS = ['Istanbul', 'Ankara', 'Izmir', 'Bursa', 'Antalya', 'Eskisehir', 'Remote', 'Berlin', 'London']
+INTERNSHIP_TYPES = ['remote', 'onsite', 'hybrid', 'both']
+CERTIFICATIONS = [
+    ('AWS Certified Cloud Practitioner', 'Amazon Web Services'),
+    ('Google Data Analytics', 'Google'),
+    ('Microsoft Azure Fundamentals', 'Microsoft'),
+    ('Oracle Certified Associate Java', 'Oracle'),
+    ('Cisco CCNA', 'Cisco'),
+    ('TensorFlow Developer Certificate', 'Google'),
+    ('Scrum Master PSM I', 'Scrum.org'),
+]
+PROJECT_KINDS = ['Web app', 'Mobile app', 'Data pipeline', 'Chat bot', 'Game', 'Dashboard', 'CLI tool', 'API']
+WORDS = ('build design data model user service system team learn test deploy scale fast '
+         'simple secure real time open source platform analysis network cloud').split()
+
+
+def _rng(seed, kind, index):
+    return random.Random(f"{seed}:{kind}:{index}")
+
+
+def _sentence(rng, n):
+    return ' '.join(rng.choice(WORDS) for _ in range(n)).capitalize() + '.'
+
+
+def _skills(rng, low=3, high=12):
+    count = rng.randint(low, high)
+    picked = []
+    while len(picked) < count:
+        skill = rng.choices(SKILLS, cum_weights=SKILL_CUM_WEIGHTS)[0]
+        if skill not in picked:
+            picked.append(skill)
+    return picked
+
+
+def student_email(index):
+    return f"student{index}@{EMAIL_DOMAIN}"
+
+
+def recruiter_email(index):
+    return f"recruiter{index}@{EMAIL_DOMAIN}"
+
+
+def _student(seed, index):
+    rng = _rng(seed, 'student', index)
+    skills = _skills(rng)
+    profile = {
+        "university": rng.choice(UNIVERSITIES),
+        "major": rng.choice(MAJORS),
+        "graduation_year": str(rng.randint(2024, 2029)),
+        "bio": _sentence(rng, rng.randint(8, 40)),
+        "location": rng.choice(LOCATIONS),
+        "internship_type_preference": rng.choice(INTERNSHIP_TYPES),
+        "preferred_internship_location": rng.choice(LOCATIONS),
+        "preferred_locations": rng.sample(LOCATIONS, rng.randint(0, 3)),
+        "open_to_relocate": rng.random() < 0.3,
+        "skills": skills,
+        "profile_views": int(rng.paretovariate(1.5)) - 1,
+        "github_url": f"https://github.com/student{index}" if rng.random() < 0.6 else '',
+    }
+    projects = [
+        {
+            "title": f"{rng.choice(PROJECT_KINDS)} #{n + 1}",
+            "description": _sentence(rng, rng.randint(10, 30)),
+            "technologies": rng.sample(skills, min(len(skills), rng.randint(1, 4))),
+        }
+        for n in range(rng.choices([0, 1, 2, 3, 4], weights=[15, 30, 30, 15, 10])[0])
+    ]
+    certifications = [
+        {
+            "certification_name": name,
+            "issuing_organization": org,
+            "issue_date": f"{rng.randint(2021, 2025)}-{rng.randint(1, 12):02d}",
+        }
+        for name, org in rng.sample(CERTIFICATIONS, rng.choices([0, 1, 2, 3], weights=[40, 35, 20, 5])[0])
+    ]
+    return profile, projects, certifications
+
+
+@transaction.atomic
+def _create_students(seed, start, stop, password):
+    now = timezone.now()
+    users = [User(email=student_email(i), name=f"Student {i}", role='student', password=password)
+             for i in range(start, stop)]
+    User.objects.bulk_create(users)
+    user_ids = dict(User.objects.filter(email__in=[u.email for u in users]).values_list('email', 'id'))
+
+    generated = {i: _student(seed, i) for i in range(start, stop)}
+    StudentProfile.objects.bulk_create([
+        StudentProfile(user_id=user_ids[student_email(i)], **generated[i][0]) for i in range(start, stop)
+    ])
+    profile_ids = dict(StudentProfile.objects.filter(user_id__in=user_ids.values()).values_list('user_id', 'id'))
+    sid = {i: profile_ids[user_ids[student_email(i)]] for i in range(start, stop)}
+    # spread updated_at over a year so recency orderings have something to sort
+    # (bulk_update skips auto_now, unlike save() / bulk_create())
+    StudentProfile.objects.bulk_update([
+        StudentProfile(id=sid[i], updated_at=now - timedelta(minutes=_rng(seed, 'updated', i).randint(0, 525600)))
+        for i in range(start, stop)
+    ], ['updated_at'], batch_size=500)
+    StudentProject.objects.bulk_create([
+        StudentProject(student_id=sid[i], **project) for i in range(start, stop) for project in generated[i][1]
+    ])
+    StudentCertification.objects.bulk_create([
+        StudentCertification(student_id=sid[i], **cert) for i in range(start, stop) for cert in generated[i][2]
+    ])
+    rebuild_skill_postings(list(sid.values()))
+    index_students(list(sid.values()))
+    return list(sid.values())
+
+
+@transaction.atomic
+def _create_recruiters(seed, count, bookmarks, student_ids, password):
+    users = [User(email=recruiter_email(i), name=f"Recruiter {i}", role='recruiter', password=password,
+                  is_verified=True) for i in range(count)]
+    User.objects.bulk_create(users)
+    user_ids = dict(User.objects.filter(email__in=[u.email for u in users]).values_list('email', 'id'))
+    RecruiterProfile.objects.bulk_create([
+        RecruiterProfile(user_id=user_ids[recruiter_email(i)], name=f"Recruiter {i}",
+                         company_name=f"Company {i % max(1, count // 3)}",
+                         location=_rng(seed, 'recruiter', i).choice(LOCATIONS))
+        for i in range(count)
+    ])
+    recruiter_ids = dict(RecruiterProfile.objects.filter(user_id__in=user_ids.values()).values_list('user_id', 'id'))
+
+    # Popular students get bookmarked more often (power law over a shuffled order).
+    popularity = list(student_ids)
+    random.Random(f"{seed}:popularity").shuffle(popularity)
+    cum_weights = list(accumulate(1 / (rank + 1) ** 0.7 for rank in range(len(popularity))))
+    rows = []
+    for i in range(count):
+        rng = _rng(seed, 'bookmarks', i)
+        target = min(len(popularity), max(0, int(rng.gauss(bookmarks, bookmarks / 3))))
+        chosen = set()
+        while len(chosen) < target:
+            chosen.update(rng.choices(popularity, cum_weights=cum_weights, k=target - len(chosen)))
+        rows.extend(Bookmark(recruiter_id=recruiter_ids[user_ids[recruiter_email(i)]], student_id=s) for s in chosen)
+    Bookmark.objects.bulk_create(rows, batch_size=5000)
+    return len(rows)
+
+
+def clear():
+    """Deletes all synthetic users (profiles, projects, bookmarks... cascade)."""
+    return User.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}").delete()[0]
+
+
+def generate(students, recruiters=0, bookmarks_per_recruiter=0, seed=0, batch_size=2000, progress=None):
+    """
+    Creates `students` students and `recruiters` recruiters with about `bookmarks_per_recruiter`
+    bookmarks each. Accounts have unusable passwords (benchmarks log in with force_login).
+    Returns {"students": n, "recruiters": n, "bookmarks": n}.
+    """
+    password = make_password(None)
+    student_ids = []
+    for start in range(0, students, batch_size):
+        student_ids.extend(_create_students(seed, start, min(start + batch_size, students), password))
+        if progress:
+            progress(len(student_ids))
+    created_bookmarks = _create_recruiters(seed, recruiters, bookmarks_per_recruiter, student_ids, password) if recruiters else 0
+    return {"students": len(student_ids), "recruiters": recruiters, "bookmarks": created_bookmarks}
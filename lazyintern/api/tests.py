@@ -1,3 +1,774 @@
-from django.test import TestCase
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.request import Request
+
+from .blobs import release, store_file
+from .bulk import upsert_student_rows
+from . import metrics
+from . import fulltext
+from .chunked_upload import UploadError, complete_upload, start_upload, temp_path, write_chunk
+from .mail_queue import deliver_pending, enqueue_email
+from .media import parse_range
+from recruiter.models import Bookmark, RecruiterProfile
+
+from .models import (
+    BlobReference, ChunkedUpload, OTPCode, OutboundEmail, StoredBlob, StudentProfile, StudentProject, StudentSkill, User,
+)
+from .otp import OTP_EXPIRED, OTP_INVALID, OTP_LOCKED, OTP_NOT_FOUND, OTP_OK, check_otp, issue_otp
+from .parsers import HashingMultiPartParser, upload_digest
+from .profile_views import profile_view_buffer
+from .skills import filter_by_skills, sync_student_skills
+from .views import PROJECT_FIELDS
+
+TEST_SETTINGS = {
+    "PASSWORD_HASHERS": ['django.contrib.auth.hashers.MD5PasswordHasher'],
+    "CACHES": {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    "EMAIL_QUEUE_THREAD": False,
+}
+
+
+class TempMediaMixin:
+    """Points MEDIA_ROOT and the chunked upload temp dir at a throwaway directory."""
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = self.settings(MEDIA_ROOT=self.media_root, CHUNKED_UPLOAD_TEMP_DIR=f"{self.media_root}/.uploads")
+        override.enable()
+        self.addCleanup(override.disable)
+
+
+def make_student(i, **fields):
+    user = User.objects.create_user(email=f"student{i}@example.com", password="pw", name=f"Student {i}", role="student")
+    return StudentProfile.objects.create(user=user, **fields)
+
+
+@override_settings(**TEST_SETTINGS, PROFILE_VIEW_DEDUP_WINDOW=0)
+class ProfileViewTests(TestCase):
+    def setUp(self):
+        profile_view_buffer.flush()
+        # the locmem cache outlives each test; a cached directory from another test would leak in
+        cache.clear()
+
+    def test_views_are_buffered_then_flushed(self):
+        student = make_student(1)
+        for _ in range(3):
+            response = self.client.post(f'/api/student/increment-profile-views/{student.user_id}/')
+            self.assertEqual(response.status_code, 202)
+        self.assertEqual(profile_view_buffer.flush(), 3)
+        student.refresh_from_db()
+        self.assertEqual(student.profile_views, 3)
+
+    def test_flush_refreshes_cached_directory(self):
+        student = make_student(1)
+        recruiter = User.objects.create_user(email="r@example.com", password="pw", name="R", role="recruiter")
+        self.client.force_login(recruiter)
+        self.assertEqual(self.client.get('/api/recruiter/students/').json()[0]["profile_views"], 0)
+        self.client.post(f'/api/student/increment-profile-views/{student.user_id}/')
+        with self.captureOnCommitCallbacks(execute=True):
+            profile_view_buffer.flush()
+        self.assertEqual(self.client.get('/api/recruiter/students/').json()[0]["profile_views"], 1)
+
+    @override_settings(STUDENT_LIST_MAX_ROWS=1)
+    def test_project_save_refreshes_cached_directory(self):
+        older, newer = make_student(1), make_student(2)
+        StudentProfile.objects.filter(id=older.id).update(updated_at=timezone.now() - timedelta(days=1))
+        recruiter = User.objects.create_user(email="r@example.com", password="pw", name="R", role="recruiter")
+        self.client.force_login(recruiter)
+        self.assertEqual([s["id"] for s in self.client.get('/api/recruiter/students/').json()], [newer.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/student/projects/', {"student_id": older.id, "projects": [{"title": "New"}]},
+                                        content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([s["id"] for s in self.client.get('/api/recruiter/students/').json()], [older.id])
+
+    def test_unknown_profile_is_404(self):
+        response = self.client.post('/api/student/increment-profile-views/999999/')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(profile_view_buffer.pending(999999), 0)
+
+
+@override_settings(**TEST_SETTINGS)
+class StudentRowUpsertTests(TestCase):
+    def setUp(self):
+        self.student = make_student(1)
+        self.kept, self.changed, self.removed = [
+            StudentProject.objects.create(student=self.student, title=title) for title in ("Kept", "Old title", "Removed")
+        ]
+
+    def test_diff_creates_updates_and_deletes(self):
+        rows = [
+            {"id": self.kept.id, "title": "Kept"},
+            {"id": self.changed.id, "title": "New title"},
+            {"title": "Brand new", "technologies": ["Python"]},
+        ]
+        objects, counts = upsert_student_rows(StudentProject, self.student.id, rows, PROJECT_FIELDS)
+
+        self.assertEqual(counts, {"created": 1, "updated": 1, "deleted": 1})
+        self.assertEqual([o.title for o in objects], ["Kept", "New title", "Brand new"])
+        self.assertEqual(objects[0].id, self.kept.id)
+        self.assertFalse(StudentProject.objects.filter(id=self.removed.id).exists())
+        self.assertEqual(
+            sorted(StudentProject.objects.filter(student=self.student).values_list('title', flat=True)),
+            ["Brand new", "Kept", "New title"],
+        )
+
+    def test_unchanged_rows_write_nothing(self):
+        version = StudentProfile.objects.get(id=self.student.id).content_version
+        rows = [{"id": p.id, "title": p.title} for p in (self.kept, self.changed, self.removed)]
+        _, counts = upsert_student_rows(StudentProject, self.student.id, rows, PROJECT_FIELDS)
+        self.assertEqual(counts, {"created": 0, "updated": 0, "deleted": 0})
+        self.assertEqual(StudentProfile.objects.get(id=self.student.id).content_version, version)
+
+    def test_ids_of_other_students_are_created_not_stolen(self):
+        other = make_student(2)
+        foreign = StudentProject.objects.create(student=other, title="Theirs")
+        _, counts = upsert_student_rows(StudentProject, self.student.id, [{"id": foreign.id, "title": "Mine"}], PROJECT_FIELDS)
+        self.assertEqual(counts["created"], 1)
+        self.assertEqual(StudentProject.objects.get(id=foreign.id).title, "Theirs")
+
+    def test_project_without_title_is_rejected(self):
+        response = self.client.post('/api/student/projects/', {
+            "student_id": self.student.id,
+            "projects": [{"id": self.kept.id, "title": "Kept"}, {"description": "no title"}],
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("title", response.json()["details"]["1"])
+        # nothing was written, including the deletes
+        self.assertEqual(StudentProject.objects.filter(student=self.student).count(), 3)
+
+
+@override_settings(**TEST_SETTINGS, PROFILE_VIEW_DEDUP_WINDOW=0)
+class ConditionalProfileTests(TestCase):
+    def setUp(self):
+        profile_view_buffer.flush()
+        cache.clear()
+
+    def test_etag_round_trip(self):
+        student = make_student(1)
+        response = self.client.get(f'/api/student/profile/{student.user_id}/')
+        etag = response['ETag']
+        response = self.client.get(f'/api/student/profile/{student.user_id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_view_count_flush_is_not_hidden_by_if_modified_since(self):
+        student = make_student(1)
+        url = f'/api/student/profile/{student.user_id}/'
+        response = self.client.get(url)
+        self.assertFalse(response.has_header('Last-Modified'))
+        since = http_date(timezone.now().timestamp() + 60)
+        # the flush moves profile_views but not updated_at
+        self.client.post(f'/api/student/increment-profile-views/{student.user_id}/')
+        with self.captureOnCommitCallbacks(execute=True):
+            profile_view_buffer.flush()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["profile_views"], 1)
+
+        self.client.force_login(student.user)
+        response = self.client.get('/api/auth/user/profile/', HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Last-Modified'))
+
+    def test_client_cannot_rewind_content_version(self):
+        student = make_student(1)
+        old_etag = self.client.get(f'/api/student/profile/{student.user_id}/')['ETag']
+        self.client.post('/api/student/projects/', {
+            "student_id": student.id, "projects": [{"title": "New project"}],
+        }, content_type='application/json')
+        bumped = StudentProfile.objects.get(id=student.id).content_version
+
+        self.client.post('/api/student/profile/', {
+            "user_id": student.user_id, "bio": "hello", "content_version": 0,
+        }, content_type='application/json')
+        self.assertEqual(StudentProfile.objects.get(id=student.id).content_version, bumped)
+        response = self.client.get(f'/api/student/profile/{student.user_id}/', HTTP_IF_NONE_MATCH=old_etag)
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(**TEST_SETTINGS, OTP_MAX_ATTEMPTS=3)
+class OTPTests(TestCase):
+    def _wrong(self, code):
+        return '000000' if code != '000000' else '111111'
+
+    def test_correct_code_is_consumed(self):
+        code = issue_otp('A@Example.com')
+        self.assertEqual(check_otp('a@example.com', code), OTP_OK)
+        self.assertEqual(check_otp('a@example.com', code), OTP_NOT_FOUND)
+
+    def test_lockout_after_max_attempts(self):
+        code = issue_otp('a@example.com')
+        self.assertEqual(check_otp('a@example.com', self._wrong(code)), OTP_INVALID)
+        self.assertEqual(check_otp('a@example.com', self._wrong(code)), OTP_INVALID)
+        self.assertEqual(check_otp('a@example.com', self._wrong(code)), OTP_LOCKED)
+        # even the right code is refused once locked
+        self.assertEqual(check_otp('a@example.com', code), OTP_LOCKED)
+        # a new code resets the counter
+        code = issue_otp('a@example.com')
+        self.assertEqual(check_otp('a@example.com', code), OTP_OK)
+
+    def test_purposes_are_separate(self):
+        code = issue_otp('a@example.com', 'signup')
+        self.assertEqual(check_otp('a@example.com', code, 'reset'), OTP_NOT_FOUND)
+        self.assertEqual(check_otp('a@example.com', code, 'signup'), OTP_OK)
+
+    def test_expired_code(self):
+        code = issue_otp('a@example.com')
+        OTPCode.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(check_otp('a@example.com', code), OTP_EXPIRED)
+        self.assertFalse(OTPCode.objects.exists())
+
+    def test_verify_endpoint_returns_429_when_locked(self):
+        User.objects.create_user(email='a@example.com', password='pw', name='A', role='student')
+        code = issue_otp('a@example.com')
+        statuses = [
+            self.client.post('/api/auth/verify-otp', {"email": "a@example.com", "otp": self._wrong(code), "type": "signup"},
+                             content_type='application/json').status_code
+            for _ in range(3)
+        ]
+        self.assertEqual(statuses, [400, 400, 429])
+        self.assertFalse(User.objects.get(email='a@example.com').is_verified)
+
+
+class FailingSendBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise ConnectionResetError("connection reset")
+
+
+class FailingOpenBackend(EmailBackend):
+    def open(self):
+        raise ConnectionRefusedError("smtp down")
+
+
+@override_settings(**TEST_SETTINGS, EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+                   EMAIL_QUEUE_MAX_ATTEMPTS=2, EMAIL_QUEUE_RETRY_BASE_SECONDS=30)
+class MailQueueTests(TestCase):
+    def setUp(self):
+        self.email = enqueue_email("Subject", "Your code is 123456", ["a@example.com"], "noreply@example.com")
+
+    def _make_due(self):
+        OutboundEmail.objects.update(next_attempt_at=timezone.now())
+
+    def test_delivery_marks_sent_and_drops_body(self):
+        self.assertEqual(deliver_pending(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        email = OutboundEmail.objects.get()
+        self.assertEqual((email.status, email.attempts, email.body, email.claim), ('sent', 1, '', ''))
+        self.assertEqual(deliver_pending(), (0, 0))
+
+    def _assert_retry_then_failure(self):
+        started = timezone.now()
+        self.assertEqual(deliver_pending(), (0, 1))
+        email = OutboundEmail.objects.get()
+        self.assertEqual((email.status, email.attempts, email.claim), ('pending', 1, ''))
+        self.assertGreaterEqual(email.next_attempt_at, started + timedelta(seconds=30))
+        self.assertTrue(email.last_error)
+        # backing off: not due yet
+        self.assertEqual(deliver_pending(), (0, 0))
+
+        self._make_due()
+        self.assertEqual(deliver_pending(), (0, 1))
+        email = OutboundEmail.objects.get()
+        self.assertEqual((email.status, email.attempts), ('failed', 2))
+        self.assertGreaterEqual(email.next_attempt_at, started + timedelta(seconds=60))   # 30 * 2 ** 1
+        self._make_due()
+        self.assertEqual(deliver_pending(), (0, 0))
+
+    @override_settings(EMAIL_BACKEND='api.tests.FailingSendBackend')
+    def test_send_failure_backs_off_until_max_attempts(self):
+        self._assert_retry_then_failure()
+
+    @override_settings(EMAIL_BACKEND='api.tests.FailingOpenBackend')
+    def test_connection_failure_backs_off_the_whole_batch(self):
+        self._assert_retry_then_failure()
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+@override_settings(**TEST_SETTINGS)
+class ChunkedUploadTests(TempMediaMixin, TestCase):
+    data = b"0123456789" * 10
+
+    def setUp(self):
+        super().setUp()
+        self.upload = start_upload(7, "demo.mp4", len(self.data), project_id=1, sha256=sha256(self.data))
+
+    def _write(self, offset, chunk, checksum=''):
+        return write_chunk(self.upload.id, offset, len(chunk), io.BytesIO(chunk), checksum)
+
+    def test_offset_conflict_reports_resume_point(self):
+        self._write(0, self.data[:40])
+        with self.assertRaises(UploadError) as e:
+            self._write(0, self.data[:40])
+        self.assertEqual(e.exception.status_code, 409)
+        self.assertIn("Expected offset 40", str(e.exception))
+        with self.assertRaises(UploadError):
+            self._write(60, self.data[60:])
+
+    def test_checksum_mismatch_truncates_the_chunk(self):
+        self._write(0, self.data[:40])
+        with self.assertRaises(UploadError) as e:
+            self._write(40, self.data[40:80], checksum=sha256(b"something else"))
+        self.assertEqual(e.exception.status_code, 400)
+        self.assertEqual(ChunkedUpload.objects.get(id=self.upload.id).offset, 40)
+        self.assertEqual(temp_path(self.upload).stat().st_size, 40)
+        # the retry is accepted
+        self.assertEqual(self._write(40, self.data[40:80], checksum=sha256(self.data[40:80])).offset, 80)
+
+    def test_incomplete_upload_cannot_complete(self):
+        self._write(0, self.data[:40])
+        with self.assertRaises(UploadError) as e:
+            complete_upload(self.upload.id)
+        self.assertEqual(e.exception.status_code, 409)
+
+    def test_complete_stores_one_blob_reference(self):
+        self._write(0, self.data[:50])
+        self._write(50, self.data[50:])
+        upload = complete_upload(self.upload.id)
+        self.assertEqual(upload.status, ChunkedUpload.STATUS_COMPLETE)
+        self.assertFalse(temp_path(upload).exists())
+        with open(f"{self.media_root}/{upload.path}", 'rb') as f:
+            self.assertEqual(f.read(), self.data)
+
+        # a repeated complete is a no-op
+        self.assertEqual(complete_upload(self.upload.id).path, upload.path)
+        self.assertEqual(BlobReference.objects.count(), 1)
+        self.assertEqual(StoredBlob.objects.get().ref_count, 1)
+
+    def test_whole_file_checksum_is_verified(self):
+        upload = start_upload(7, "demo.mp4", 10, sha256=sha256(b"expected!!"))
+        write_chunk(upload.id, 0, 10, io.BytesIO(b"different!"))
+        with self.assertRaises(UploadError):
+            complete_upload(upload.id)
+        self.assertEqual(ChunkedUpload.objects.get(id=upload.id).status, ChunkedUpload.STATUS_ACTIVE)
+
+
+class ParseRangeTests(TestCase):
+    def test_ranges(self):
+        cases = [
+            ('bytes=0-9', 100, (0, 9)),
+            ('bytes=90-', 100, (90, 99)),
+            ('bytes=90-500', 100, (90, 99)),     # end is clamped to the file
+            ('bytes=-10', 100, (90, 99)),        # suffix: last 10 bytes
+            ('bytes=-500', 100, (0, 99)),        # suffix longer than the file
+        ]
+        for header, size, expected in cases:
+            with self.subTest(header=header):
+                self.assertEqual(parse_range(header, size), expected)
+
+    def test_ignored_headers(self):
+        for header in (None, '', 'bytes=-', 'bytes=0-1,5-6', 'items=0-1', 'bytes=a-b'):
+            with self.subTest(header=header):
+                self.assertIsNone(parse_range(header, 100))
+
+    def test_unsatisfiable(self):
+        for header in ('bytes=100-', 'bytes=100-200', 'bytes=50-10', 'bytes=-0'):
+            with self.subTest(header=header), self.assertRaises(ValueError):
+                parse_range(header, 100)
+
+
+@override_settings(**TEST_SETTINGS)
+class ServeMediaTests(TempMediaMixin, TestCase):
+    content = bytes(range(256)) * 4
+
+    def setUp(self):
+        super().setUp()
+        self.owner = User.objects.create_user(email="owner@example.com", password="pw", name="Owner", role="student")
+        self.url = f"/resumes/{self.owner.id}/cv.pdf"
+        path = f"{self.media_root}/resumes/{self.owner.id}"
+        os.makedirs(path)
+        with open(f"{path}/cv.pdf", 'wb') as f:
+            f.write(self.content)
+        self.client.force_login(self.owner)
+
+    def _body(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_full_and_partial_responses(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._body(response), self.content)
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-16')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes {len(self.content) - 16}-{len(self.content) - 1}/{len(self.content)}')
+        self.assertEqual(self._body(response), self.content[-16:])
+
+    def test_unsatisfiable_range_is_416(self):
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={len(self.content)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.content)}')
+
+    def test_if_range(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(self._body(response), self.content[:10])
+        # a stale validator means the file changed: send all of it
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._body(response), self.content)
+
+    def test_if_none_match_is_304(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_other_students_are_refused(self):
+        User.objects.create_user(email="other@example.com", password="pw", name="Other", role="student")
+        self.client.force_login(User.objects.get(email="other@example.com"))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+@override_settings(**TEST_SETTINGS)
+class BlobStoreTests(TempMediaMixin, TestCase):
+    def test_same_content_is_stored_once(self):
+        first = store_file(ContentFile(b'certificate', name='a.pdf'), BlobReference.KIND_CERTIFICATE, user_id=1)
+        second = store_file(ContentFile(b'certificate', name='b.pdf'), BlobReference.KIND_CERTIFICATE, user_id=2)
+        self.assertEqual(first.blob_id, second.blob_id)
+        self.assertEqual(StoredBlob.objects.count(), 1)
+        self.assertEqual(StoredBlob.objects.get().ref_count, 2)
+        self.assertEqual((first.filename, second.filename), ('a.pdf', 'b.pdf'))
+
+    def test_file_is_deleted_with_the_last_reference(self):
+        ref = store_file(ContentFile(b'resume', name='cv.pdf'), BlobReference.KIND_RESUME, user_id=1)
+        store_file(ContentFile(b'resume', name='cv.pdf'), BlobReference.KIND_RESUME, user_id=2)
+        path = ref.blob.path
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(release(path, BlobReference.KIND_RESUME, user_id=1))
+        self.assertEqual(StoredBlob.objects.get().ref_count, 1)
+        self.assertTrue(default_storage.exists(path))
+        # user 1 holds no reference any more
+        self.assertFalse(release(path, BlobReference.KIND_RESUME, user_id=1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(release(path, BlobReference.KIND_RESUME, user_id=2))
+        self.assertFalse(StoredBlob.objects.exists())
+        self.assertFalse(default_storage.exists(path))
+        self.assertFalse(release(path, BlobReference.KIND_RESUME))
+
+    def test_upload_is_hashed_while_parsing(self):
+        request = Request(
+            RequestFactory().post('/api/upload/resume', {"user_id": "1", "file": SimpleUploadedFile('cv.pdf', b'resume')}),
+            parsers=[HashingMultiPartParser()],
+        )
+        # what the CSRF check of SessionAuthentication does before the view runs
+        self.assertEqual(request.POST["user_id"], "1")
+        self.assertEqual(upload_digest(request, 'file'), sha256(b'resume'))
+        self.assertEqual(request.FILES['file'].read(), b'resume')
+
+    def test_session_upload_with_csrf_check(self):
+        user = User.objects.create_user(email="s@example.com", password="pw", name="S", role="student")
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(user)
+        token = 'a' * 32
+        client.cookies['csrftoken'] = token
+        response = client.post('/api/upload/resume', {
+            "csrfmiddlewaretoken": token, "user_id": str(user.id), "file": SimpleUploadedFile('cv.pdf', b'resume'),
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(StoredBlob.objects.get().sha256, sha256(b'resume'))
+
+    def test_uploads_and_deletes_require_an_integer_user_id(self):
+        uploads = {
+            '/api/upload/certificate': {},
+            '/api/upload/resume': {},
+            '/api/project-video/upload': {"project_id": "1"},
+        }
+        for url, extra in uploads.items():
+            for user_id in ('', 'abc'):
+                with self.subTest(url=url, user_id=user_id):
+                    data = {**extra, "user_id": user_id, "file": SimpleUploadedFile('f.pdf', b'content')}
+                    self.assertEqual(self.client.post(url, data).status_code, 400)
+        self.assertFalse(StoredBlob.objects.exists())
+
+        others = {
+            '/api/delete/resume': {"resume_url": "/media/blobs/ab/abc.pdf"},
+            '/api/project-video/delete': {"video_url": "/media/blobs/ab/abc.mp4"},
+            '/api/project-video/uploads/': {"project_id": "1", "total_size": 10},
+        }
+        for url, extra in others.items():
+            with self.subTest(url=url):
+                self.assertEqual(self.client.post(url, {**extra, "user_id": "abc"}).status_code, 400)
+
+        response = self.client.post('/api/upload/certificate', {"user_id": "7", "file": SimpleUploadedFile('cert.pdf', b'certificate')})
+        self.assertEqual(response.status_code, 201)
+        ref = BlobReference.objects.get()
+        self.assertEqual(ref.user_id, 7)
+
+        response = self.client.post('/api/upload/resume', {"user_id": "7", "file": SimpleUploadedFile('cv.pdf', b'resume')})
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post('/api/delete/resume', {"user_id": "7", "resume_url": response.json()["public_url"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(BlobReference.objects.values_list('kind', flat=True)), [BlobReference.KIND_CERTIFICATE])
+
+
+@override_settings(**TEST_SETTINGS, METRICS_TOKEN='', METRICS_MULTIPROC_DIR='')
+class MetricsTests(TestCase):
+    # samples are process-wide, so each test uses label values no other test produces
+
+    def _lines(self, text):
+        return [line for line in text.splitlines() if not line.startswith('#')]
+
+    def test_exposition(self):
+        metrics.OTP_ISSUED.inc(purpose='metrics-test')
+        metrics.OTP_ISSUED.inc(2, purpose='metrics-test')
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], metrics.CONTENT_TYPE)
+        text = response.content.decode()
+        self.assertIn('# TYPE lazyintern_otp_issued_total counter', text)
+        self.assertIn('lazyintern_otp_issued_total{purpose="metrics-test"} 3', self._lines(text))
+        self.assertIn('lazyintern_email_queue_pending 0', self._lines(text))
+
+    def test_histogram_exposes_every_bucket(self):
+        metrics.REQUEST_DURATION.observe(0.3, route='metrics-test', method='GET')
+        metrics.REQUEST_DURATION.observe(20, route='metrics-test', method='GET')
+        prefix = 'lazyintern_http_request_duration_seconds'
+        lines = [line for line in self._lines(metrics.render()) if 'route="metrics-test"' in line]
+        buckets = {line.split('le="')[1].split('"')[0]: line.rsplit(' ', 1)[1]
+                   for line in lines if line.startswith(f'{prefix}_bucket')}
+        self.assertEqual(len(buckets), len(metrics.DEFAULT_BUCKETS) + 1)
+        self.assertEqual((buckets['0.005'], buckets['0.25']), ('0', '0'))
+        self.assertEqual((buckets['0.5'], buckets['10']), ('1', '1'))
+        self.assertEqual(buckets['+Inf'], '2')
+        self.assertIn(f'{prefix}_sum{{route="metrics-test",method="GET"}} 20.3', lines)
+        self.assertIn(f'{prefix}_count{{route="metrics-test",method="GET"}} 2', lines)
+
+    def test_requests_are_labelled_by_route(self):
+        # both apps name a route add_bookmark; the two must stay separate series
+        self.client.post('/api/bookmarks/', {})
+        self.client.post('/api/recruiter/bookmark/add/', {})
+        lines = self._lines(metrics.render())
+        for route in ('api/bookmarks/', 'api/recruiter/bookmark/add/'):
+            with self.subTest(route=route):
+                self.assertTrue(any(line.startswith(f'lazyintern_http_requests_total{{route="{route}",method="POST"')
+                                    for line in lines))
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_token_is_required_when_set(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer s3cret').status_code, 200)
+
+    def test_samples_of_other_processes_are_added(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        # the file name of this process is picked on first use; forget the temporary one afterwards
+        self.addCleanup(setattr, metrics._samples, '_path', None)
+        labels = [["purpose", "metrics-multiproc"]]
+        for pid, value in ((101, 2), (102, 5)):
+            with open(f"{directory}/metrics-{pid}-0000.json", 'w') as f:
+                json.dump([["lazyintern_otp_issued_total", labels, value]], f)
+        with open(f"{directory}/metrics-103-0000.json", 'w') as f:
+            f.write('[["lazyintern_otp_issued')     # unreadable files are skipped
+
+        metrics.OTP_ISSUED.inc(purpose='metrics-multiproc')
+        with self.settings(METRICS_MULTIPROC_DIR=directory):
+            text = metrics.render()
+        self.assertIn('lazyintern_otp_issued_total{purpose="metrics-multiproc"} 8', self._lines(text))
+
+
+@override_settings(**TEST_SETTINGS)
+class ImportProfilesTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def run_import(self, rows, *args):
+        path = f"{self.directory}/profiles.ndjson"
+        with open(path, 'w') as f:
+            f.write('\n'.join(row if isinstance(row, str) else json.dumps(row) for row in rows) + '\n')
+        errors = f"{self.directory}/errors.ndjson"
+        call_command('import_profiles', path, '--hash-workers', '1', '--errors', errors, *args, stdout=io.StringIO())
+        with open(errors) as f:
+            return {row["row"]: row["error"] for row in map(json.loads, f)}
+
+    def test_mixed_rows_duplicates_and_invalid_rows(self):
+        User.objects.create_user(email="taken@example.com", password="pw", name="Taken", role="student")
+        errors = self.run_import([
+            {"email": "s1@example.com", "name": "S1", "role": "student", "password": "pw1",
+             "skills": ["Python"], "projects": [{"title": "Compiler", "technologies": ["C"]}]},
+            {"email": "r1@example.com", "name": "R1", "role": "recruiter", "company_name": "Acme"},
+            {"email": "s1@example.com", "name": "Again", "role": "student"},
+            {"email": "taken@example.com", "name": "Taken", "role": "student"},
+            {"email": "s2@example.com", "name": "S2", "role": "student", "projects": [{"description": "no title"}]},
+            {"email": "s3@example.com", "name": "S3", "role": "admin"},
+            {"email": "not-an-email", "name": "S4", "role": "student"},
+            'not json',
+        ], '--verified')
+
+        self.assertEqual(set(errors), {3, 4, 5, 6, 7, 8})
+        self.assertIn("duplicate email", errors[3])
+        self.assertIn("already exists", errors[4])
+        self.assertEqual(
+            set(User.objects.values_list('email', flat=True)),
+            {"taken@example.com", "s1@example.com", "r1@example.com"},
+        )
+        student = StudentProfile.objects.get(user__email="s1@example.com")
+        self.assertEqual(student.user.name, "S1")
+        self.assertTrue(student.user.check_password("pw1"))
+        self.assertEqual(list(StudentProject.objects.filter(student=student).values_list('title', flat=True)), ["Compiler"])
+        recruiter = RecruiterProfile.objects.get(user__email="r1@example.com")
+        self.assertEqual(recruiter.company_name, "Acme")
+        self.assertTrue(recruiter.user.is_verified)
+        self.assertFalse(recruiter.user.has_usable_password())
+
+    def test_invalid_rows_write_nothing(self):
+        errors = self.run_import([
+            {"email": "s1@example.com", "name": "S1", "role": "student", "skills": "Python"},
+            {"email": "s2@example.com", "name": "S2", "role": "student", "projects": [{"title": ""}]},
+        ])
+        self.assertEqual(set(errors), {1, 2})
+        self.assertFalse(User.objects.exists())
+        self.assertFalse(StudentProject.objects.exists())
+
+    def test_checkpoint_resumes_after_the_last_batch(self):
+        checkpoint = f"{self.directory}/checkpoint.json"
+        rows = [{"email": f"s{i}@example.com", "name": f"S{i}", "role": "student"} for i in range(5)]
+        self.run_import(rows[:3], '--checkpoint', checkpoint, '--batch-size', '2')
+        with open(checkpoint) as f:
+            self.assertEqual(json.load(f)["rows_done"], 3)
+        self.run_import(rows, '--checkpoint', checkpoint, '--batch-size', '2')
+        self.assertEqual(User.objects.count(), 5)
+
+
+@override_settings(**TEST_SETTINGS)
+class SkillIndexTests(TestCase):
+    def setUp(self):
+        self.python = make_student(1, skills=["Python ", "DJANGO"])
+        self.both = make_student(2, skills=["python", "React"])
+        self.project_only = make_student(3, skills=["Go"])
+        StudentProject.objects.create(student=self.project_only, title="Site", technologies=["Python", "Django"])
+        for student in (self.python, self.both, self.project_only):
+            sync_student_skills(student.id)
+
+    def matching(self, skills, **kwargs):
+        return set(filter_by_skills(StudentProfile.objects.all(), skills, **kwargs).values_list('id', flat=True))
+
+    def test_all_of(self):
+        self.assertEqual(self.matching(["python", "django"]), {self.python.id, self.project_only.id})
+        self.assertEqual(self.matching(["Python", "react", "django"]), set())
+        # a skill repeated in the query still counts once
+        self.assertEqual(self.matching(["react", " React"]), {self.both.id})
+
+    def test_any_of(self):
+        self.assertEqual(self.matching(["react", "go"], match='any'), {self.both.id, self.project_only.id})
+        self.assertEqual(self.matching(["rust"], match='any'), set())
+
+    def test_project_source(self):
+        self.assertEqual(self.matching(["django"], source=StudentSkill.SOURCE_PROJECT), {self.project_only.id})
+
+    def test_resync_drops_removed_skills(self):
+        StudentProfile.objects.filter(id=self.both.id).update(skills=["Rust"])
+        sync_student_skills(self.both.id)
+        self.assertEqual(self.matching(["react"]), set())
+        self.assertEqual(self.matching(["rust"]), {self.both.id})
+
+
+@override_settings(**TEST_SETTINGS)
+class FullTextSearchTests(TestCase):
+    def setUp(self):
+        self.major = make_student(1, major="Compiler Engineering", bio="I like hiking")
+        self.bio = make_student(2, major="History", bio="I wrote a compiler once")
+        self.project = make_student(3, major="Physics", bio="Robots")
+        StudentProject.objects.create(student=self.project, title="Toy compiler", description="Parsing in Rust")
+        fulltext.index_students([self.major.id, self.bio.id, self.project.id])
+
+    def ids(self, text, **kwargs):
+        return [sid for sid, _, _ in fulltext.search_students(text, **kwargs)]
+
+    def test_bm25_ranks_weighted_columns_first(self):
+        hits = fulltext.search_students("compiler")
+        self.assertEqual([sid for sid, _, _ in hits][0], self.major.id)
+        self.assertEqual({sid for sid, _, _ in hits}, {self.major.id, self.bio.id, self.project.id})
+        self.assertGreater(hits[0][1], hits[-1][1])
+        self.assertIn('<mark>', hits[0][2])
+
+    def test_all_any_and_prefix(self):
+        self.assertEqual(self.ids("compiler rust"), [self.project.id])
+        self.assertEqual(set(self.ids("hiking robots", match='any')), {self.major.id, self.project.id})
+        self.assertEqual(self.ids("compil", limit=1), [self.major.id])
+        # FTS5 syntax in the input is quoted, not parsed
+        self.assertEqual(self.ids('compiler" OR "history'), [])
+
+    def test_deleted_students_leave_the_index(self):
+        self.major.user.delete()
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {fulltext.FTS_TABLE} WHERE rowid = %s", [self.major.id])
+            self.assertEqual(cursor.fetchone()[0], 0)
+        self.client.force_login(User.objects.create_user(email="r@example.com", password="pw", name="R", role="recruiter"))
+        response = self.client.get('/api/recruiter/students/fulltext/', {"q": "compiler", "limit": 1})
+        # the deleted student no longer takes the only slot
+        results = response.json()["results"]
+        self.assertEqual(len(results), 1)
+        self.assertIn(results[0]["id"], {self.bio.id, self.project.id})
+
+
+@override_settings(**TEST_SETTINGS)
+class BulkBookmarkTests(TestCase):
+    def setUp(self):
+        self.students = [make_student(i) for i in range(3)]
+        user = User.objects.create_user(email="r@example.com", password="pw", name="R", role="recruiter")
+        self.recruiter = RecruiterProfile.objects.create(user=user, name="R")
+        self.client.force_login(user)
+
+    def bulk(self, method, user_ids):
+        return getattr(self.client, method)('/api/bookmarks/bulk/', {"student_ids": user_ids}, content_type='application/json')
+
+    def test_one_bookmark_per_recruiter_and_student(self):
+        Bookmark.objects.create(recruiter=self.recruiter, student=self.students[0])
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Bookmark.objects.create(recruiter=self.recruiter, student=self.students[0])
+
+    def test_add_is_idempotent(self):
+        user_ids = [s.user_id for s in self.students[:2]]
+        response = self.bulk('post', user_ids + [999999])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["added"], 2)
+        self.assertEqual(response.json()["not_found"], [999999])
+
+        response = self.bulk('post', user_ids + [self.students[2].user_id])
+        self.assertEqual(response.json()["added"], 1)
+        response = self.bulk('post', user_ids)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["added"], 0)
+        self.assertEqual(Bookmark.objects.filter(recruiter=self.recruiter).count(), 3)
+
+    def test_bulk_removal(self):
+        self.bulk('post', [s.user_id for s in self.students])
+        response = self.bulk('delete', [self.students[0].user_id, self.students[1].user_id, 999999])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["removed"], 2)
+        self.assertEqual(self.bulk('delete', [self.students[0].user_id]).json()["removed"], 0)
+
+        checked = self.client.get('/api/bookmarks/check/', {"student_ids": ",".join(str(s.user_id) for s in self.students)})
+        self.assertEqual(checked.json()["bookmarked"], [self.students[2].user_id])
+
+    def test_invalid_input_is_400(self):
+        for user_ids in ([], ["x"], "1,2"):
+            with self.subTest(student_ids=user_ids):
+                self.assertEqual(self.bulk('post', user_ids).status_code, 400)
@@ -9,6 +9,7 @@ urlpatterns = [
     # Student profile
     path('student/profile/<int:user_id>/', views.get_student_profile, name='get_student_profile'),
     path('student/profile/', views.save_student_profile, name='save_student_profile'),
+    path('student/increment-profile-views/<int:user_id>/', views.increment_profile_views, name='increment_profile_views'),
 
     # Projects
     path('student/projects/<int:user_id>/', views.get_student_projects, name='get_student_projects'),
@@ -18,6 +19,10 @@ urlpatterns = [
     path('student/certifications/<int:user_id>/', views.get_student_certifications, name='get_student_certifications'),
     path('student/certifications/', views.save_student_certifications, name='save_student_certifications'),
 
+    # Profile + projects + certifications in one request
+    path('student/bundle/<int:user_id>/', views.get_student_bundle, name='get_student_bundle'),
+    path('student/bundle/', views.save_student_bundle, name='save_student_bundle'),
+
     # OTP endpoints
     path('auth/verify-otp', views.verify_otp, name='verify_otp'),
     path('auth/resend-otp', views.resend_otp, name='resend_otp'),
@@ -28,12 +33,20 @@ urlpatterns = [
     path('upload/resume', views.upload_resume, name='upload_resume'),
     path('delete/resume', views.delete_resume, name='delete_resume'),
     
+     path('bookmarks/check/', views.check_bookmark_status_batch, name='check_bookmark_status_batch'),
      path('bookmarks/check/<int:student_id>/', views.check_bookmark_status, name='check_bookmark_status'),
     path('bookmarks/', views.add_bookmark, name='add_bookmark'),
+    path('bookmarks/bulk/', views.bulk_bookmarks, name='bulk_bookmarks'),
     path('bookmarks/<int:student_id>/', views.remove_bookmark, name='remove_bookmark'),
     
      path('project-video/upload', views.upload_project_video, name='upload_project_video'),
     path('project-video/delete', views.delete_project_video, name='delete_project_video'),
+    path('project-video/uploads/', views.start_project_video_upload, name='start_project_video_upload'),
+    path('project-video/uploads/<uuid:upload_id>/', views.project_video_upload, name='project_video_upload'),
+    path('project-video/uploads/<uuid:upload_id>/complete/', views.complete_project_video_upload, name='complete_project_video_upload'),
+
+    # Performance instrumentation (staff)
+    path('perf/routes/', views.perf_routes, name='perf_routes'),
    
 
 
@@ -1,6 +1,8 @@
-from django.core.mail import send_mail
 from django.conf import settings
 
+from . import metrics
+from .mail_queue import enqueue_email
+
 def send_otp_email(email, otp_code):
     subject = "Your LazyIntern OTP Verification Code"
     message = (
@@ -13,10 +15,12 @@ def send_otp_email(email, otp_code):
     from_email = settings.DEFAULT_FROM_EMAIL
     recipient_list = [email]
 
+    # Queued; delivered by api.mail_queue in the background
     try:
-        send_mail(subject, message, from_email, recipient_list, fail_silently=False)
-        print(f"OTP {otp_code} sent to {email}")
+        enqueue_email(subject, message, recipient_list, from_email)
+        metrics.OTP_EMAILS.inc(result='queued')
         return True
     except Exception as e:
-        print(f"Email sending failed: {e}")
+        print(f"Email queueing failed: {e}")
+        metrics.OTP_EMAILS.inc(result='failed')
         return False
@@ -7,16 +7,33 @@ from django.views.decorators.csrf import csrf_exempt
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.models import AnonymousUser
 from rest_framework.decorators import api_view, parser_classes
-from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.parsers import FormParser
 from rest_framework.response import Response
 from rest_framework import status
-from .models import User, StudentProfile, StudentProject, StudentCertification
+from .models import User, StudentProfile, StudentProject, StudentCertification, ChunkedUpload, BlobReference
 from recruiter.models import RecruiterProfile, Bookmark
+from recruiter.bookmarks import MAX_BULK_BOOKMARKS, bookmarked_user_ids, parse_id_list
+from recruiter import similar
 from django.core.mail import send_mail
 from django.conf import settings
 import random
 from .utils import send_otp_email
-from django.http import JsonResponse
+from .skills import sync_student_skills
+from .fulltext import index_student
+from . import ranking
+from .profile_views import record_profile_view, student_exists
+from .bulk import InvalidRows, upsert_student_rows
+from .fields import InvalidFields, project_values, requested_fields
+from .otp import OTP_EXPIRED, OTP_INVALID, OTP_LOCKED, OTP_NOT_FOUND, OTP_OK, check_otp, issue_otp
+from .conditional import student_conditional, recruiter_conditional
+from . import response_cache
+from .instrumentation import route_stats
+from .blobs import delete_upload, store_file
+from .parsers import HashingMultiPartParser, upload_digest
+from .chunked_upload import UploadError, abort_upload, complete_upload, start_upload, write_chunk
+from django.db import transaction
+from django.db.models import Prefetch, Value
+from django.http import Http404, JsonResponse
 # --- Mevcut signup, login, profile, project, certification viewler ---
 @csrf_exempt
 @api_view(['POST'])
@@ -42,8 +59,7 @@ def signup(request):
 
     # If the user is a recruiter, generate and send OTP
     if role == "recruiter":
-        otp = f"{random.randint(100000, 999999)}"
-        otp_storage[email] = otp
+        otp = issue_otp(email, 'signup')
         send_otp_email(email, otp)  # This uses your utils.py function
 
     return Response({"message": "User created successfully"}, status=status.HTTP_201_CREATED)
@@ -87,11 +103,9 @@ def login(request):
             {"error": "Invalid credentials"},
             status=status.HTTP_401_UNAUTHORIZED
         )
-@api_view(['GET'])
-def get_student_profile(request, user_id):
-    profile = get_object_or_404(StudentProfile, user_id=user_id)
+def profile_data(profile):
     user = profile.user
-    return Response({
+    return {
         "id": profile.id,
         "name": user.name,
         "email": user.email,
@@ -112,56 +126,145 @@ def get_student_profile(request, user_id):
         "skills": profile.skills,
         "profile_views": profile.profile_views,
         "role": "student"  
-    })
+    }
+
+
+# profile_data key -> StudentProfile field path, for ?fields= projections
+PROFILE_DATA_COLUMNS = {
+    "id": "id",
+    "name": "user__name",
+    "email": "user__email",
+    **{key: key for key in (
+        "phone", "university", "major", "graduation_year", "bio", "location", "github_url",
+        "website_url", "linkedin_url", "internship_type_preference", "preferred_internship_location",
+        "preferred_locations", "open_to_relocate", "multiple_website_urls", "skills", "profile_views",
+    )},
+    "role": Value("student"),
+}
+
+
+@student_conditional
+@api_view(['GET'])
+def get_student_profile(request, user_id):
+    try:
+        fields = requested_fields(request.query_params, PROFILE_DATA_COLUMNS)
+    except InvalidFields as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    def build():
+        if fields is None:
+            profile = get_object_or_404(StudentProfile.objects.select_related('user'), user_id=user_id)
+            return profile_data(profile)
+        rows = project_values(StudentProfile.objects.filter(user_id=user_id), PROFILE_DATA_COLUMNS, fields)
+        if not rows:
+            raise Http404("No StudentProfile matches the given query.")
+        return rows[0]
+    return Response(response_cache.get_or_build(
+        'student_profile', [user_id, *(fields or [])], [response_cache.student_scope(user_id)], build
+    ))
+
+@api_view(['POST'])
+def increment_profile_views(request, user_id):
+    # Views are buffered and flushed in batches, see api/profile_views.py
+    if not student_exists(user_id):
+        return Response({"error": "Profile not found"}, status=status.HTTP_404_NOT_FOUND)
+    if request.user.is_authenticated:
+        viewer_key = f"user:{request.user.id}"
+    else:
+        viewer_key = f"ip:{request.META.get('REMOTE_ADDR', '')}"
+    counted = record_profile_view(user_id, viewer_key)
+    return Response({"success": True, "counted": counted}, status=status.HTTP_202_ACCEPTED)
+
+
+# Profile fields a student may write; profile_views is only moved by the view counter and
+# content_version (the ETag validator) only by the server.
+PROFILE_FIELDS = {
+    f.name for f in StudentProfile._meta.concrete_fields
+    if f.editable and f.name not in ('id', 'user', 'profile_views', 'updated_at', 'content_version')
+}
+
+
+def _save_profile(user_id, data):
+    return StudentProfile.objects.update_or_create(
+        user_id=user_id,
+        defaults={k: v for k, v in data.items() if k in PROFILE_FIELDS}
+    )[0]
+
 
 @api_view(['POST'])
 def save_student_profile(request):
     data = request.data
-    profile, _ = StudentProfile.objects.update_or_create(
-        user_id=data["user_id"],
-        defaults=data
-    )
+    with transaction.atomic():
+        profile = _save_profile(data["user_id"], data)
+        sync_student_skills(profile.id)
+        ranking.mark_dirty()
+        index_student(profile.id)
+        response_cache.invalidate(response_cache.student_scope(profile.user_id), response_cache.directory_scope())
     return Response({
         "message": "Profile saved",
         "id": profile.id
     })
 
 
-@api_view(['GET'])
-def get_student_projects(request, user_id):
-    profile = get_object_or_404(StudentProfile, user_id=user_id)
-    projects = StudentProject.objects.filter(student=profile)
-    data = [{
+def _invalidate_student(student_id):
+    # touch_student bumped updated_at, which orders (and caps) the cached directory too
+    user_id = StudentProfile.objects.filter(id=student_id).values_list('user_id', flat=True).first()
+    if user_id is not None:
+        response_cache.invalidate(response_cache.student_scope(user_id), response_cache.directory_scope())
+
+
+def project_data(p):
+    return {
         "id": p.id,
         "title": p.title,
         "description": p.description,
         "technologies": p.technologies,
         "video_url": p.video_url
-    } for p in projects]
-    return Response(data)
+    }
+
+
+@student_conditional
+@api_view(['GET'])
+def get_student_projects(request, user_id):
+    def build():
+        profile = get_object_or_404(StudentProfile, user_id=user_id)
+        projects = StudentProject.objects.filter(student=profile).order_by('id')
+        return [project_data(p) for p in projects]
+    return Response(response_cache.get_or_build(
+        'student_projects', [user_id], [response_cache.student_scope(user_id)], build
+    ))
+
+
+# Writable project fields and their defaults
+PROJECT_FIELDS = {"title": "", "description": "", "technologies": [], "video_url": ""}
 
 
 @api_view(['POST'])
 def save_student_projects(request):
     student_id = request.data.get("student_id")
     projects = request.data.get("projects", [])
-    StudentProject.objects.filter(student_id=student_id).delete()
-    for p in projects:
-        StudentProject.objects.create(
-            student_id=student_id,
-            title=p["title"],
-            description=p.get("description", ""),
-            technologies=p.get("technologies", []),
-            video_url=p.get("video_url", "")
-        )
-    return Response({"message": "Projects saved"})
+    if not student_id or not isinstance(projects, list):
+        return Response({"error": "student_id and a projects list are required"}, status=status.HTTP_400_BAD_REQUEST)
 
+    try:
+        with transaction.atomic():
+            saved, counts = upsert_student_rows(StudentProject, student_id, projects, PROJECT_FIELDS, validate=True)
+            if any(counts.values()):
+                sync_student_skills(student_id)
+                ranking.mark_dirty()
+                index_student(student_id)
+                _invalidate_student(student_id)
+    except InvalidRows as e:
+        return Response({"error": "Invalid projects", "details": e.errors}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({
+        "message": "Projects saved",
+        "projects": [project_data(p) for p in saved],
+        **counts
+    })
 
-@api_view(['GET'])
-def get_student_certifications(request, user_id):
-    profile = get_object_or_404(StudentProfile, user_id=user_id)
-    certs = StudentCertification.objects.filter(student=profile)
-    data = [{
+
+def certification_data(c):
+    return {
         "id": c.id,
         "certification_name": c.certification_name,
         "issuing_organization": c.issuing_organization,
@@ -171,35 +274,134 @@ def get_student_certifications(request, user_id):
         "credential_url": c.credential_url,
         "certificate_file_url": c.certificate_file_url,
         "certificate_filename": c.certificate_filename
-    } for c in certs]
-    return Response(data)
+    }
+
+
+@student_conditional
+@api_view(['GET'])
+def get_student_certifications(request, user_id):
+    def build():
+        profile = get_object_or_404(StudentProfile, user_id=user_id)
+        certs = StudentCertification.objects.filter(student=profile).order_by('id')
+        return [certification_data(c) for c in certs]
+    return Response(response_cache.get_or_build(
+        'student_certifications', [user_id], [response_cache.student_scope(user_id)], build
+    ))
+
+
+# Writable certification fields and their defaults
+CERTIFICATION_FIELDS = {
+    "certification_name": "",
+    "issuing_organization": "",
+    "issue_date": "",
+    "expiry_date": "",
+    "credential_id": "",
+    "credential_url": "",
+    "certificate_file_url": "",
+    "certificate_filename": "",
+}
 
 
 @api_view(['POST'])
 def save_student_certifications(request):
     student_id = request.data.get("student_id")
     certifications = request.data.get("certifications", [])
-    StudentCertification.objects.filter(student_id=student_id).delete()
-    for c in certifications:
-        StudentCertification.objects.create(
-            student_id=student_id,
-            certification_name=c["certification_name"],
-            issuing_organization=c.get("issuing_organization", ""),
-            issue_date=c.get("issue_date"),
-            expiry_date=c.get("expiry_date"),
-            credential_id=c.get("credential_id", ""),
-            credential_url=c.get("credential_url", ""),
-            certificate_file_url=c.get("certificate_file_url", ""),
-            certificate_filename=c.get("certificate_filename", ""),
+    if not student_id or not isinstance(certifications, list):
+        return Response(
+            {"error": "student_id and a certifications list are required"},
+            status=status.HTTP_400_BAD_REQUEST
         )
-    return Response({"message": "Certifications saved"})
+
+    try:
+        with transaction.atomic():
+            saved, counts = upsert_student_rows(
+                StudentCertification, student_id, certifications, CERTIFICATION_FIELDS, validate=True
+            )
+            if any(counts.values()):
+                index_student(student_id)
+                _invalidate_student(student_id)
+    except InvalidRows as e:
+        return Response({"error": "Invalid certifications", "details": e.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        "message": "Certifications saved",
+        "certifications": [certification_data(c) for c in saved],
+        **counts
+    })
+
+
+# Profile + projects + certifications in one round trip
+@student_conditional
+@api_view(['GET'])
+def get_student_bundle(request, user_id):
+    def build():
+        profile = get_object_or_404(
+            StudentProfile.objects.select_related('user').prefetch_related(
+                Prefetch('studentproject_set', queryset=StudentProject.objects.order_by('id')),
+                Prefetch('studentcertification_set', queryset=StudentCertification.objects.order_by('id')),
+            ),
+            user_id=user_id
+        )
+        return {
+            "profile": profile_data(profile),
+            "projects": [project_data(p) for p in profile.studentproject_set.all()],
+            "certifications": [certification_data(c) for c in profile.studentcertification_set.all()],
+        }
+    return Response(response_cache.get_or_build(
+        'student_bundle', [user_id], [response_cache.student_scope(user_id)], build
+    ))
+
+
+@api_view(['POST'])
+def save_student_bundle(request):
+    data = request.data
+    user_id = data.get("user_id")
+    if not user_id:
+        return Response({"error": "user_id is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Omitted sections are left untouched.
+    projects = data.get("projects")
+    certifications = data.get("certifications")
+    if any(rows is not None and not isinstance(rows, list) for rows in (projects, certifications)):
+        return Response({"error": "projects and certifications must be lists"}, status=status.HTTP_400_BAD_REQUEST)
+
+    response = {"message": "Profile saved"}
+    try:
+        with transaction.atomic():
+            profile = _save_profile(user_id, data.get("profile") or {})
+            response["id"] = profile.id
+            if projects is not None:
+                saved, counts = upsert_student_rows(StudentProject, profile.id, projects, PROJECT_FIELDS, validate=True)
+                response["projects"] = [project_data(p) for p in saved]
+                response["project_counts"] = counts
+            if certifications is not None:
+                saved, counts = upsert_student_rows(
+                    StudentCertification, profile.id, certifications, CERTIFICATION_FIELDS, validate=True
+                )
+                response["certifications"] = [certification_data(c) for c in saved]
+                response["certification_counts"] = counts
+            sync_student_skills(profile.id)
+            ranking.mark_dirty()
+            index_student(profile.id)
+            response_cache.invalidate(response_cache.student_scope(profile.user_id), response_cache.directory_scope())
+    except InvalidRows as e:
+        return Response({"error": "Invalid rows", "details": e.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(response)
 
 
 # --- Yeni eklenen OTP API endpointleri ---
 
 
-# In-memory OTP storage
-otp_storage = {}
+# Pending codes live in the OTPCode table, see api/otp.py
+OTP_ERRORS = {
+    OTP_NOT_FOUND: ("OTP not found", status.HTTP_404_NOT_FOUND),
+    OTP_EXPIRED: ("OTP expired", status.HTTP_400_BAD_REQUEST),
+    OTP_INVALID: ("Invalid OTP", status.HTTP_400_BAD_REQUEST),
+    OTP_LOCKED: ("Too many attempts, please request a new code", status.HTTP_429_TOO_MANY_REQUESTS),
+}
+
+
 @api_view(['POST'])
 def verify_otp(request):
     email = request.data.get('email')
@@ -209,12 +411,10 @@ def verify_otp(request):
     if not email or not otp or not otp_type:
         return Response({"error": "Missing parameters"}, status=status.HTTP_400_BAD_REQUEST)
 
-    stored_otp = otp_storage.get(email)
-    if stored_otp is None:
-        return Response({"error": "OTP not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if otp != stored_otp:
-        return Response({"error": "Invalid OTP"}, status=status.HTTP_400_BAD_REQUEST)
+    result = check_otp(email, otp, otp_type)
+    if result != OTP_OK:
+        error, error_status = OTP_ERRORS[result]
+        return Response({"error": error}, status=error_status)
 
     try:
         user = User.objects.get(email=email)
@@ -223,8 +423,6 @@ def verify_otp(request):
     except User.DoesNotExist:
         return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
 
-    del otp_storage[email]
-
     return Response({"success": True})
 
 @api_view(['POST'])
@@ -235,8 +433,7 @@ def resend_otp(request):
     if not email or not otp_type:
         return Response({"error": "Missing parameters"}, status=status.HTTP_400_BAD_REQUEST)
 
-    new_otp = f"{random.randint(100000, 999999)}"
-    otp_storage[email] = new_otp
+    new_otp = issue_otp(email, otp_type)
 
     success = send_otp_email(email, new_otp)
 
@@ -245,39 +442,7 @@ def resend_otp(request):
     else:
         return Response({"error": "Failed to send OTP email"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-@api_view(['GET'])
-def get_bookmarked_students(request):
-    user = request.user
-    if isinstance(user, AnonymousUser):
-        return Response([])
-
-    try:
-        recruiter_profile = RecruiterProfile.objects.get(user=user)
-    except RecruiterProfile.DoesNotExist:
-        return Response({"detail": "Recruiter profile not found."}, status=status.HTTP_404_NOT_FOUND)
-
-    bookmarks = Bookmark.objects.select_related('student__user').filter(recruiter=recruiter_profile)
-
-    data = []
-    for bookmark in bookmarks:
-        student = bookmark.student
-        data.append({
-            "id": student.id,
-            "user_id": student.user.id,
-            "name": student.user.name,
-            "email": student.user.email,
-            "university": student.university,
-            "major": student.major,
-            "graduation_year": student.graduation_year,
-            "location": student.location,
-            "skills": student.skills,
-            "profile_views": student.profile_views,
-            "internship_type_preference": student.internship_type_preference
-        })
-
-    return Response(data)
-
-
+@recruiter_conditional
 @api_view(['GET', 'PUT'])
 def recruiter_profile_detail(request, user_id):
     try:
@@ -354,6 +519,8 @@ def add_bookmark(request):
 
     bookmark, created = Bookmark.objects.get_or_create(recruiter=recruiter_profile, student=student)
     if created:
+        response_cache.invalidate(response_cache.bookmarks_scope(recruiter_profile.id))
+        similar.mark_changed(recruiter_profile.id, [student.id])
         return Response({"message": "Bookmark added"}, status=status.HTTP_201_CREATED)
     else:
         return Response({"message": "Bookmark already exists"})
@@ -373,6 +540,8 @@ def remove_bookmark(request, student_id):
     try:
         bookmark = Bookmark.objects.get(recruiter=recruiter_profile, student__id=student_id)
         bookmark.delete()
+        response_cache.invalidate(response_cache.bookmarks_scope(recruiter_profile.id))
+        similar.mark_changed(recruiter_profile.id, [bookmark.student_id])
         return Response({"message": "Bookmark removed"})
     except Bookmark.DoesNotExist:
         return Response({"error": "Bookmark not found"}, status=status.HTTP_404_NOT_FOUND)
@@ -383,38 +552,49 @@ import os
 from django.conf import settings
 from django.core.files.storage import default_storage
 
+def upload_user_id(data):
+    """(user_id, None) for the user_id of an upload / delete request, or (None, 400 response)."""
+    user_id = data.get('user_id')
+    if not user_id:
+        return None, Response({"error": "user_id missing"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        return int(user_id), None
+    except (TypeError, ValueError):
+        return None, Response({"error": "user_id must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+
 @api_view(['POST'])
-@parser_classes([MultiPartParser, FormParser])
+@parser_classes([HashingMultiPartParser, FormParser])
 def upload_certificate(request):
+    user_id, error = upload_user_id(request.POST)
+    if error:
+        return error
+
     if 'file' not in request.FILES:
         return Response({"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST)
 
     file = request.FILES['file']
 
-    save_path = os.path.join('certificates', file.name)
-    path = default_storage.save(save_path, file)
+    # Aynı içerik zaten varsa tekrar yazılmaz, sadece referans eklenir
+    ref = store_file(file, BlobReference.KIND_CERTIFICATE, user_id=user_id, digest=upload_digest(request, 'file'))
 
-    public_url = request.build_absolute_uri(settings.MEDIA_URL + path)
+    public_url = request.build_absolute_uri(settings.MEDIA_URL + ref.blob.path)
 
     return Response({"public_url": public_url}, status=status.HTTP_201_CREATED)
 @api_view(['POST'])
-@parser_classes([MultiPartParser, FormParser])
+@parser_classes([HashingMultiPartParser, FormParser])
 def upload_resume(request):
-    user_id = request.POST.get('user_id')
-    if not user_id:
-        return Response({"error": "user_id missing"}, status=status.HTTP_400_BAD_REQUEST)
+    user_id, error = upload_user_id(request.POST)
+    if error:
+        return error
 
     if 'file' not in request.FILES:
         return Response({"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST)
 
     file = request.FILES['file']
-    save_dir = os.path.join('resumes', str(user_id))
-    save_path = os.path.join(save_dir, file.name)
-
-    # Eğer aynı dosya varsa üstüne yazma yerine farklı isim verilebilir (isteğe bağlı)
-    path = default_storage.save(save_path, file)
+    ref = store_file(file, BlobReference.KIND_RESUME, user_id=user_id, digest=upload_digest(request, 'file'))
 
-    public_url = request.build_absolute_uri(settings.MEDIA_URL + path)
+    public_url = request.build_absolute_uri(settings.MEDIA_URL + ref.blob.path)
 
     # Burada opsiyonel olarak StudentProfile modelinde resume_url ve resume_filename alanlarını güncelleyebilirsin.
 
@@ -428,6 +608,9 @@ def delete_resume(request):
 
     if not user_id or not resume_url:
         return Response({"error": "user_id and resume_url required"}, status=status.HTTP_400_BAD_REQUEST)
+    user_id, error = upload_user_id(request.data)
+    if error:
+        return error
 
     # Resume URL'den dosya yolunu çıkar (örneğin MEDIA_URL sonrası)
     try:
@@ -438,15 +621,77 @@ def delete_resume(request):
     except Exception:
         return Response({"error": "Invalid resume_url"}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Dosyayı sil
-    if default_storage.exists(file_path):
-        default_storage.delete(file_path)
+    # Dosyayı sil (paylaşılan dosya son referans bırakılınca silinir)
+    delete_upload(file_path, BlobReference.KIND_RESUME, user_id=user_id)
 
     # Burada opsiyonel olarak StudentProfile modelinde resume_url ve resume_filename alanlarını temizle
 
     return Response({"message": "Resume deleted"}, status=status.HTTP_200_OK)
 
 
+# Shortlists: add (POST) or remove (DELETE) many bookmarks at once, {"student_ids": [...]} (student user ids)
+@api_view(['POST', 'DELETE'])
+def bulk_bookmarks(request):
+    user = request.user
+    if isinstance(user, AnonymousUser):
+        return Response({"error": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
+
+    student_ids = request.data.get("student_ids")
+    if not isinstance(student_ids, list) or not student_ids:
+        return Response({"error": "student_ids must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+    if len(student_ids) > MAX_BULK_BOOKMARKS:
+        return Response({"error": f"At most {MAX_BULK_BOOKMARKS} students per request"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        student_ids = {int(i) for i in student_ids}
+    except (TypeError, ValueError):
+        return Response({"error": "student_ids must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        recruiter_profile = RecruiterProfile.objects.get(user=user)
+    except RecruiterProfile.DoesNotExist:
+        return Response({"error": "Recruiter profile not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    if request.method == 'DELETE':
+        bookmarks = Bookmark.objects.filter(recruiter=recruiter_profile, student__user_id__in=student_ids)
+        removed_ids = list(bookmarks.values_list('student_id', flat=True))
+        removed, _ = bookmarks.delete()
+        if removed:
+            response_cache.invalidate(response_cache.bookmarks_scope(recruiter_profile.id))
+            similar.mark_changed(recruiter_profile.id, removed_ids)
+        return Response({"message": "Bookmarks removed", "removed": removed})
+
+    profiles = dict(StudentProfile.objects.filter(user_id__in=student_ids).values_list('id', 'user_id'))
+    existing = set(Bookmark.objects.filter(
+        recruiter=recruiter_profile, student_id__in=profiles
+    ).values_list('student_id', flat=True))
+    # The unique (recruiter, student) constraint makes concurrent adds safe to ignore.
+    Bookmark.objects.bulk_create(
+        [Bookmark(recruiter=recruiter_profile, student_id=pid) for pid in profiles if pid not in existing],
+        ignore_conflicts=True
+    )
+    added = len(profiles) - len(existing)
+    if added:
+        response_cache.invalidate(response_cache.bookmarks_scope(recruiter_profile.id))
+        similar.mark_changed(recruiter_profile.id, [pid for pid in profiles if pid not in existing])
+    return Response({
+        "message": "Bookmarks added",
+        "added": added,
+        "not_found": sorted(student_ids - set(profiles.values())),
+    }, status=status.HTTP_201_CREATED if added else status.HTTP_200_OK)
+
+
+# Bookmark state for many student cards at once: ?student_ids=1,2,3 (student user ids)
+@api_view(['GET'])
+def check_bookmark_status_batch(request):
+    try:
+        student_ids = parse_id_list(request.query_params.get('student_ids'))
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    bookmarked = bookmarked_user_ids(request.user, student_ids)
+    return Response({"bookmarked": sorted(bookmarked)})
+
+
 @api_view(['GET'])
 def check_bookmark_status(request, student_id):
     user = request.user
@@ -484,6 +729,8 @@ def add_bookmark(request):
 
     bookmark, created = Bookmark.objects.get_or_create(recruiter=recruiter_profile, student=student)
     if created:
+        response_cache.invalidate(response_cache.bookmarks_scope(recruiter_profile.id))
+        similar.mark_changed(recruiter_profile.id, [student.id])
         return Response({"message": "Bookmark added"}, status=status.HTTP_201_CREATED)
     else:
         return Response({"message": "Bookmark already exists"})
@@ -503,29 +750,30 @@ def remove_bookmark(request, student_id):
     try:
         bookmark = Bookmark.objects.get(recruiter=recruiter_profile, student__user__id=student_id)
         bookmark.delete()
+        response_cache.invalidate(response_cache.bookmarks_scope(recruiter_profile.id))
+        similar.mark_changed(recruiter_profile.id, [bookmark.student_id])
         return Response({"message": "Bookmark removed"})
     except Bookmark.DoesNotExist:
         return Response({"error": "Bookmark not found"}, status=status.HTTP_404_NOT_FOUND)
 
 
 @api_view(['POST'])
-@parser_classes([MultiPartParser, FormParser])
+@parser_classes([HashingMultiPartParser, FormParser])
 def upload_project_video(request):
     user_id = request.POST.get('user_id')
     project_id = request.POST.get('project_id')
     if not user_id or not project_id:
         return Response({"error": "user_id and project_id are required"}, status=status.HTTP_400_BAD_REQUEST)
+    user_id, error = upload_user_id(request.POST)
+    if error:
+        return error
 
     if 'file' not in request.FILES:
         return Response({"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST)
 
     file = request.FILES['file']
-    save_dir = os.path.join('project-videos', str(user_id))
-    os.makedirs(os.path.join(settings.MEDIA_ROOT, save_dir), exist_ok=True)
-    save_path = os.path.join(save_dir, file.name)
-
-    path = default_storage.save(save_path, file)
-    public_url = request.build_absolute_uri(settings.MEDIA_URL + path)
+    ref = store_file(file, BlobReference.KIND_PROJECT_VIDEO, user_id=user_id, digest=upload_digest(request, 'file'))
+    public_url = request.build_absolute_uri(settings.MEDIA_URL + ref.blob.path)
     return Response({"public_url": public_url}, status=status.HTTP_201_CREATED)
 
 
@@ -536,6 +784,9 @@ def delete_project_video(request):
 
     if not user_id or not video_url:
         return Response({"error": "user_id and video_url are required"}, status=status.HTTP_400_BAD_REQUEST)
+    user_id, error = upload_user_id(request.data)
+    if error:
+        return error
 
     from urllib.parse import urlparse
 
@@ -547,7 +798,96 @@ def delete_project_video(request):
     except Exception:
         return Response({"error": "Invalid video_url"}, status=status.HTTP_400_BAD_REQUEST)
 
-    if default_storage.exists(file_path):
-        default_storage.delete(file_path)
+    delete_upload(file_path, BlobReference.KIND_PROJECT_VIDEO, user_id=user_id)
 
     return Response({"message": "Video deleted"}, status=status.HTTP_200_OK)
+
+
+# --- Chunked / resumable project video upload ---
+def chunked_upload_data(upload, request=None):
+    data = {
+        "upload_id": str(upload.id),
+        "filename": upload.filename,
+        "offset": upload.offset,
+        "total_size": upload.total_size,
+        "status": upload.status,
+    }
+    if upload.path and request is not None:
+        data["public_url"] = request.build_absolute_uri(settings.MEDIA_URL + upload.path)
+    return data
+
+
+@api_view(['POST'])
+def start_project_video_upload(request):
+    user_id = request.data.get('user_id')
+    project_id = request.data.get('project_id')
+    if not user_id or not project_id:
+        return Response({"error": "user_id and project_id are required"}, status=status.HTTP_400_BAD_REQUEST)
+    user_id, error = upload_user_id(request.data)
+    if error:
+        return error
+    try:
+        total_size = int(request.data.get('total_size'))
+    except (TypeError, ValueError):
+        return Response({"error": "total_size must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        upload = start_upload(
+            user_id, request.data.get('filename'), total_size,
+            project_id=project_id, sha256=request.data.get('sha256', '')
+        )
+    except UploadError as e:
+        return Response({"error": str(e)}, status=e.status_code)
+
+    data = chunked_upload_data(upload)
+    data["max_chunk_size"] = getattr(settings, 'CHUNKED_UPLOAD_MAX_CHUNK_SIZE', 8 * 1024 * 1024)
+    return Response(data, status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET', 'PUT', 'DELETE'])
+def project_video_upload(request, upload_id):
+    """
+    GET: current offset (resume point). PUT: raw chunk body with `Upload-Offset` and
+    optional `X-Chunk-SHA256` headers. DELETE: abort and discard the partial file.
+    """
+    if request.method == 'DELETE':
+        if not abort_upload(upload_id):
+            return Response({"error": "Upload not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    if request.method == 'GET':
+        upload = ChunkedUpload.objects.filter(id=upload_id).first()
+        if upload is None:
+            return Response({"error": "Upload not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(chunked_upload_data(upload, request), status=status.HTTP_200_OK)
+
+    try:
+        offset = int(request.headers.get('Upload-Offset', ''))
+        length = int(request.headers.get('Content-Length', ''))
+    except ValueError:
+        return Response({"error": "Upload-Offset and Content-Length headers are required"}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        # request.stream is read directly so the chunk is never parsed or buffered.
+        upload = write_chunk(upload_id, offset, length, request.stream, request.headers.get('X-Chunk-SHA256', ''))
+    except UploadError as e:
+        return Response({"error": str(e)}, status=e.status_code)
+    return Response(chunked_upload_data(upload), status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+def complete_project_video_upload(request, upload_id):
+    try:
+        upload = complete_upload(upload_id)
+    except UploadError as e:
+        return Response({"error": str(e)}, status=e.status_code)
+    data = chunked_upload_data(upload, request)
+    return Response(data, status=status.HTTP_201_CREATED)
+
+
+# Rolling per-route latency histograms of this worker process (sampled, see PERF_SAMPLE_RATE)
+@api_view(['GET'])
+def perf_routes(request):
+    if not request.user.is_authenticated or not request.user.is_staff:
+        return Response({"error": "Staff access required"}, status=status.HTTP_403_FORBIDDEN)
+    return Response({"routes": route_stats()}, status=status.HTTP_200_OK)
@@ -5,7 +5,9 @@ from django.contrib.auth import logout
 from django.shortcuts import get_object_or_404
 from api.models import User, StudentProfile
 from recruiter.models import RecruiterProfile
+from api.conditional import current_user_conditional
 
+@current_user_conditional
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_user_profile(request):
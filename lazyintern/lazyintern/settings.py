@@ -31,6 +31,8 @@ AUTH_USER_MODEL = 'api.User'
 
 # Middleware
 MIDDLEWARE = [
+    'api.instrumentation.PerformanceMiddleware',  # süre ölçümü: diğer tüm middleware'leri kapsasın
+    'api.metrics.MetricsMiddleware',              # Prometheus sayaçları (/metrics)
     'corsheaders.middleware.CorsMiddleware',  # CORS en üstte
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -113,12 +115,34 @@ CSRF_TRUSTED_ORIGINS = [
 ]
 
 # ✅ REST Framework ayarları
+# ✅ FAST_JSON_RENDERER=True: JSON yanıtlar orjson ile yazılır (kurulu değilse stdlib json)
+FAST_JSON_RENDERER = os.getenv('FAST_JSON_RENDERER', 'False') == 'True'
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.BasicAuthentication',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer' if FAST_JSON_RENDERER else 'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+# ✅ Cache (yanıt cache'i, profil görüntülenme dedup'u)
+# Birden fazla worker varsa paylaşılan bir backend kullanılmalı (file / memcached / redis);
+# locmem her process'e ayrı olduğundan invalidation diğer worker'lara ulaşmaz.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', str(BASE_DIR / '.cache')),
+    }
 }
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', 300))  # saniye
+
+# ✅ Öğrenci listesi (recruiter/views.py)
+STUDENT_LIST_MAX_ROWS = int(os.getenv('STUDENT_LIST_MAX_ROWS', 500))   # /students/ üst sınırı; tamamı için /students/search/
+BOOKMARK_LIST_MAX_ROWS = int(os.getenv('BOOKMARK_LIST_MAX_ROWS', 500)) # /bookmarks/ üst sınırı; tamamı için /bookmarks/search/
 
 # ✅ Session (cookie) ayarları
 SESSION_ENGINE = "django.contrib.sessions.backends.db"
@@ -139,3 +163,42 @@ EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS') == 'True'
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+
+# ✅ Profil görüntülenme sayacı (api/profile_views.py)
+PROFILE_VIEW_FLUSH_INTERVAL = int(os.getenv('PROFILE_VIEW_FLUSH_INTERVAL', 10))      # saniye
+PROFILE_VIEW_FLUSH_BATCH_SIZE = int(os.getenv('PROFILE_VIEW_FLUSH_BATCH_SIZE', 100))
+PROFILE_VIEW_DEDUP_WINDOW = int(os.getenv('PROFILE_VIEW_DEDUP_WINDOW', 1800))        # saniye, 0 = kapalı
+
+# ✅ OTP ayarları (api/otp.py)
+OTP_TTL_SECONDS = int(os.getenv('OTP_TTL_SECONDS', 600))
+OTP_MAX_ATTEMPTS = int(os.getenv('OTP_MAX_ATTEMPTS', 5))
+
+# ✅ Mail kuyruğu (api/mail_queue.py)
+EMAIL_QUEUE_THREAD = os.getenv('EMAIL_QUEUE_THREAD', 'True') == 'True'   # ayrı worker varsa False
+EMAIL_QUEUE_BATCH_SIZE = int(os.getenv('EMAIL_QUEUE_BATCH_SIZE', 50))
+EMAIL_QUEUE_MAX_ATTEMPTS = int(os.getenv('EMAIL_QUEUE_MAX_ATTEMPTS', 5))
+EMAIL_QUEUE_RETRY_BASE_SECONDS = int(os.getenv('EMAIL_QUEUE_RETRY_BASE_SECONDS', 30))
+
+# ✅ Parçalı (resumable) video yükleme (api/chunked_upload.py)
+CHUNKED_UPLOAD_TEMP_DIR = os.getenv('CHUNKED_UPLOAD_TEMP_DIR', str(BASE_DIR / '.uploads'))
+CHUNKED_UPLOAD_MAX_CHUNK_SIZE = int(os.getenv('CHUNKED_UPLOAD_MAX_CHUNK_SIZE', 8 * 1024 * 1024))   # byte
+CHUNKED_UPLOAD_MAX_FILE_SIZE = int(os.getenv('CHUNKED_UPLOAD_MAX_FILE_SIZE', 1024 * 1024 * 1024))  # byte
+
+# ✅ Aday sıralama indeksi (api/ranking.py, numpy gerekir)
+RANKING_REFRESH_SECONDS = int(os.getenv('RANKING_REFRESH_SECONDS', 5))   # başka process'lerdeki değişiklikler için
+RANKING_MAX_OVERLAY = int(os.getenv('RANKING_MAX_OVERLAY', 1000))        # aşılınca indeks yeniden kurulur
+
+# ✅ "Bunu kaydedenler şunları da kaydetti" komşu tablosu (recruiter/similar.py)
+SIMILAR_STUDENTS_TOP_N = int(os.getenv('SIMILAR_STUDENTS_TOP_N', 20))
+
+# ✅ İstek performans ölçümü (api/instrumentation.py, Server-Timing header'ı)
+PERF_SAMPLE_RATE = float(os.getenv('PERF_SAMPLE_RATE', 0.1))               # 0 = kapalı, 1 = her istek
+PERF_SERVER_TIMING = os.getenv('PERF_SERVER_TIMING', 'True') == 'True'     # ölçülen isteklere header eklensin mi
+PERF_HISTOGRAM_WINDOW = int(os.getenv('PERF_HISTOGRAM_WINDOW', 300))        # saniye, route histogram penceresi
+
+# ✅ Prometheus metrikleri (api/metrics.py, GET /metrics)
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True') == 'True'
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')                          # boş değilse "Authorization: Bearer <token>" gerekir
+# Birden fazla worker process'i varsa hepsinin paylaştığı bir dizin (servis yeniden başlarken boşaltılmalı)
+METRICS_MULTIPROC_DIR = os.getenv('PROMETHEUS_MULTIPROC_DIR', '')
+METRICS_FLUSH_INTERVAL = int(os.getenv('METRICS_FLUSH_INTERVAL', 1))    # saniye, process dosyasının yazılma sıklığı
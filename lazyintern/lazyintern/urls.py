@@ -1,9 +1,15 @@
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
+
+from api.media import MEDIA_PREFIXES, serve_media
+from api.metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),                
     path('api/recruiter/', include('recruiter.urls')),
     path('api/auth/', include('auth.urls')),
+    path('metrics', metrics_view, name='metrics'),   # Prometheus scrape target
+    # Uploaded files; MEDIA_URL is empty, so public_url values point straight at these prefixes.
+    re_path(r'^(?P<path>(?:%s)/.+)$' % '|'.join(MEDIA_PREFIXES), serve_media, name='serve_media'),
 ]
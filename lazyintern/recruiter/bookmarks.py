@@ -0,0 +1,31 @@
+from .models import Bookmark
+
+MAX_STATUS_IDS = 500
+MAX_BULK_BOOKMARKS = 500
+
+
+def parse_id_list(value, limit=MAX_STATUS_IDS):
+    """'1,2,3' -> [1, 2, 3]; raises ValueError on junk or too many ids."""
+    ids = [int(v) for v in (value or '').split(',') if v.strip()]
+    if len(ids) > limit:
+        raise ValueError(f"At most {limit} ids per request")
+    return ids
+
+
+def bookmarked_user_ids(user, student_user_ids):
+    """
+    Student user ids (out of `student_user_ids`) bookmarked by the recruiter `user`,
+    in a single query that joins the recruiter profile instead of fetching it first.
+    """
+    if not user.is_authenticated or not student_user_ids:
+        return set()
+    return set(
+        Bookmark.objects.filter(recruiter__user_id=user.id, student__user_id__in=student_user_ids)
+        .values_list('student__user_id', flat=True)
+    )
+
+
+def with_bookmark_state(user, rows):
+    """Adds "is_bookmarked" to student summary dicts without mutating cached payloads."""
+    marked = bookmarked_user_ids(user, [row["user_id"] for row in rows])
+    return [{**row, "is_bookmarked": row["user_id"] in marked} for row in rows]
@@ -0,0 +1,73 @@
+import re
+
+from django.db.models import Q
+
+from api.models import StudentSkill
+from api.skills import filter_by_skills
+
+# Same semantics as useStudentFilters.ts on the recruiter dashboard, applied in SQL.
+
+
+def _terms(value):
+    return [t.lower() for t in re.split(r'[,\s]+', value or '') if t]
+
+
+def _list_param(params, name):
+    if hasattr(params, 'getlist'):
+        raw = params.getlist(name)
+    else:
+        raw = params.get(name) or []
+        raw = raw if isinstance(raw, list) else [raw]
+    values = []
+    for item in raw:
+        values.extend(v.strip() for v in str(item).split(',') if v.strip())
+    return values
+
+
+def filter_students(queryset, params, prefix=''):
+    """
+    Filters a StudentProfile queryset by the search query params.
+    `prefix` lets the same filters run through a relation, e.g. 'student__' for Bookmark.
+    """
+    university = params.get('university')
+    if university:
+        queryset = queryset.filter(**{f"{prefix}university__icontains": university})
+
+    major = params.get('major')
+    if major:
+        queryset = queryset.filter(**{f"{prefix}major__icontains": major})
+
+    graduation_years = _list_param(params, 'graduation_year')
+    if graduation_years:
+        queryset = queryset.filter(**{f"{prefix}graduation_year__in": graduation_years})
+
+    location_terms = _terms(params.get('location'))
+    if location_terms:
+        condition = Q()
+        for term in location_terms:
+            condition |= Q(**{f"{prefix}location__icontains": term})
+            condition |= Q(**{f"{prefix}preferred_internship_location__icontains": term})
+            condition |= Q(**{f"{prefix}preferred_locations__icontains": term})
+        queryset = queryset.filter(condition)
+
+    internship_type = params.get('internship_type_preference')
+    if internship_type and internship_type != 'both':
+        queryset = queryset.filter(
+            Q(**{f"{prefix}internship_type_preference": internship_type})
+            | Q(**{f"{prefix}internship_type_preference": 'both'})
+        )
+
+    # Skills are matched exactly (case-folded) against the skill index.
+    match = 'all' if params.get('skills_match') == 'all' else 'any'
+    skills = _list_param(params, 'skills')
+    if skills:
+        queryset = filter_by_skills(queryset, skills, match=match, field=f"{prefix}id")
+
+    project_skills = _list_param(params, 'project_skills')
+    if project_skills:
+        queryset = filter_by_skills(
+            queryset, project_skills, match=match,
+            source=StudentSkill.SOURCE_PROJECT, field=f"{prefix}id"
+        )
+
+    return queryset
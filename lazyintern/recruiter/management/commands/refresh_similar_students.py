@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from recruiter.similar import process_pending, rebuild_all
+
+
+class Command(BaseCommand):
+    help = ("Updates the similar-students neighbour table from queued bookmark changes; "
+            "--full recomputes it from all bookmarks.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Recompute every student instead of queued changes")
+        parser.add_argument('--top-n', type=int, default=None, help="Neighbours kept per student")
+        parser.add_argument('--loop', action='store_true', help="Keep polling for bookmark changes")
+        parser.add_argument('--interval', type=float, default=30, help="Seconds between polls with --loop")
+
+    def handle(self, *args, **options):
+        if options['full']:
+            started = time.monotonic()
+            count = rebuild_all(options['top_n'])
+            self.stdout.write(self.style.SUCCESS(f"Recomputed {count} students in {time.monotonic() - started:.1f}s"))
+            if not options['loop']:
+                return
+
+        while True:
+            count = process_pending(options['top_n'])
+            if count:
+                self.stdout.write(f"Refreshed {count} students")
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:10
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicate_bookmarks(apps, schema_editor):
+    # Keep the oldest bookmark of every (recruiter, student) pair before adding the constraint.
+    Bookmark = apps.get_model('recruiter', 'Bookmark')
+    keep = (Bookmark.objects.values('recruiter_id', 'student_id')
+            .annotate(first_id=Min('id')).values_list('first_id', flat=True))
+    Bookmark.objects.exclude(id__in=list(keep)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_studentprofile_content_version'),
+        ('recruiter', '0002_bookmark'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_bookmarks, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='bookmark',
+            index=models.Index(fields=['recruiter', '-created_at', '-id'], name='bookmark_recruiter_recent_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='bookmark',
+            constraint=models.UniqueConstraint(fields=('recruiter', 'student'), name='unique_recruiter_student_bookmark'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_stored_blobs'),
+        ('recruiter', '0003_bookmark_unique_recent_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarityUpdate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recruiter_id', models.BigIntegerField()),
+                ('student_id', models.BigIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SimilarStudent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('co_bookmarks', models.PositiveIntegerField()),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('neighbour', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.studentprofile')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_students', to='api.studentprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['student', '-score'], name='similar_student_score_idx')],
+                'constraints': [models.UniqueConstraint(fields=('student', 'neighbour'), name='unique_similar_student_pair')],
+            },
+        ),
+    ]
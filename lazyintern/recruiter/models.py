@@ -20,5 +20,41 @@ class Bookmark(models.Model):
     student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['recruiter', 'student'], name='unique_recruiter_student_bookmark'),
+        ]
+        indexes = [
+            # "bookmarks of a recruiter, newest first" listing
+            models.Index(fields=['recruiter', '-created_at', '-id'], name='bookmark_recruiter_recent_idx'),
+        ]
+
     def __str__(self):
         return f"{self.recruiter.user.email} bookmarked {self.student.user.email}"
+
+
+# Precomputed "recruiters who bookmarked this student also bookmarked" neighbours (recruiter/similar.py)
+class SimilarStudent(models.Model):
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='similar_students')
+    neighbour = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()                      # cosine similarity of the bookmark columns
+    co_bookmarks = models.PositiveIntegerField()     # recruiters that bookmarked both
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'neighbour'], name='unique_similar_student_pair'),
+        ]
+        indexes = [
+            models.Index(fields=['student', '-score'], name='similar_student_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} ~ {self.neighbour_id} ({self.score:.3f})"
+
+
+# Bookmark changes not yet folded into SimilarStudent; drained by refresh_similar_students
+class SimilarityUpdate(models.Model):
+    recruiter_id = models.BigIntegerField()
+    student_id = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
@@ -0,0 +1,110 @@
+import heapq
+import math
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max
+
+from .models import Bookmark, SimilarityUpdate, SimilarStudent
+
+# Item-item similarity from bookmark co-occurrence. With B the recruiter x student bookmark
+# matrix, co-occurrence is BᵀB; it is computed row by row from each recruiter's bookmark
+# list (the sparse product), and normalized to cosine: co(i, j) / sqrt(n_i * n_j).
+# Only the top-N neighbours per student are stored, so the endpoint is one indexed read.
+
+# Recruiters bookmarking this many students say little about similarity and make the
+# product quadratic in their list size; they are skipped.
+MAX_BOOKMARKS_PER_RECRUITER = 2000
+BATCH_SIZE = 500
+
+
+def top_n():
+    return getattr(settings, 'SIMILAR_STUDENTS_TOP_N', 20)
+
+
+def mark_changed(recruiter_id, student_ids):
+    """Queue a bookmark change for the next incremental refresh (after commit)."""
+    rows = [SimilarityUpdate(recruiter_id=recruiter_id, student_id=sid) for sid in student_ids]
+    if rows:
+        transaction.on_commit(lambda: SimilarityUpdate.objects.bulk_create(rows))
+
+
+def _recruiter_lists(recruiter_ids):
+    kept = (Bookmark.objects.filter(recruiter_id__in=recruiter_ids)
+            .values('recruiter_id').annotate(n=Count('id'))
+            .filter(n__lte=MAX_BOOKMARKS_PER_RECRUITER).values('recruiter_id'))
+    lists = defaultdict(list)
+    for recruiter_id, student_id in Bookmark.objects.filter(recruiter_id__in=kept).values_list('recruiter_id', 'student_id'):
+        lists[recruiter_id].append(student_id)
+    return lists
+
+
+def compute_neighbours(student_ids, n=None):
+    """Returns {student_id: [(neighbour_id, score, co_bookmarks), ...]} best first."""
+    n = n or top_n()
+    targets = set(student_ids)
+    recruiter_ids = Bookmark.objects.filter(student_id__in=targets).values('recruiter_id')
+    co = {sid: Counter() for sid in targets}
+    for students in _recruiter_lists(recruiter_ids).values():
+        for sid in students:
+            if sid in targets:
+                co[sid].update(students)
+
+    candidates = set().union(*co.values()) if co else set()
+    norms = dict(
+        Bookmark.objects.filter(student_id__in=candidates)
+        .values('student_id').annotate(n=Count('id')).values_list('student_id', 'n')
+    )
+    result = {}
+    for sid, counts in co.items():
+        counts.pop(sid, None)
+        n_sid = norms.get(sid, 0)
+        scored = (
+            (other, count / math.sqrt(n_sid * norms[other]), count)
+            for other, count in counts.items() if n_sid and norms.get(other)
+        )
+        result[sid] = heapq.nlargest(n, scored, key=lambda row: (row[1], row[2], -row[0]))
+    return result
+
+
+def refresh(student_ids, n=None):
+    """Recomputes and replaces the neighbour rows of the given students."""
+    student_ids = list(student_ids)
+    for start in range(0, len(student_ids), BATCH_SIZE):
+        batch = student_ids[start:start + BATCH_SIZE]
+        neighbours = compute_neighbours(batch, n)
+        with transaction.atomic():
+            SimilarStudent.objects.filter(student_id__in=batch).delete()
+            SimilarStudent.objects.bulk_create([
+                SimilarStudent(student_id=sid, neighbour_id=other, score=score, co_bookmarks=count)
+                for sid, rows in neighbours.items() for other, score, count in rows
+            ])
+    return len(student_ids)
+
+
+def rebuild_all(n=None):
+    bookmarked = Bookmark.objects.values('student_id')
+    SimilarStudent.objects.exclude(student_id__in=bookmarked).delete()
+    SimilarityUpdate.objects.all().delete()
+    return refresh(sorted(set(bookmarked.values_list('student_id', flat=True))), n)
+
+
+def process_pending(n=None):
+    """
+    Folds queued bookmark changes into the neighbour table. A change to (r, s) alters
+    the co-occurrence of s with r's other bookmarks, and s's norm affects every student
+    co-bookmarked with s, so all of those are recomputed.
+    """
+    last_id = SimilarityUpdate.objects.aggregate(last=Max('id'))['last']
+    if last_id is None:
+        return 0
+    pending = SimilarityUpdate.objects.filter(id__lte=last_id)
+    changed = set(pending.values_list('student_id', flat=True))
+    recruiters = set(pending.values_list('recruiter_id', flat=True))
+    recruiters.update(Bookmark.objects.filter(student_id__in=changed).values_list('recruiter_id', flat=True))
+    affected = changed | set(Bookmark.objects.filter(recruiter_id__in=recruiters).values_list('student_id', flat=True))
+
+    count = refresh(sorted(affected), n)
+    pending.delete()
+    return count
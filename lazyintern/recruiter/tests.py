@@ -1,3 +1,271 @@
-from django.test import TestCase
+import csv
+import io
+import json
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api import ranking
+from api.models import StudentProfile, User
+from api.skills import sync_student_skills
+from api.pagination import InvalidCursor, decode_cursor, encode_cursor
+from recruiter import similar
+from recruiter.models import Bookmark, RecruiterProfile, SimilarStudent, SimilarityUpdate
+
+TEST_SETTINGS = {
+    "PASSWORD_HASHERS": ['django.contrib.auth.hashers.MD5PasswordHasher'],
+    "CACHES": {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    "EMAIL_QUEUE_THREAD": False,
+}
+
+
+def make_student(i, **fields):
+    user = User.objects.create_user(email=f"student{i}@example.com", password="pw", name=f"Student {i}", role="student")
+    return StudentProfile.objects.create(user=user, **fields)
+
+
+def make_recruiter(i=0):
+    user = User.objects.create_user(email=f"recruiter{i}@example.com", password="pw", name=f"Recruiter {i}", role="recruiter")
+    RecruiterProfile.objects.create(user=user, name=f"Recruiter {i}")
+    return user
+
+
+class CursorTests(TestCase):
+    def test_round_trip_keeps_microseconds(self):
+        now = timezone.now().replace(microsecond=123456)
+        values = decode_cursor(encode_cursor([now, 42]))
+        self.assertEqual(values, [now.isoformat(), 42])
+
+    def test_garbage_is_rejected(self):
+        for cursor in ('not-base64!', encode_cursor({"a": 1})[:-2], 'e30'):   # e30 = "{}"
+            with self.assertRaises(InvalidCursor):
+                decode_cursor(cursor)
+
+
+@override_settings(**TEST_SETTINGS)
+class StudentSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.students = [make_student(i, graduation_year='2026' if i % 2 else '2027') for i in range(25)]
+        # several rows share one updated_at, so paging has to fall back to the id tie-breaker
+        StudentProfile.objects.filter(id__in=[s.id for s in cls.students[5:15]]).update(updated_at=timezone.now())
+        cls.recruiter = make_recruiter()
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.recruiter)
+
+    def _all_pages(self, query):
+        ids, cursor = [], None
+        while True:
+            params = dict(query, page_size=4, **({"cursor": cursor} if cursor else {}))
+            response = self.client.get('/api/recruiter/students/search/', params)
+            self.assertEqual(response.status_code, 200)
+            ids.extend(row["id"] for row in response.json()["results"])
+            cursor = response.json()["next_cursor"]
+            if cursor is None:
+                return ids
+
+    def test_pages_cover_every_student_once(self):
+        for ordering in ('recent', 'id'):
+            ids = self._all_pages({"ordering": ordering})
+            self.assertEqual(len(ids), len(set(ids)))
+            self.assertEqual(set(ids), {s.id for s in self.students})
+
+    def test_pages_respect_filters(self):
+        ids = self._all_pages({"graduation_year": "2026"})
+        self.assertEqual(set(ids), {s.id for s in self.students if s.graduation_year == '2026'})
+
+    def test_invalid_cursor_is_400(self):
+        response = self.client.get('/api/recruiter/students/search/', {"cursor": "bogus"})
+        self.assertEqual(response.status_code, 400)
+        # a cursor from another ordering has the wrong number of keys
+        cursor = encode_cursor([1])
+        response = self.client.get('/api/recruiter/students/search/', {"cursor": cursor, "ordering": "recent"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_with_bad_values_is_400(self):
+        # well-formed cursors whose values do not fit the ordering fields
+        for values in (["abc", 1], [None, None], [{"a": 1}, 1], ["2024-01-01T00:00:00+00:00", "x"]):
+            with self.subTest(values=values):
+                response = self.client.get('/api/recruiter/students/search/', {"cursor": encode_cursor(values)})
+                self.assertEqual(response.status_code, 400)
+
+    def test_unknown_ordering_is_400(self):
+        response = self.client.get('/api/recruiter/students/search/', {"ordering": "name"})
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(STUDENT_LIST_MAX_ROWS=10)
+    def test_full_listing_is_capped(self):
+        response = self.client.get('/api/recruiter/students/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 10)
+
+
+@override_settings(**TEST_SETTINGS)
+class SimilarStudentTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.students = [make_student(i) for i in range(8)]
+        cls.recruiters = [RecruiterProfile.objects.get(user=make_recruiter(i)) for i in range(4)]
+
+    def bookmark(self, recruiter, *indexes):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in indexes:
+                Bookmark.objects.create(recruiter=recruiter, student=self.students[i])
+            similar.mark_changed(recruiter.id, [self.students[i].id for i in indexes])
+
+    def unbookmark(self, recruiter, *indexes):
+        ids = [self.students[i].id for i in indexes]
+        with self.captureOnCommitCallbacks(execute=True):
+            Bookmark.objects.filter(recruiter=recruiter, student_id__in=ids).delete()
+            similar.mark_changed(recruiter.id, ids)
+
+    def table(self):
+        return sorted(
+            (row.student_id, row.neighbour_id, round(row.score, 9), row.co_bookmarks)
+            for row in SimilarStudent.objects.all()
+        )
+
+    def assert_matches_full_recompute(self):
+        similar.process_pending()
+        self.assertFalse(SimilarityUpdate.objects.exists())
+        incremental = self.table()
+        call_command('refresh_similar_students', '--full', stdout=io.StringIO())
+        self.assertEqual(incremental, self.table())
+        return incremental
+
+    def test_incremental_refresh_matches_full_recompute(self):
+        r0, r1, r2, r3 = self.recruiters
+        self.bookmark(r0, 0, 1, 2)
+        self.bookmark(r1, 1, 2, 3)
+        self.bookmark(r2, 3, 4)
+        self.assertTrue(self.assert_matches_full_recompute())
+
+        self.bookmark(r3, 0, 4, 5)
+        self.unbookmark(r1, 2)
+        self.assert_matches_full_recompute()
+
+        # the last bookmarks of a student: its rows and the rows pointing at it go away
+        self.unbookmark(r1, 3)
+        self.unbookmark(r2, 3)
+        rows = self.assert_matches_full_recompute()
+        self.assertFalse([row for row in rows if self.students[3].id in row[:2]])
+
+    def test_endpoint(self):
+        r0, r1 = self.recruiters[:2]
+        self.bookmark(r0, 0, 1, 2)
+        self.bookmark(r1, 0, 1)
+        similar.process_pending()
+        self.client.force_login(r0.user)
+        url = f'/api/recruiter/students/{self.students[0].id}/similar/'
+
+        results = self.client.get(url).json()["results"]
+        self.assertEqual([row["id"] for row in results], [self.students[1].id, self.students[2].id])
+        self.assertEqual(results[0]["co_bookmarks"], 2)
+        self.assertEqual(results[0]["score"], 1.0)
+
+        for limit, expected in (('1', 1), ('-1', 1), ('0', 1), ('500', 2)):
+            with self.subTest(limit=limit):
+                response = self.client.get(url, {"limit": limit})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.json()["results"]), expected)
+        self.assertEqual(self.client.get(url, {"limit": "x"}).status_code, 400)
+
+
+@override_settings(**TEST_SETTINGS)
+class RankStudentsTests(TestCase):
+    def setUp(self):
+        self.both = make_student(1, skills=["Python", "Django"], location="Istanbul")
+        self.python = make_student(2, skills=["python"], location="Ankara")
+        self.other = make_student(3, skills=["Go"], location="Istanbul")
+        for student in (self.both, self.python, self.other):
+            sync_student_skills(student.id)
+        ranking.rebuild()
+        self.client.force_login(make_recruiter())
+
+    def ranked(self, **params):
+        response = self.client.get('/api/recruiter/students/rank/', params)
+        self.assertEqual(response.status_code, 200)
+        return [row["id"] for row in response.json()["results"]]
+
+    def test_ordering(self):
+        self.assertEqual(self.ranked(skills="python,django"), [self.both.id, self.python.id])
+        self.assertEqual(self.ranked(skills="django"), [self.both.id])
+        self.assertEqual(self.ranked(skills="python", location="istanbul"), [self.both.id])
+        self.assertEqual(self.ranked(skills="rust"), [])
+
+    def test_profile_save_updates_the_overlay(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/student/profile/', {
+                "user_id": self.other.user_id, "skills": ["Python", "Django", "Go"],
+            }, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(self.ranked(skills="python,django")[:2]), {self.both.id, self.other.id})
+        self.assertIn(self.other.id, ranking._index.snapshot().overlay)
+
+    def test_deleted_students_drop_out(self):
+        self.both.user.delete()
+        ranking._index.mark_dirty()
+        self.assertEqual([sid for sid, _ in ranking.rank_students(["python"])], [self.python.id])
+
+    def test_refresh_without_changes_keeps_the_snapshot(self):
+        ranking._index.mark_dirty()
+        first = ranking._index.snapshot()
+        ranking._index.mark_dirty()
+        self.assertIs(ranking._index.snapshot(), first)
+        self.assertEqual(first.overlay, {})
+
+
+@override_settings(**TEST_SETTINGS)
+class BookmarkListingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.students = [make_student(i, university="METU" if i % 2 else "Bilkent", skills=["Python"]) for i in range(9)]
+        cls.recruiter = RecruiterProfile.objects.get(user=make_recruiter())
+        Bookmark.objects.bulk_create([Bookmark(recruiter=cls.recruiter, student=s) for s in cls.students])
+        # another recruiter's bookmark never shows up
+        Bookmark.objects.create(recruiter=RecruiterProfile.objects.get(user=make_recruiter(1)), student=cls.students[0])
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.recruiter.user)
+
+    @override_settings(BOOKMARK_LIST_MAX_ROWS=4)
+    def test_full_listing_is_capped(self):
+        response = self.client.get('/api/recruiter/bookmarks/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 4)
+
+    def test_search_pages_cover_every_bookmark_once(self):
+        for ordering in ('recent', 'oldest'):
+            ids, cursor = [], None
+            while True:
+                params = {"ordering": ordering, "page_size": 2, **({"cursor": cursor} if cursor else {})}
+                body = self.client.get('/api/recruiter/bookmarks/search/', params).json()
+                ids.extend(row["id"] for row in body["results"])
+                cursor = body["next_cursor"]
+                if cursor is None:
+                    break
+            self.assertEqual(sorted(ids), sorted(s.id for s in self.students))
+
+        body = self.client.get('/api/recruiter/bookmarks/search/', {"university": "METU"}).json()
+        self.assertEqual({row["id"] for row in body["results"]}, {s.id for s in self.students if s.university == "METU"})
+        self.assertEqual(self.client.get('/api/recruiter/bookmarks/search/', {"cursor": "bogus"}).status_code, 400)
+
+    def test_export(self):
+        response = self.client.get('/api/recruiter/bookmarks/export/', {"output": "csv"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(sorted(int(row["id"]) for row in rows), sorted(s.id for s in self.students))
+        self.assertEqual(rows[0]["skills"], "Python")
+
+        response = self.client.get('/api/recruiter/bookmarks/export/', {"output": "ndjson"})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), len(self.students))
+        self.assertEqual(rows[0]["skills"], ["Python"])
+
+        self.assertEqual(self.client.get('/api/recruiter/bookmarks/export/', {"output": "xml"}).status_code, 400)
@@ -3,7 +3,14 @@ from . import views
 
 urlpatterns = [
     path('students/', views.get_all_students, name='get_all_students'),
+    path('students/search/', views.search_students, name='search_students'),
+    path('students/fulltext/', views.fulltext_search_students, name='fulltext_search_students'),
+    path('students/rank/', views.rank_students, name='rank_students'),
+    path('students/export/', views.export_students, name='export_students'),
+    path('students/<int:student_id>/similar/', views.similar_students, name='similar_students'),
     path('bookmarks/', views.get_bookmarked_students, name='get_bookmarked_students'),
+    path('bookmarks/search/', views.search_bookmarked_students, name='search_bookmarked_students'),
+    path('bookmarks/export/', views.export_bookmarked_students, name='export_bookmarked_students'),
 
     path('profile/me/', views.get_recruiter_profile, name='get_my_profile'),  # Giriş yapmış kullanıcının profili
     path('profile/', views.create_recruiter_profile, name='create_recruiter_profile'),  # Yeni profil oluştur
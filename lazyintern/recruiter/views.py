@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from recruiter.models import RecruiterProfile, Bookmark
@@ -10,28 +11,189 @@ from rest_framework import status
 from rest_framework.authentication import SessionAuthentication
 from rest_framework.permissions import IsAuthenticated
 from recruiter.models import RecruiterProfile
+from recruiter.filters import filter_students
+from recruiter.bookmarks import with_bookmark_state
+from recruiter import similar
+from recruiter.models import SimilarStudent
+from api.pagination import InvalidCursor, get_page_size, keyset_page
+from api import fulltext, ranking
+from api.conditional import recruiter_conditional
+from api import response_cache
+from api.streaming import DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, streaming_export
+from api.fields import InvalidFields, project_values, requested_fields
+from api.directory import DIRECTORY_EXPORT_COLUMNS, directory_rows, parse_updated_since
 
-# Tüm öğrenci profillerini getirir
+
+def student_summary(s):
+    return {
+        "id": s.id,
+        "user_id": s.user.id,
+        "name": s.user.name,
+        "email": s.user.email,
+        "university": s.university,
+        "major": s.major,
+        "graduation_year": s.graduation_year,
+        "location": s.location,
+        "skills": s.skills,
+        "profile_views": s.profile_views,
+        "internship_type_preference": s.internship_type_preference
+    }
+
+
+# student_summary key -> StudentProfile field path, for values()-based (and ?fields=) listings
+STUDENT_SUMMARY_COLUMNS = {
+    "id": "id",
+    "user_id": "user_id",
+    "name": "user__name",
+    "email": "user__email",
+    "university": "university",
+    "major": "major",
+    "graduation_year": "graduation_year",
+    "location": "location",
+    "skills": "skills",
+    "profile_views": "profile_views",
+    "internship_type_preference": "internship_type_preference",
+}
+
+
+def student_list_max_rows():
+    return getattr(settings, 'STUDENT_LIST_MAX_ROWS', 500)
+
+
+def bookmark_list_max_rows():
+    return getattr(settings, 'BOOKMARK_LIST_MAX_ROWS', 500)
+
+
+# En son güncellenen öğrenci profillerini getirir (en fazla STUDENT_LIST_MAX_ROWS);
+# dashboard'un tam listesi için search_students (cursor ile sayfalı) kullanılır
 @api_view(['GET'])
 def get_all_students(request):
-    students = StudentProfile.objects.select_related('user').all()
-    data = []
-    for s in students:
-        data.append({
-            "id": s.id,
-            "user_id": s.user.id,
-            "name": s.user.name,
-            "email": s.user.email,
-            "university": s.university,
-            "major": s.major,
-            "graduation_year": s.graduation_year,
-            "location": s.location,
-            "skills": s.skills,
-            "profile_views": s.profile_views,
-            "internship_type_preference": s.internship_type_preference
-        })
+    try:
+        fields = requested_fields(request.query_params, STUDENT_SUMMARY_COLUMNS)
+    except InvalidFields as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    include_bookmarks = request.query_params.get('include_bookmarks')
+    if include_bookmarks and fields and 'user_id' not in fields:
+        return Response({"error": "include_bookmarks requires user_id in fields"}, status=status.HTTP_400_BAD_REQUEST)
+
+    def build():
+        students = StudentProfile.objects.order_by('-updated_at', '-id')[:student_list_max_rows()]
+        return project_values(students, STUDENT_SUMMARY_COLUMNS, fields)
+    data = response_cache.get_or_build('all_students', fields or [], [response_cache.directory_scope()], build)
+    if include_bookmarks:
+        data = with_bookmark_state(request.user, data)
     return Response(data)
 
+
+# Sort keys allowed for search; each one ends with a unique tie-breaker.
+STUDENT_SEARCH_ORDERINGS = {
+    'recent': ('-updated_at', '-id'),
+    'id': ('id',),
+}
+
+
+# Server-side filtered, cursor paginated student search
+@api_view(['GET'])
+def search_students(request):
+    params = request.query_params
+    ordering = STUDENT_SEARCH_ORDERINGS.get(params.get('ordering', 'recent'))
+    if ordering is None:
+        return Response(
+            {"error": f"ordering must be one of: {', '.join(STUDENT_SEARCH_ORDERINGS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    students = filter_students(StudentProfile.objects.select_related('user'), params)
+    try:
+        page, next_cursor = keyset_page(
+            students, ordering,
+            cursor=params.get('cursor'),
+            page_size=get_page_size(params)
+        )
+    except InvalidCursor as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    results = [student_summary(s) for s in page]
+    if params.get('include_bookmarks'):
+        results = with_bookmark_state(request.user, results)
+    return Response({
+        "results": results,
+        "next_cursor": next_cursor,
+    })
+
+# Ranked free-text search over bio, major, university, projects and certifications
+@api_view(['GET'])
+def fulltext_search_students(request):
+    q = request.query_params.get('q', '').strip()
+    if not q:
+        return Response({"error": "q is required"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = int(request.query_params.get('limit', 20))
+    except ValueError:
+        return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+    match = 'any' if request.query_params.get('match') == 'any' else 'all'
+
+    hits = fulltext.search_students(q, limit=limit, match=match)
+    students = StudentProfile.objects.select_related('user').in_bulk([sid for sid, _, _ in hits])
+
+    results = []
+    for sid, score, highlight in hits:
+        if sid in students:
+            results.append({
+                **student_summary(students[sid]),
+                "score": round(score, 4),
+                "highlight": highlight,
+            })
+    return Response({"results": results})
+
+
+# Ranked matches: skills (comma separated), location, graduation_year_from / _to, limit
+@api_view(['GET'])
+def rank_students(request):
+    if not ranking.is_available():
+        return Response({"error": "Ranking is not available on this server"}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    params = request.query_params
+    skills = [s for s in params.get('skills', '').split(',') if s.strip()]
+    try:
+        limit = int(params.get('limit', 20))
+        year_from = params.get('graduation_year_from')
+        year_to = params.get('graduation_year_to')
+        year_range = None
+        if year_from or year_to:
+            year_range = (int(year_from or 0), int(year_to or 9999))
+    except ValueError:
+        return Response({"error": "limit and graduation years must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+
+    hits = ranking.rank_students(skills, location=params.get('location', ''), year_range=year_range, limit=limit)
+    students = StudentProfile.objects.select_related('user').in_bulk([sid for sid, _ in hits])
+    results = [
+        {**student_summary(students[sid]), "score": round(score, 4)}
+        for sid, score in hits if sid in students
+    ]
+    if params.get('include_bookmarks'):
+        results = with_bookmark_state(request.user, results)
+    return Response({"results": results})
+
+
+# "Recruiters who bookmarked this student also bookmarked": reads the precomputed neighbour table only
+@api_view(['GET'])
+def similar_students(request, student_id):
+    try:
+        limit = max(1, min(int(request.query_params.get('limit', 10)), similar.top_n()))
+    except ValueError:
+        return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+    neighbours = (SimilarStudent.objects.filter(student_id=student_id)
+                  .select_related('neighbour__user').order_by('-score', 'neighbour_id')[:limit])
+    results = [
+        {**student_summary(row.neighbour), "score": round(row.score, 4), "co_bookmarks": row.co_bookmarks}
+        for row in neighbours
+    ]
+    if request.query_params.get('include_bookmarks'):
+        results = with_bookmark_state(request.user, results)
+    return Response({"results": results})
+
+
 @api_view(['GET'])
 def get_recruiter_profile(request):
     user = request.user
@@ -59,6 +221,10 @@ def get_recruiter_profile(request):
         "email": recruiter.user.email,
         "role": "recruiter"
     })
+
+
+# En son eklenen bookmark'lar (en fazla BOOKMARK_LIST_MAX_ROWS); tamamı için
+# search_bookmarked_students (cursor ile sayfalı) veya export_bookmarked_students kullanılır
 @api_view(['GET'])
 def get_bookmarked_students(request):
     user = request.user
@@ -70,32 +236,127 @@ def get_bookmarked_students(request):
     except RecruiterProfile.DoesNotExist:
         return Response({"detail": "Recruiter profile not found."}, status=status.HTTP_404_NOT_FOUND)
 
-    bookmarks = Bookmark.objects.select_related('student__user').filter(recruiter=recruiter_profile)
-
-    data = []
-    for bookmark in bookmarks:
-        student = bookmark.student
-        data.append({
-            "id": student.id,
-            "user_id": student.user.id,
-            "name": student.user.name,
-            "email": student.user.email,
-            "university": student.university,
-            "major": student.major,
-            "graduation_year": student.graduation_year,
-            "location": student.location,
-            "skills": student.skills,
-            "profile_views": student.profile_views,
-            "internship_type_preference": student.internship_type_preference
-        })
+    try:
+        fields = requested_fields(request.query_params, STUDENT_SUMMARY_COLUMNS)
+    except InvalidFields as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-    return Response(data)
+    def build():
+        bookmarks = Bookmark.objects.filter(recruiter=recruiter_profile).order_by('-created_at', '-id')[:bookmark_list_max_rows()]
+        return project_values(bookmarks, STUDENT_SUMMARY_COLUMNS, fields, prefix='student__')
+    return Response(response_cache.get_or_build(
+        'bookmarked_students', [recruiter_profile.id, *(fields or [])],
+        [response_cache.bookmarks_scope(recruiter_profile.id)], build
+    ))
+
+
+BOOKMARK_ORDERINGS = {
+    'recent': ('-created_at', '-id'),
+    'oldest': ('created_at', 'id'),
+}
+
+# Export column -> Bookmark field path
+BOOKMARK_EXPORT_COLUMNS = {
+    "bookmarked_at": "created_at",
+    "id": "student_id",
+    "user_id": "student__user_id",
+    "name": "student__user__name",
+    "email": "student__user__email",
+    "university": "student__university",
+    "major": "student__major",
+    "graduation_year": "student__graduation_year",
+    "location": "student__location",
+    "skills": "student__skills",
+    "profile_views": "student__profile_views",
+    "internship_type_preference": "student__internship_type_preference",
+}
+
+
+def _recruiter_bookmarks(request):
+    """(filtered Bookmark queryset, None) for the current recruiter, or (None, error response)."""
+    user = request.user
+    if isinstance(user, AnonymousUser):
+        return None, Response({"error": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
+    recruiter_id = RecruiterProfile.objects.filter(user=user).values_list('id', flat=True).first()
+    if recruiter_id is None:
+        return None, Response({"detail": "Recruiter profile not found."}, status=status.HTTP_404_NOT_FOUND)
+    bookmarks = filter_students(
+        Bookmark.objects.filter(recruiter_id=recruiter_id), request.query_params, prefix='student__'
+    )
+    return bookmarks, None
+
+
+# Cursor paginated, filterable bookmark listing ordered by bookmark date
+@api_view(['GET'])
+def search_bookmarked_students(request):
+    bookmarks, error = _recruiter_bookmarks(request)
+    if error:
+        return error
+
+    params = request.query_params
+    ordering = BOOKMARK_ORDERINGS.get(params.get('ordering', 'recent'))
+    if ordering is None:
+        return Response(
+            {"error": f"ordering must be one of: {', '.join(BOOKMARK_ORDERINGS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        page, next_cursor = keyset_page(
+            bookmarks.select_related('student__user'), ordering,
+            cursor=params.get('cursor'),
+            page_size=get_page_size(params)
+        )
+    except InvalidCursor as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        "results": [{**student_summary(b.student), "bookmarked_at": b.created_at} for b in page],
+        "next_cursor": next_cursor,
+    })
+
+
+# Streaming CSV / NDJSON export of the recruiter's bookmarks (?output=csv|ndjson;
+# not ?format=, which DRF reserves for renderer selection)
+@api_view(['GET'])
+def export_bookmarked_students(request):
+    bookmarks, error = _recruiter_bookmarks(request)
+    if error:
+        return error
+
+    fmt = request.query_params.get('output', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return Response({"error": f"output must be one of: {', '.join(EXPORT_FORMATS)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+    values = (bookmarks.order_by('-created_at', '-id')
+              .values_list(*BOOKMARK_EXPORT_COLUMNS.values())
+              .iterator(chunk_size=DEFAULT_CHUNK_SIZE))
+    rows = (dict(zip(BOOKMARK_EXPORT_COLUMNS, v)) for v in values)
+    return streaming_export(rows, list(BOOKMARK_EXPORT_COLUMNS), fmt, 'bookmarked-students')
+
+# Whole directory as a stream (?output=csv|ndjson&updated_since=...), for ATS / analytics sync jobs
+@api_view(['GET'])
+def export_students(request):
+    user = request.user
+    if not user.is_authenticated or not (user.role == 'recruiter' or user.is_staff):
+        return Response({"error": "Recruiter access required"}, status=status.HTTP_403_FORBIDDEN)
+
+    fmt = request.query_params.get('output', 'ndjson')
+    if fmt not in EXPORT_FORMATS:
+        return Response({"error": f"output must be one of: {', '.join(EXPORT_FORMATS)}"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        updated_since = parse_updated_since(request.query_params.get('updated_since'))
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    rows = directory_rows(updated_since, flat=fmt == 'csv', chunk_size=DEFAULT_CHUNK_SIZE)
+    return streaming_export(rows, DIRECTORY_EXPORT_COLUMNS, fmt, 'students')
 
 # Recruiter profil detayları (GET ve PUT aynı fonksiyonda)
+@recruiter_conditional
 @api_view(['GET', 'PUT'])
 def recruiter_profile_detail(request, user_id):
     try:
-        profile = RecruiterProfile.objects.get(user__id=user_id)
+        profile = RecruiterProfile.objects.select_related('user').get(user__id=user_id)
     except RecruiterProfile.DoesNotExist:
         return Response({"error": "Profile not found"}, status=status.HTTP_404_NOT_FOUND)
 
@@ -168,6 +429,8 @@ def add_bookmark(request):
 
     bookmark, created = Bookmark.objects.get_or_create(recruiter=recruiter_profile, student=student)
     if created:
+        response_cache.invalidate(response_cache.bookmarks_scope(recruiter_profile.id))
+        similar.mark_changed(recruiter_profile.id, [student.id])
         return Response({"message": "Bookmark added"}, status=status.HTTP_201_CREATED)
     else:
         return Response({"message": "Bookmark already exists"})
@@ -187,6 +450,8 @@ def remove_bookmark(request, student_id):
     try:
         bookmark = Bookmark.objects.get(recruiter=recruiter_profile, student__id=student_id)
         bookmark.delete()
+        response_cache.invalidate(response_cache.bookmarks_scope(recruiter_profile.id))
+        similar.mark_changed(recruiter_profile.id, [bookmark.student_id])
         return Response({"message": "Bookmark removed"})
     except Bookmark.DoesNotExist:
         return Response({"error": "Bookmark not found"}, status=status.HTTP_404_NOT_FOUND)
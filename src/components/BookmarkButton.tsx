@@ -6,19 +6,24 @@ import { useAuth } from "@/hooks/useAuth";
 
 interface BookmarkButtonProps {
   studentId: string;
+  initialBookmarked?: boolean; // From a list response with include_bookmarks, skips the status request
   className?: string;
   onBookmarkChange?: () => void; // Callback prop
 }
 
-const BookmarkButton = ({ studentId, className, onBookmarkChange }: BookmarkButtonProps) => {
-  const [isBookmarked, setIsBookmarked] = useState(false);
+const BookmarkButton = ({ studentId, initialBookmarked, className, onBookmarkChange }: BookmarkButtonProps) => {
+  const [isBookmarked, setIsBookmarked] = useState(initialBookmarked ?? false);
   const [loading, setLoading] = useState(false);
   const { user } = useAuth();
   const { toast } = useToast();
 
   useEffect(() => {
+    if (initialBookmarked !== undefined) {
+      setIsBookmarked(initialBookmarked);
+      return;
+    }
     checkBookmarkStatus();
-  }, [studentId, user]);
+  }, [studentId, user, initialBookmarked]);
 
   const checkBookmarkStatus = async () => {
     if (!user) return;
@@ -202,6 +202,7 @@ const StudentCard = ({ student, onViewProfile, onBookmarkChange }: StudentCardPr
           <div className="flex items-center gap-2 flex-shrink-0">
             <BookmarkButton 
               studentId={student.user_id} 
+              initialBookmarked={student.is_bookmarked}
               onBookmarkChange={onBookmarkChange}
             />
             <Button 
@@ -18,6 +18,9 @@ interface StudentListProps {
   bookmarkedCount: number;
   studentsLoaded: boolean;
   onLoadAllStudents: () => void;
+  hasMoreStudents?: boolean;
+  loadingMore?: boolean;
+  onLoadMoreStudents?: () => void;
 }
 
 const StudentList = ({
@@ -32,7 +35,10 @@ const StudentList = ({
   studentsCount,
   bookmarkedCount,
   studentsLoaded,
-  onLoadAllStudents
+  onLoadAllStudents,
+  hasMoreStudents = false,
+  loadingMore = false,
+  onLoadMoreStudents
 }: StudentListProps) => {
   const handleTabChange = (newTab: string) => {
     console.log('StudentList: Tab changing from', activeTab, 'to', newTab);
@@ -45,7 +51,7 @@ const StudentList = ({
       <CardHeader>
         <Tabs value={activeTab} onValueChange={handleTabChange} className="w-full">
           <TabsList className="grid w-full grid-cols-2">
-            <TabsTrigger value="all">All Students ({studentsCount})</TabsTrigger>
+            <TabsTrigger value="all">All Students ({studentsCount}{hasMoreStudents ? "+" : ""})</TabsTrigger>
             <TabsTrigger value="bookmarks">Bookmarked ({bookmarkedCount})</TabsTrigger>
           </TabsList>
         </Tabs>
@@ -77,7 +83,7 @@ const StudentList = ({
                 {hasActiveFilters ? (
                   <p className="text-sm mb-4">Try adjusting your filters to see more results.</p>
                 ) : (
-                  <p className="text-sm mb-4">All student profiles are loaded and ready to filter.</p>
+                  <p className="text-sm mb-4">No student profiles yet.</p>
                 )}
               </div>
             )}
@@ -102,6 +108,13 @@ const StudentList = ({
                 onBookmarkChange={onBookmarkChange}
               />
             ))}
+            {activeTab === "all" && hasMoreStudents && (
+              <div className="text-center pt-2">
+                <Button variant="outline" onClick={onLoadMoreStudents} disabled={loadingMore}>
+                  {loadingMore ? "Loading..." : "Load more students"}
+                </Button>
+              </div>
+            )}
           </div>
         )}
       </CardContent>
@@ -5,6 +5,7 @@ import { Input } from "@/components/ui/input";
 import { Label } from "@/components/ui/label";
 import { Badge } from "@/components/ui/badge";
 import { useToast } from "@/hooks/use-toast";
+import { useAuth } from "@/hooks/useAuth";
 import { Plus, X, Download, Award } from "lucide-react";
 
 interface Certification {
@@ -26,6 +27,7 @@ interface CertificationsSectionProps {
 
 const CertificationsSection = ({ certifications, setCertifications }: CertificationsSectionProps) => {
   const { toast } = useToast();
+  const { user } = useAuth();
   const [uploading, setUploading] = useState<{ [key: number]: boolean }>({});
 
   const addCertification = () => {
@@ -53,11 +55,13 @@ const CertificationsSection = ({ certifications, setCertifications }: Certificat
   };
 
   const handleFileUpload = async (index: number, file: File) => {
+    if (!user) return;
     setUploading(prev => ({ ...prev, [index]: true }));
 
     try {
       const formData = new FormData();
       formData.append("file", file);
+      formData.append("user_id", user.id.toString());
 
       const response = await fetch("/api/upload/certificate", {
         method: "POST",
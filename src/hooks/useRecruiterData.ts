@@ -1,15 +1,21 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { useToast } from "@/hooks/use-toast";
 import { useAuth } from "@/hooks/useAuth";
 
+const STUDENT_PAGE_SIZE = 50;
+
 export const useRecruiterData = () => {
   const { toast } = useToast();
   const { user } = useAuth();
-  const [loading, setLoading] = useState(false);
+  const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [students, setStudents] = useState<any[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [studentParams, setStudentParams] = useState("");
+  const latestRequest = useRef(0);
   const [bookmarkedStudents, setBookmarkedStudents] = useState<any[]>([]);
   const [recruiterProfile, setRecruiterProfile] = useState<any>(null);
-  const [profileLoading, setProfileLoading] = useState(false);
+  const [profileLoading, setProfileLoading] = useState(true);
 
   const loadRecruiterProfile = async () => {
     if (!user) return;
@@ -31,16 +37,27 @@ export const useRecruiterData = () => {
     }
   };
 
-  const loadStudents = async () => {
-    setLoading(true);
+  // Server-side filtered, cursor paginated search (/api/recruiter/students/search/).
+  // `params` holds the filter query string from useStudentFilters.
+  const loadStudents = async (params = "", cursor: string | null = null) => {
+    const query = new URLSearchParams(params);
+    query.set("include_bookmarks", "1");
+    query.set("page_size", String(STUDENT_PAGE_SIZE));
+    if (cursor) query.set("cursor", cursor);
+
+    const request = ++latestRequest.current;
+    if (cursor) setLoadingMore(true); else setLoading(true);
     try {
-      const response = await fetch(`/api/recruiter/students/`, {  // BURASI GÜNCELLENDİ
+      const response = await fetch(`/api/recruiter/students/search/?${query}`, {
         method: "GET",
         credentials: "include"
       });
       if (!response.ok) throw new Error("Failed to load students");
-      const studentsData = await response.json();
-      setStudents(studentsData);
+      const page = await response.json();
+      if (request !== latestRequest.current) return;  // filters changed while loading
+      setStudents(prev => cursor ? [...prev, ...page.results] : page.results);
+      setNextCursor(page.next_cursor);
+      setStudentParams(params);
     } catch (error) {
       console.error("Error loading students:", error);
       toast({
@@ -49,10 +66,17 @@ export const useRecruiterData = () => {
         variant: "destructive",
       });
     } finally {
-      setLoading(false);
+      if (request === latestRequest.current) {
+        setLoading(false);
+        setLoadingMore(false);
+      }
     }
   };
 
+  const loadMoreStudents = () => {
+    if (nextCursor && !loadingMore) loadStudents(studentParams, nextCursor);
+  };
+
   const loadBookmarkedStudents = async () => {
     if (!user) return;
 
@@ -74,18 +98,20 @@ export const useRecruiterData = () => {
     if (user) {
       loadRecruiterProfile();
       loadBookmarkedStudents();
-      loadStudents();
     }
   }, [user]);
 
   return {
     loading,
+    loadingMore,
     students,
+    hasMoreStudents: nextCursor !== null,
     bookmarkedStudents,
     recruiterProfile,
     profileLoading,
     loadRecruiterProfile,
     loadStudents,
+    loadMoreStudents,
     loadBookmarkedStudents
   };
 };
@@ -1,6 +1,8 @@
 
-import { useState, useEffect } from "react";
+import { useState, useEffect, useMemo } from "react";
 
+// The "all" tab is filtered on the server (searchParams -> /api/recruiter/students/search/,
+// see recruiter/filters.py); only the recruiter's own bookmarks are filtered here.
 export const useStudentFilters = (students: any[], bookmarkedStudents: any[], activeTab: string) => {
   const [filteredStudents, setFilteredStudents] = useState<any[]>([]);
   
@@ -12,8 +14,23 @@ export const useStudentFilters = (students: any[], bookmarkedStudents: any[], ac
   const [graduationYearFilter, setGraduationYearFilter] = useState<string[]>([]);
   const [internshipTypeFilter, setInternshipTypeFilter] = useState("");
 
+  const searchParams = useMemo(() => {
+    const params = new URLSearchParams();
+    if (majorFilter.trim()) params.set("major", majorFilter.trim());
+    if (skillFilter.trim()) params.set("skills", skillFilter.trim());
+    if (projectSkillFilter.trim()) params.set("project_skills", projectSkillFilter.trim());
+    if (locationFilter.trim()) params.set("location", locationFilter.trim());
+    graduationYearFilter.forEach(year => params.append("graduation_year", year));
+    if (internshipTypeFilter) params.set("internship_type_preference", internshipTypeFilter);
+    return params.toString();
+  }, [majorFilter, skillFilter, projectSkillFilter, locationFilter, graduationYearFilter, internshipTypeFilter]);
+
   const applyFilters = () => {
-    const currentStudents = activeTab === "bookmarks" ? bookmarkedStudents : students;
+    if (activeTab !== "bookmarks") {
+      setFilteredStudents(students);
+      return;
+    }
+    const currentStudents = bookmarkedStudents;
     
     console.log('Dashboard: Applying filters to', currentStudents.length, 'students for tab:', activeTab);
     
@@ -127,6 +144,7 @@ export const useStudentFilters = (students: any[], bookmarkedStudents: any[], ac
 
   return {
     filteredStudents,
+    searchParams,
     majorFilter,
     setMajorFilter,
     skillFilter,
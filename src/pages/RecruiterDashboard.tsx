@@ -5,19 +5,31 @@ import StudentFilters from "@/components/recruiter/StudentFilters";
 import StudentList from "@/components/recruiter/StudentList";
 import StudentProfile from "@/components/StudentProfile";
 import { useStudentFilters } from "@/hooks/useStudentFilters";
+import { useRecruiterData } from "@/hooks/useRecruiterData";
+
+const FILTER_DEBOUNCE_MS = 300;
 
 const RecruiterDashboard = () => {
   const [selectedStudent, setSelectedStudent] = useState<any>(null);
   const [activeTab, setActiveTab] = useState("all");
 
-  const [students, setStudents] = useState<any[]>([]);
-  const [bookmarkedStudents, setBookmarkedStudents] = useState<any[]>([]);
-  const [recruiterProfile, setRecruiterProfile] = useState<any>(null);
-  const [loading, setLoading] = useState(true);
-  const [profileLoading, setProfileLoading] = useState(true);
+  const {
+    loading,
+    loadingMore,
+    students,
+    hasMoreStudents,
+    bookmarkedStudents,
+    recruiterProfile,
+    profileLoading,
+    loadRecruiterProfile,
+    loadStudents,
+    loadMoreStudents,
+    loadBookmarkedStudents
+  } = useRecruiterData();
 
   const {
     filteredStudents,
+    searchParams,
     majorFilter,
     setMajorFilter,
     skillFilter,
@@ -34,43 +46,11 @@ const RecruiterDashboard = () => {
     hasActiveFilters
   } = useStudentFilters(students, bookmarkedStudents, activeTab);
 
+  // First page of the server-side search, again whenever the filters change
   useEffect(() => {
-    loadAllStudents();
-    loadBookmarkedStudents();
-    loadRecruiterProfile();
-  }, []);
-
-  const loadAllStudents = async () => {
-    try {
-      const res = await fetch("/api/recruiter/students/");
-      const data = await res.json();
-      setStudents(data);
-      setLoading(false);
-    } catch (error) {
-      console.error("Failed to load students:", error);
-    }
-  };
-
-  const loadBookmarkedStudents = async () => {
-    try {
-      const res = await fetch("/api/recruiter/bookmarks/");
-      const data = await res.json();
-      setBookmarkedStudents(data);
-    } catch (error) {
-      console.error("Failed to load bookmarks:", error);
-    }
-  };
-
-  const loadRecruiterProfile = async () => {
-    try {
-      const res = await fetch("/api/recruiter/profile/");
-      const data = await res.json();
-      setRecruiterProfile(data);
-      setProfileLoading(false);
-    } catch (error) {
-      console.error("Failed to load recruiter profile:", error);
-    }
-  };
+    const timer = setTimeout(() => loadStudents(searchParams), FILTER_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [searchParams]);
 
   const handleViewProfile = async (student: any) => {
     try {
@@ -172,7 +152,10 @@ const RecruiterDashboard = () => {
               studentsCount={students.length}
               bookmarkedCount={bookmarkedStudents.length}
               studentsLoaded={true}
-              onLoadAllStudents={loadAllStudents}
+              onLoadAllStudents={() => loadStudents(searchParams)}
+              hasMoreStudents={hasMoreStudents}
+              loadingMore={loadingMore}
+              onLoadMoreStudents={loadMoreStudents}
             />
           </div>
         </div>
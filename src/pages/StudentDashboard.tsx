@@ -276,16 +276,16 @@ const StudentDashboard = () => {
 
   useEffect(() => {
     if (user) {
-      loadProfile();
-      loadProjects();
-      loadCertifications();
+      loadDashboard();
     }
   }, [user]);
 
-  const loadProfile = async () => {
+  // Profile, projects and certifications come back in a single request
+  const loadDashboard = async () => {
     try {
-      const res = await fetch(`http://localhost:8000/api/student/profile/${user.id}`);
-      const profile = await res.json();
+      const res = await fetch(`http://localhost:8000/api/student/bundle/${user.id}/`);
+      if (!res.ok) return;
+      const { profile, projects, certifications } = await res.json();
 
       setFormData({
         name: profile.name || "",
@@ -308,56 +308,34 @@ const StudentDashboard = () => {
       setSkills(profile.skills || []);
       setProfileViews(profile.profile_views || 0);
       setStudentProfile(profile);
+      setProjects(projects);
+      setCertifications(certifications);
     } catch (error) {
       console.error("Error loading profile:", error);
     }
   };
 
-  const loadProjects = async () => {
-    try {
-      const res = await fetch(`http://localhost:8000/api/student/projects/${user.id}`);
-      const data = await res.json();
-      setProjects(data);
-    } catch (error) {
-      console.error("Error loading projects:", error);
-    }
-  };
-
-  const loadCertifications = async () => {
-    try {
-      const res = await fetch(`http://localhost:8000/api/student/certifications/${user.id}`);
-      const data = await res.json();
-      setCertifications(data);
-    } catch (error) {
-      console.error("Error loading certifications:", error);
-    }
-  };
-
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
     setLoading(true);
     try {
-      const profileRes = await fetch("http://localhost:8000/api/student/profile/", {
+      const res = await fetch("http://localhost:8000/api/student/bundle/", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ user_id: user.id, ...formData, skills }),
+        body: JSON.stringify({
+          user_id: user.id,
+          profile: { ...formData, skills },
+          projects,
+          certifications,
+        }),
       });
 
-      if (!profileRes.ok) throw new Error("Profile save failed");
-
-      const savedProfile = await profileRes.json();
+      if (!res.ok) throw new Error("Profile save failed");
 
-      await fetch("http://localhost:8000/api/student/projects/", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ student_id: savedProfile.id, projects }),
-      });
-
-      await fetch("http://localhost:8000/api/student/certifications/", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ student_id: savedProfile.id, certifications }),
-      });
+      // Keep the server ids so the next save only touches what changed
+      const saved = await res.json();
+      setProjects(saved.projects);
+      setCertifications(saved.certifications);
 
       toast({
         title: "Profile saved successfully!",